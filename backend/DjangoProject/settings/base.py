@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+from celery.schedules import crontab
+
 
 def _env_bool(name: str, default: bool = False) -> bool:
     return os.getenv(name, str(default)).lower() == "true"
@@ -41,6 +43,7 @@ LOCAL_APPS = [
     "tasks",
     "courses",
     "topics",
+    "notifications",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -107,20 +110,66 @@ CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND")
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
+# При REMINDERS_ETA_ENABLED каждое напоминание ставится отдельной задачей с eta,
+# а периодический sweep остаётся страховкой и запускается реже.
+REMINDERS_ETA_ENABLED = _env_bool("REMINDERS_ETA_ENABLED", False)
+REMINDER_SWEEP_INTERVAL = _env_float(
+    "REMINDER_SWEEP_INTERVAL", 600.0 if REMINDERS_ETA_ENABLED else 60.0
+)
+# С eta ставятся только напоминания ближе этого горизонта (секунды): воркер
+# держит такие задачи в памяти, а Redis-брокер перевыдаёт их после
+# visibility_timeout (1 час по умолчанию). Горизонт должен быть меньше него.
+REMINDER_ETA_HORIZON = _env_float("REMINDER_ETA_HORIZON", 3000.0)
+# Долгоживущий диспетчер напоминаний (manage.py run_reminder_dispatcher)
+REMINDER_DISPATCHER_ENABLED = _env_bool("REMINDER_DISPATCHER_ENABLED", False)
+REMINDER_DISPATCHER_REDIS_URL = os.getenv(
+    "REMINDER_DISPATCHER_REDIS_URL", CELERY_BROKER_URL
+)
+REMINDER_DISPATCHER_STREAM = os.getenv("REMINDER_DISPATCHER_STREAM", "reminders:events")
+REMINDER_DISPATCHER_HORIZON_HOURS = _env_int("REMINDER_DISPATCHER_HORIZON_HOURS", 6)
 CELERY_BEAT_SCHEDULE = {
     "send-task-reminders": {
         "task": "tasks.tasks.send_task_reminders",
-        "schedule": 60.0,
+        "schedule": REMINDER_SWEEP_INTERVAL,
     },
     "send-habits-reports": {
         "task": "tasks.tasks.send_weekly_habits_reports",
         "schedule": 604800.0,
     },
+    # Час по часовому поясу Celery (по умолчанию UTC): время низкой нагрузки
+    "refresh-habits-snapshots": {
+        "task": "tasks.tasks.refresh_habits_snapshots",
+        "schedule": crontab(
+            hour=_env_int("HABITS_SNAPSHOT_REFRESH_HOUR", 4), minute=0
+        ),
+    },
+    "relay-outbox": {
+        "task": "notifications.relay_outbox",
+        "schedule": _env_float("OUTBOX_RELAY_INTERVAL", 5.0),
+    },
+    "purge-outbox": {
+        "task": "notifications.purge_outbox",
+        "schedule": 86400.0,
+    },
+    "prune-task-tombstones": {
+        "task": "tasks.tasks.prune_task_tombstones",
+        "schedule": 86400.0,
+    },
 }
 
+REMINDER_BATCH_SIZE = _env_int("REMINDER_BATCH_SIZE", 500)
+
 BOT_SEND_MESSAGE_TASK = os.getenv("BOT_SEND_MESSAGE_TASK", "bot.send_message")
 BOT_QUEUE = os.getenv("BOT_QUEUE", "telegram")
 
+# Transactional outbox для сообщений в Telegram; по умолчанию выключен,
+# включается явно после миграции notifications и запуска beat
+NOTIFICATIONS_OUTBOX_ENABLED = _env_bool("NOTIFICATIONS_OUTBOX_ENABLED", False)
+OUTBOX_RELAY_BATCH_SIZE = _env_int("OUTBOX_RELAY_BATCH_SIZE", 500)
+# Запускать relay сразу после коммита; beat-опрос остаётся страховкой
+OUTBOX_RELAY_ON_COMMIT = _env_bool("OUTBOX_RELAY_ON_COMMIT", True)
+OUTBOX_RETENTION_DAYS = _env_int("OUTBOX_RETENTION_DAYS", 7)
+
 # Hugging Face LLM settings
 HUGGINGFACE_ENABLED = _env_bool("HUGGINGFACE_ENABLED", False)
 HUGGINGFACE_API_TOKEN = os.getenv("HUGGINGFACE_API_TOKEN")
@@ -133,3 +182,49 @@ HUGGINGFACE_TIMEOUT = _env_float("HUGGINGFACE_TIMEOUT", 8)
 HUGGINGFACE_MAX_NEW_TOKENS = _env_int("HUGGINGFACE_MAX_NEW_TOKENS", 240)
 HUGGINGFACE_RETRIES = _env_int("HUGGINGFACE_RETRIES", 1)
 HUGGINGFACE_USE_LLM_WEEKLY = _env_bool("HUGGINGFACE_USE_LLM_WEEKLY", True)
+# Ответы LLM кэшируются по sha256(model, prompt, max_tokens, temperature)
+HUGGINGFACE_CACHE_TTL = _env_int("HUGGINGFACE_CACHE_TTL", 30 * 24 * 3600)
+# Еженедельные отчёты: промпты чанка пользователей уходят в LLM конкурентно
+HUGGINGFACE_CONCURRENCY = _env_int("HUGGINGFACE_CONCURRENCY", 8)
+HABITS_REPORT_CHUNK_SIZE = _env_int("HABITS_REPORT_CHUNK_SIZE", 100)
+# Снапшоты отчётов для /habits (?fresh=false): старше этого возраста — устарели
+HABITS_SNAPSHOT_MAX_AGE = _env_int("HABITS_SNAPSHOT_MAX_AGE", 6 * 3600)
+
+# Дельта-синхронизация задач (/tasks/changes/): следы удалений хранятся столько дней
+TASK_TOMBSTONE_RETENTION_DAYS = _env_int("TASK_TOMBSTONE_RETENTION_DAYS", 30)
+# На сколько секунд next_since отстаёт от текущего времени (незакоммиченные транзакции)
+TASK_CHANGES_OVERLAP = _env_float("TASK_CHANGES_OVERLAP", 5.0)
+
+# Отчёт о привычках по дневным агрегатам (UserDailyStats) вместо сырых задач
+HABITS_USE_DAILY_STATS = _env_bool("HABITS_USE_DAILY_STATS", False)
+
+# Кэш отчётов о привычках (ключ включает версию данных пользователя)
+HABITS_REPORT_CACHE_TTL = _env_int("HABITS_REPORT_CACHE_TTL", 86400)
+HABITS_REPORT_CACHE_MAX_BYTES = _env_int(
+    "HABITS_REPORT_CACHE_MAX_BYTES", 16 * 1024 * 1024
+)
+
+# Снапшот пользователя для JWT-аутентификации: общий кэш и LRU процесса.
+# Локальный TTL — сколько другой процесс может видеть старый снапшот после изменения.
+AUTH_USER_CACHE_TTL = _env_int("AUTH_USER_CACHE_TTL", 300)
+AUTH_USER_LOCAL_CACHE_TTL = _env_float("AUTH_USER_LOCAL_CACHE_TTL", 5.0)
+AUTH_USER_LOCAL_CACHE_SIZE = _env_int("AUTH_USER_LOCAL_CACHE_SIZE", 10_000)
+
+# Версии данных пользователя и ETag должны быть видны всем процессам, поэтому
+# без CACHE_URL используется Redis брокера. Память процесса — только для
+# локальной разработки в один процесс, когда нет ни того, ни другого.
+CACHE_URL = os.getenv("CACHE_URL") or CELERY_BROKER_URL
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+            "KEY_PREFIX": "ssta",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
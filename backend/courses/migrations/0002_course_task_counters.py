@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (("courses", "0001_initial"),)
+
+    operations = (
+        migrations.AddField(
+            model_name="course",
+            name="cancelled_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="done_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="total_count",
+            field=models.IntegerField(default=0),
+        ),
+    )
@@ -8,7 +8,36 @@ if TYPE_CHECKING:
     pass
 
 
-class Course(models.Model):
+COUNTER_FIELDS = ["total_count", "done_count", "cancelled_count"]
+
+
+def progress_percent(total: int, cancelled: int, done: int) -> int:
+    """Процент выполненных среди неотменённых задач (целочисленно, как в SQL)."""
+    active = total - cancelled
+    if active <= 0:
+        return 0
+    return done * 100 // active
+
+
+class TaskCounters(models.Model):
+    """
+    Денормализованные счётчики задач. Меняются F()-обновлениями в той же
+    транзакции, что и задача; расхождения чинит reconcile_task_counters.
+    """
+
+    total_count: models.IntegerField = models.IntegerField(default=0)
+    done_count: models.IntegerField = models.IntegerField(default=0)
+    cancelled_count: models.IntegerField = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def counters_progress(self) -> int:
+        return progress_percent(self.total_count, self.cancelled_count, self.done_count)
+
+
+class Course(TaskCounters):
     id: models.UUIDField = models.UUIDField(
         primary_key=True, default=uuid.uuid4, editable=False
     )
@@ -3,6 +3,17 @@ from .models import Course
 
 
 class CourseSerializer(serializers.ModelSerializer):
+    progress = serializers.IntegerField(source="counters_progress", read_only=True)
+
     class Meta:
         model = Course
-        fields = ("id", "title", "description")
+        fields = (
+            "id",
+            "title",
+            "description",
+            "total_count",
+            "done_count",
+            "cancelled_count",
+            "progress",
+        )
+        read_only_fields = ("total_count", "done_count", "cancelled_count")
@@ -0,0 +1,33 @@
+import uuid
+
+from django.db import models
+
+
+class OutboxMessage(models.Model):
+    """
+    Исходящее сообщение в брокер, записанное в той же транзакции, что и
+    изменение состояния. Отправляется relay-задачей notifications.relay_outbox.
+    """
+
+    id: models.UUIDField = models.UUIDField(
+        primary_key=True, default=uuid.uuid4, editable=False
+    )
+    idempotency_key: models.CharField = models.CharField(max_length=255, unique=True)
+    task_name: models.CharField = models.CharField(max_length=255)
+    queue: models.CharField = models.CharField(max_length=255)
+    payload: models.JSONField = models.JSONField()
+    created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
+    sent_at: models.DateTimeField = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("created_at",)
+        indexes = (
+            models.Index(
+                fields=["created_at"],
+                name="outbox_unsent_created_at_idx",
+                condition=models.Q(sent_at__isnull=True),
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.task_name} [{self.idempotency_key}]"
@@ -1,11 +1,21 @@
 import logging
+import threading
+import uuid
+from functools import partial
 from typing import Any
 
 from celery import current_app
 from django.conf import settings
+from django.db import transaction
+
+from .models import OutboxMessage
 
 logger = logging.getLogger(__name__)
 
+RELAY_TASK = "notifications.relay_outbox"
+
+_relay_state = threading.local()
+
 
 def publish_telegram_message(
     *,
@@ -13,15 +23,25 @@ def publish_telegram_message(
     text: str,
     parse_mode: str = "HTML",
     extra: dict[str, Any] | None = None,
+    idempotency_key: str | None = None,
 ) -> None:
+    """
+    Публикует сообщение для bot.send_message.
+
+    При NOTIFICATIONS_OUTBOX_ENABLED сообщение пишется в OutboxMessage в текущей
+    транзакции, а relay-задача запускается сразу после коммита (beat с
+    интервалом OUTBOX_RELAY_INTERVAL остаётся страховкой); повтор с тем же
+    idempotency_key игнорируется.
+    """
     task_name = getattr(settings, "BOT_SEND_MESSAGE_TASK", "bot.send_message")
     queue_name = getattr(settings, "BOT_QUEUE", "telegram")
+    key = idempotency_key or str(uuid.uuid4())
 
     payload = {
         "chat_id": telegram_id,
         "text": text,
         "parse_mode": parse_mode,
-        "extra": extra or {},
+        "extra": {**(extra or {}), "idempotency_key": key},
     }
 
     logger.info(
@@ -30,7 +50,45 @@ def publish_telegram_message(
             "telegram_id": telegram_id,
             "task_name": task_name,
             "queue": queue_name,
+            "idempotency_key": key,
         },
     )
 
-    current_app.send_task(task_name, kwargs=payload, queue=queue_name)
+    if getattr(settings, "NOTIFICATIONS_OUTBOX_ENABLED", False):
+        OutboxMessage.objects.bulk_create(
+            [
+                OutboxMessage(
+                    idempotency_key=key,
+                    task_name=task_name,
+                    queue=queue_name,
+                    payload=payload,
+                )
+            ],
+            ignore_conflicts=True,
+        )
+        if getattr(settings, "OUTBOX_RELAY_ON_COMMIT", True):
+            _schedule_relay()
+        return
+
+    current_app.send_task(task_name, kwargs=payload, queue=queue_name, task_id=key)
+
+
+def _schedule_relay() -> None:
+    # Одна relay-задача на транзакцию, сколько бы сообщений в ней ни было:
+    # колбэки одной транзакции получают одно поколение, первый из них
+    # отправляет задачу и сдвигает поколение, остальные ничего не делают.
+    # При откате колбэки отбрасываются вместе с транзакцией, а поколение
+    # остаётся прежним, так что следующая транзакция снова запустит relay.
+    generation = getattr(_relay_state, "generation", 0)
+    transaction.on_commit(partial(_trigger_relay, generation))
+
+
+def _trigger_relay(generation: int) -> None:
+    if getattr(_relay_state, "generation", 0) != generation:
+        return
+    _relay_state.generation = generation + 1
+    try:
+        current_app.send_task(RELAY_TASK)
+    except Exception:
+        # Сообщения уже в outbox, их заберёт relay по расписанию.
+        logger.warning("Failed to trigger outbox relay", exc_info=True)
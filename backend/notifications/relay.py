@@ -0,0 +1,70 @@
+import logging
+from datetime import timedelta
+
+from celery import current_app
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def relay_outbox_batch(batch_size: int) -> int:
+    """
+    Отправляет пачку неотправленных сообщений в брокер через один producer
+    и помечает их sent_at одним UPDATE.
+
+    Если процесс упадёт после отправки, но до коммита, пачка уйдёт повторно с
+    теми же task_id/idempotency_key. Бот забирает idempotency_key в Redis
+    перед отправкой (bot.utils.dedupe) и пропускает повтор.
+    """
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.filter(sent_at__isnull=True)
+            .select_for_update(skip_locked=True)
+            .order_by("created_at")[:batch_size]
+        )
+        if not messages:
+            return 0
+
+        with current_app.producer_or_acquire() as producer:
+            for message in messages:
+                current_app.send_task(
+                    message.task_name,
+                    kwargs=message.payload,
+                    queue=message.queue,
+                    task_id=message.idempotency_key,
+                    producer=producer,
+                )
+
+        OutboxMessage.objects.filter(pk__in=[m.pk for m in messages]).update(
+            sent_at=timezone.now()
+        )
+
+    return len(messages)
+
+
+def relay_outbox() -> int:
+    batch_size = int(getattr(settings, "OUTBOX_RELAY_BATCH_SIZE", 500))
+
+    total = 0
+    while True:
+        relayed = relay_outbox_batch(batch_size)
+        total += relayed
+        if relayed < batch_size:
+            break
+
+    if total:
+        logger.info("Outbox relayed", extra={"count": total})
+    return total
+
+
+def purge_outbox() -> int:
+    retention = timedelta(days=int(getattr(settings, "OUTBOX_RETENTION_DAYS", 7)))
+    deleted, _ = OutboxMessage.objects.filter(
+        sent_at__isnull=False, sent_at__lt=timezone.now() - retention
+    ).delete()
+    logger.info("Outbox purged", extra={"deleted": deleted})
+    return deleted
@@ -0,0 +1,21 @@
+from typing import Any
+
+from celery import shared_task
+
+from . import relay
+
+
+@shared_task(  # type: ignore
+    name="notifications.relay_outbox",
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=5,
+    retry_kwargs={"max_retries": 3},
+)
+def relay_outbox(self: Any) -> int:
+    return relay.relay_outbox()
+
+
+@shared_task(name="notifications.purge_outbox")  # type: ignore
+def purge_outbox() -> int:
+    return relay.purge_outbox()
@@ -0,0 +1,64 @@
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+from notifications.models import OutboxMessage
+from notifications.publisher import publish_telegram_message
+from notifications.relay import relay_outbox
+
+
+@override_settings(NOTIFICATIONS_OUTBOX_ENABLED=True, OUTBOX_RELAY_BATCH_SIZE=2)
+class OutboxTests(TestCase):
+    def test_publish_writes_outbox_row_once_per_key(self) -> None:
+        for _ in range(2):
+            publish_telegram_message(
+                telegram_id=42, text="Привет", idempotency_key="reminder:1"
+            )
+
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.idempotency_key, "reminder:1")
+        self.assertEqual(message.payload["chat_id"], 42)
+        self.assertEqual(message.payload["extra"]["idempotency_key"], "reminder:1")
+        self.assertIsNone(message.sent_at)
+
+    @mock.patch("notifications.relay.current_app")
+    def test_relay_sends_all_batches_and_marks_sent(self, app: mock.Mock) -> None:
+        for index in range(3):
+            publish_telegram_message(
+                telegram_id=42, text=f"#{index}", idempotency_key=f"key:{index}"
+            )
+
+        self.assertEqual(relay_outbox(), 3)
+        self.assertEqual(relay_outbox(), 0)
+
+        self.assertEqual(app.send_task.call_count, 3)
+        task_ids = {call.kwargs["task_id"] for call in app.send_task.call_args_list}
+        self.assertEqual(task_ids, {"key:0", "key:1", "key:2"})
+        self.assertFalse(OutboxMessage.objects.filter(sent_at__isnull=True).exists())
+
+    @mock.patch("notifications.publisher.current_app")
+    def test_publish_triggers_one_relay_on_commit(self, app: mock.Mock) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(3):
+                publish_telegram_message(
+                    telegram_id=42, text=f"#{index}", idempotency_key=f"key:{index}"
+                )
+            app.send_task.assert_not_called()
+
+        app.send_task.assert_called_once_with("notifications.relay_outbox")
+
+    @mock.patch("notifications.publisher.current_app")
+    def test_rolled_back_publish_does_not_block_next_relay(
+        self, app: mock.Mock
+    ) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                publish_telegram_message(
+                    telegram_id=42, text="lost", idempotency_key="key:lost"
+                )
+                raise RuntimeError("rollback")
+            publish_telegram_message(
+                telegram_id=42, text="kept", idempotency_key="key:kept"
+            )
+
+        app.send_task.assert_called_once_with("notifications.relay_outbox")
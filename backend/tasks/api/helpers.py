@@ -1,21 +1,37 @@
 import logging
-from datetime import timedelta
+from datetime import UTC, datetime, timedelta, tzinfo
 from typing import Any, cast
+from urllib.parse import urlencode
 
 from django.db.models import QuerySet
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import parse_etags
+from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 from users.models import User
-
-from ..models import Task
+from users.utils.timezone import (
+    get_user_timezone,
+    local_day_start,
+    local_days_range,
+    localize,
+)
+
+from ..models import HabitsReportSnapshot, Task
 from ..services.reminders import create_default_reminders
 
 logger = logging.getLogger(__name__)
 
 FILTER_TODAY = "today"
 FILTER_WEEK = "week"
+FILTER_OVERDUE = "overdue"
+FILTER_UPCOMING = "upcoming"
+DUE_FILTERS = {FILTER_TODAY, FILTER_WEEK, FILTER_OVERDUE, FILTER_UPCOMING}
+DUE_FROM_PARAM = "from"
+DUE_TO_PARAM = "to"
+WEEK_FILTER_DAYS = 8
 DEFAULT_HABITS_DAYS = 30
 MIN_HABITS_DAYS = 7
 MAX_HABITS_DAYS = 90
@@ -48,21 +64,42 @@ class TaskUserMixin:
         return cast(User, self.get_request().user)
 
 
-def build_task_list_queryset(request: Request, user: User) -> QuerySet[Any]:
-    queryset = Task.objects.filter(user=user)
+def build_task_list_queryset(
+    request: Request, user: User, user_tz: tzinfo | None = None
+) -> QuerySet[Any]:
+    queryset = Task.objects.filter(user=user).select_related("topic")
     filter_by = request.query_params.get("filter")
     topic_id = request.query_params.get("topic")
     now = timezone.now()
+    user_tz = user_tz or get_user_timezone(user)
 
     logger.debug(
         "Tasks list requested",
         extra={"user_id": user.id, "filter": filter_by, "topic_id": topic_id},
     )
 
-    queryset = _apply_date_filter(queryset, filter_by, now)
+    queryset = _apply_date_filter(queryset, filter_by, now, user_tz)
+    queryset = _apply_due_range_filter(queryset, request, user_tz)
+    if is_due_ordered_request(request):
+        queryset = queryset.order_by("due_at", "id")
     return _apply_topic_filter(queryset, topic_id)
 
 
+def is_due_ordered_request(request: Request) -> bool:
+    """Фильтры по дедлайну: список идёт по due_at (индекс user, due_at)."""
+    params = request.query_params
+    return (
+        params.get("filter") in DUE_FILTERS
+        or DUE_FROM_PARAM in params
+        or DUE_TO_PARAM in params
+    )
+
+
+def is_time_relative_request(request: Request) -> bool:
+    """Результат меняется со временем без изменения данных (нельзя отдавать 304)."""
+    return request.query_params.get("filter") in {FILTER_OVERDUE, FILTER_UPCOMING}
+
+
 def handle_created_task(task: Task, user_id: int | str) -> None:
     create_default_reminders(task)
     log_task_action(
@@ -89,21 +126,19 @@ def handle_updated_task(task: Task, old_data: TaskSnapshot) -> None:
     changed_fields = _build_changed_fields(task, old_data)
     _handle_due_at_change(task, changed_fields)
     _handle_status_change(task, changed_fields)
-    user = cast(User, task.user)
     log_task_action(
         "updated",
         task,
-        user.id,
+        task.user_id,
         extra_fields={"changed_fields": changed_fields},
     )
 
 
 def handle_deleted_task(task: Task) -> None:
-    user = cast(User, task.user)
     log_task_action(
         "deleted",
         task,
-        user.id,
+        task.user_id,
         extra_fields={"title": task.title},
     )
     task.delete()
@@ -118,15 +153,41 @@ def parse_habits_days(request: Request) -> int | Response:
 
     if days < MIN_HABITS_DAYS or days > MAX_HABITS_DAYS:
         return Response(
-            {
-                "detail": f"Days must be between {MIN_HABITS_DAYS} and {MAX_HABITS_DAYS}"
-            },
+            {"detail": f"Days must be between {MIN_HABITS_DAYS} and {MAX_HABITS_DAYS}"},
             status=400,
         )
 
     return days
 
 
+def parse_changed_since(request: Request) -> datetime | Response:
+    try:
+        value = parse_datetime(request.query_params.get("changed_since", ""))
+    except ValueError:
+        value = None
+    if value is None:
+        return Response(
+            {"detail": "changed_since must be an ISO 8601 datetime"}, status=400
+        )
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, UTC)
+    return value
+
+
+def canonical_query(request: Request) -> str:
+    return urlencode(sorted(request.query_params.lists()), doseq=True)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    etags = parse_etags(request.headers.get("If-None-Match", ""))
+    return "*" in etags or etag in etags
+
+
+def parse_fresh_flag(request: Request) -> bool:
+    value = request.query_params.get("fresh", "true").strip().lower()
+    return value not in {"false", "0", "no"}
+
+
 def serialize_habits_report(report: Any) -> dict[str, Any]:
     return {
         "short_text": report.short_text,
@@ -135,17 +196,66 @@ def serialize_habits_report(report: Any) -> dict[str, Any]:
     }
 
 
+def serialize_habits_snapshot(snapshot: HabitsReportSnapshot) -> dict[str, Any]:
+    data = serialize_habits_report(snapshot)
+    data["generated_at"] = snapshot.generated_at.isoformat()
+    return data
+
+
 def _apply_date_filter(
-    queryset: QuerySet[Any], filter_by: str | None, now: Any
+    queryset: QuerySet[Any], filter_by: str | None, now: datetime, user_tz: tzinfo
 ) -> QuerySet[Any]:
+    """
+    Дни считаются в таймзоне пользователя, а фильтр — полуоткрытый интервал
+    по самому due_at (без обёртки в функцию), чтобы работал индекс.
+    """
     if filter_by == FILTER_TODAY:
-        queryset = queryset.filter(due_at__date=now.date())
+        start, end = local_days_range(now, user_tz)
+        queryset = queryset.filter(due_at__gte=start, due_at__lt=end)
     elif filter_by == FILTER_WEEK:
-        end_week = now + timedelta(days=7)
-        queryset = queryset.filter(due_at__date__range=(now.date(), end_week.date()))
+        # Сегодня и ещё семь дней, как и раньше.
+        start, end = local_days_range(now, user_tz, days=WEEK_FILTER_DAYS)
+        queryset = queryset.filter(due_at__gte=start, due_at__lt=end)
+    elif filter_by == FILTER_OVERDUE:
+        queryset = queryset.filter(due_at__lt=now, status=Task.Status.PENDING)
+    elif filter_by == FILTER_UPCOMING:
+        queryset = queryset.filter(due_at__gte=now, status=Task.Status.PENDING)
     return queryset
 
 
+def _apply_due_range_filter(
+    queryset: QuerySet[Any], request: Request, user_tz: tzinfo
+) -> QuerySet[Any]:
+    """?from= / ?to=: дата (локальный день целиком) или datetime, интервал [from, to)."""
+    params = request.query_params
+    if DUE_FROM_PARAM in params:
+        start = _parse_due_bound(params[DUE_FROM_PARAM], DUE_FROM_PARAM, user_tz)
+        queryset = queryset.filter(due_at__gte=start)
+    if DUE_TO_PARAM in params:
+        end = _parse_due_bound(params[DUE_TO_PARAM], DUE_TO_PARAM, user_tz)
+        queryset = queryset.filter(due_at__lt=end)
+    return queryset
+
+
+def _parse_due_bound(value: str, name: str, user_tz: tzinfo) -> datetime:
+    try:
+        parsed_date = parse_date(value)
+        parsed_datetime = None if parsed_date else parse_datetime(value)
+    except ValueError:
+        parsed_date = parsed_datetime = None
+
+    if parsed_date is not None:
+        # Дата в to включается целиком: граница — начало следующего дня.
+        if name == DUE_TO_PARAM:
+            parsed_date += timedelta(days=1)
+        return local_day_start(parsed_date, user_tz)
+    if parsed_datetime is None:
+        raise ValidationError({name: "Expected an ISO 8601 date or datetime."})
+    if timezone.is_naive(parsed_datetime):
+        parsed_datetime = localize(parsed_datetime, user_tz)
+    return parsed_datetime
+
+
 def _apply_topic_filter(queryset: QuerySet[Any], topic_id: str | None) -> QuerySet[Any]:
     if topic_id:
         queryset = queryset.filter(topic_id=topic_id)
@@ -164,7 +274,9 @@ def _handle_due_at_change(task: Task, changed_fields: ChangedFields) -> None:
     if "due_at" not in changed_fields:
         return
     reminders_manager = cast(Any, getattr(task, "reminders"))
-    reminders_manager.all().delete()
+    # Отправленные остаются: по ним считается «напоминание помогло», и
+    # вклад выполненной задачи в UserDailyStats не должен от них зависеть.
+    reminders_manager.filter(sent=False).delete()
     create_default_reminders(task)
 
 
@@ -175,5 +287,6 @@ def _handle_status_change(task: Task, changed_fields: ChangedFields) -> None:
 
 
 def _sync_completed_at(task: Task) -> None:
-    completed_at = timezone.now() if task.status == Task.Status.DONE else None
-    Task.objects.filter(pk=task.pk).update(completed_at=completed_at)
+    # Через save(): сигналы переносят вклад выполнения в UserDailyStats.
+    task.completed_at = timezone.now() if task.status == Task.Status.DONE else None
+    task.save(update_fields=["completed_at", "updated_at"])
@@ -0,0 +1,91 @@
+from typing import Any
+
+from django.db.models import Q
+from rest_framework.pagination import BasePagination, Cursor, CursorPagination
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .helpers import is_due_ordered_request
+
+PAGINATION_CURSOR = "cursor"
+POSITION_SEPARATOR = "|"
+
+
+class TaskCursorPagination(CursorPagination):
+    """
+    Курсорная (keyset) пагинация списка задач: без COUNT(*) и OFFSET,
+    глубокие страницы стоят столько же, сколько первая, а вставки между
+    запросами не сдвигают страницы. Индекс: (user, -created_at, -id).
+
+    Позиция курсора составная — «значение|id»: стандартный CursorPagination
+    хранит только первое поле и при равных created_at откатывается к OFFSET,
+    из-за чего вставка между запросами сдвигала первую страницу.
+    """
+
+    ordering = ("-created_at", "-id")
+    due_ordering = ("due_at", "id")
+    page_size_query_param = "limit"
+    max_page_size = 100
+
+    def get_ordering(
+        self, request: Request, queryset: Any, view: Any
+    ) -> tuple[str, ...]:
+        if is_due_ordered_request(request):
+            return self.due_ordering
+        return tuple(super().get_ordering(request, queryset, view))
+
+    def paginate_queryset(
+        self, queryset: Any, request: Request, view: Any = None
+    ) -> list[Any] | None:
+        cursor = super().decode_cursor(request)
+        position = cursor.position if cursor else None
+        if cursor is not None and position is not None:
+            ordering = self.get_ordering(request, queryset, view)
+            queryset = queryset.filter(
+                keyset_filter(ordering, position, reverse=cursor.reverse)
+            )
+
+        page = super().paginate_queryset(queryset, request, view)
+
+        # Базовый класс видел курсор без позиции — восстанавливаем ссылку назад.
+        if cursor is not None and position is not None:
+            if cursor.reverse:
+                self.has_next = True
+                self.next_position = position
+            else:
+                self.has_previous = True
+                self.previous_position = position
+        return page
+
+    def decode_cursor(self, request: Request) -> Cursor | None:
+        # Позицию уже применил keyset_filter; базовому классу остаётся offset.
+        cursor = super().decode_cursor(request)
+        return cursor._replace(position=None) if cursor else None
+
+    def _get_position_from_instance(self, instance: Any, ordering: Any) -> str:
+        value = super()._get_position_from_instance(instance, ordering)
+        return f"{value}{POSITION_SEPARATOR}{instance.pk}"
+
+
+def keyset_filter(ordering: tuple[str, ...], position: str, reverse: bool = False) -> Q:
+    """
+    Строки строго после позиции «значение|id» в порядке ordering. Отдельное
+    условие на первое поле (<= / >=) даёт индексу границу диапазона.
+    """
+    value, _, pk = position.rpartition(POSITION_SEPARATOR)
+    field, pk_field = (name.lstrip("-") for name in ordering[:2])
+    descending = ordering[0].startswith("-") != reverse
+    after, bound = ("lt", "lte") if descending else ("gt", "gte")
+    return Q(**{f"{field}__{bound}": value}) & (
+        Q(**{f"{field}__{after}": value})
+        | Q(**{field: value, f"{pk_field}__{after}": pk})
+    )
+
+
+def select_task_paginator(request: Request) -> BasePagination | None:
+    """Курсорный режим включается явно: ?pagination=cursor или ?cursor=..."""
+    params = request.query_params
+    if params.get("pagination") == PAGINATION_CURSOR or PAGINATION_CURSOR in params:
+        return TaskCursorPagination()
+    pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
+    return pagination_class() if pagination_class else None
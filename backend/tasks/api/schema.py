@@ -6,7 +6,26 @@ TASK_LIST_PARAMETERS = [
         name="filter",
         type=OpenApiTypes.STR,
         location=OpenApiParameter.QUERY,
-        description="Фильтр задач: today или week.",
+        description=(
+            "Фильтр задач: today, week (сегодня и ещё 7 дней), overdue "
+            "(просроченные невыполненные) или upcoming. Дни считаются "
+            "в таймзоне пользователя."
+        ),
+    ),
+    OpenApiParameter(
+        name="from",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        description=(
+            "Дедлайн не раньше: дата (начало локального дня) или datetime. "
+            "Время без смещения — в таймзоне пользователя."
+        ),
+    ),
+    OpenApiParameter(
+        name="to",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        description="Дедлайн строго раньше datetime; дата включается целиком.",
     ),
     OpenApiParameter(
         name="topic",
@@ -14,6 +33,34 @@ TASK_LIST_PARAMETERS = [
         location=OpenApiParameter.QUERY,
         description="UUID темы для фильтрации задач.",
     ),
+    OpenApiParameter(
+        name="pagination",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        description=(
+            "cursor — курсорная пагинация (next/previous без count). "
+            "Сортировка: по created_at, с фильтрами по дедлайну — по due_at."
+        ),
+    ),
+    OpenApiParameter(
+        name="cursor",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        description="Курсор страницы из ссылок next/previous.",
+    ),
+]
+
+TASK_CHANGES_PARAMETERS = [
+    OpenApiParameter(
+        name="changed_since",
+        type=OpenApiTypes.DATETIME,
+        location=OpenApiParameter.QUERY,
+        required=True,
+        description=(
+            "ISO 8601. Если старше TASK_TOMBSTONE_RETENTION_DAYS — ответ 410, "
+            "нужно заново загрузить полный список."
+        ),
+    ),
 ]
 
 HABITS_REPORT_PARAMETERS = [
@@ -23,4 +70,13 @@ HABITS_REPORT_PARAMETERS = [
         location=OpenApiParameter.QUERY,
         description="Период отчета в днях. Допустимый диапазон: 7-90.",
     ),
+    OpenApiParameter(
+        name="fresh",
+        type=OpenApiTypes.BOOL,
+        location=OpenApiParameter.QUERY,
+        description=(
+            "false — вернуть последний готовый снапшот отчета и обновить его "
+            "в фоне, если он устарел. По умолчанию true."
+        ),
+    ),
 ]
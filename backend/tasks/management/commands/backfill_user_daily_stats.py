@@ -0,0 +1,29 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from tasks.services.habits.rollup import rebuild_user_daily_stats
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересобирает дневные агрегаты привычек (UserDailyStats) по задачам. "
+        "Нужен после включения HABITS_USE_DAILY_STATS и при смене таймзоны."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--user",
+            dest="user_ids",
+            action="append",
+            default=[],
+            help="ID пользователя (можно указать несколько раз).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        users = User.objects.order_by("pk")
+        if options["user_ids"]:
+            users = users.filter(pk__in=options["user_ids"])
+
+        rows = rebuild_user_daily_stats(users.iterator())
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} daily stats rows"))
@@ -0,0 +1,150 @@
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+from redis import RedisError
+from tasks.services.dispatcher import OP_DELETE, HierarchicalTimingWheel
+from tasks.services.dispatcher.stream import get_last_event_id, read_reminder_events
+from tasks.services.reminders import get_due_reminders
+from tasks.services.scheduled import dispatch_reminder_ids
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_CHUNK_SIZE = 500
+# Пауза после ошибки БД или Redis растёт вдвое до этого предела (секунды)
+MAX_ERROR_BACKOFF = 30.0
+
+
+class Command(BaseCommand):
+    help = (
+        "Диспетчер напоминаний: держит ближайшие напоминания в timing wheel, "
+        "получает изменения из Redis stream и отправляет их в нужную секунду."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--horizon-hours",
+            type=int,
+            default=getattr(settings, "REMINDER_DISPATCHER_HORIZON_HOURS", 6),
+            help="На сколько часов вперёд загружать напоминания из БД.",
+        )
+        parser.add_argument(
+            "--tick",
+            type=float,
+            default=1.0,
+            help="Точность срабатывания в секундах.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        horizon = timedelta(hours=options["horizon_hours"])
+        tick: float = options["tick"]
+        wheel: HierarchicalTimingWheel[str] = HierarchicalTimingWheel(
+            start=time.time(), tick=tick
+        )
+
+        # Запоминаем позицию stream до загрузки окна, чтобы не потерять
+        # изменения, сделанные во время загрузки.
+        backoff = tick
+        while True:
+            close_old_connections()
+            try:
+                last_id = get_last_event_id()
+                window_end = self._load_window(wheel, horizon)
+                break
+            except (DatabaseError, RedisError):
+                logger.exception("Reminder dispatcher startup failed")
+                backoff = self._sleep(backoff)
+        reload_at = time.time() + horizon.total_seconds() / 2
+
+        backoff = tick
+        while True:
+            # Процесс живёт долго: соединение, оборванное или сломанное
+            # ошибкой, закрываем, и следующий запрос откроет новое.
+            close_old_connections()
+            try:
+                events = read_reminder_events(last_id, max(1, int(tick * 1000)))
+            except RedisError:
+                logger.exception("Reminder stream read failed")
+                events = []
+                backoff = self._sleep(backoff)
+            else:
+                backoff = tick
+            for event_id, fields in events:
+                last_id = event_id
+                self._apply_event(wheel, fields, window_end)
+
+            due = wheel.advance(time.time())
+            if due:
+                self._dispatch(due)
+
+            if time.time() >= reload_at:
+                try:
+                    window_end = self._load_window(wheel, horizon)
+                    reload_at = time.time() + horizon.total_seconds() / 2
+                except DatabaseError:
+                    logger.exception("Reminder window reload failed")
+                    reload_at = time.time() + MAX_ERROR_BACKOFF
+
+    @staticmethod
+    def _sleep(backoff: float) -> float:
+        """Пауза перед повтором; возвращает следующую паузу."""
+        time.sleep(backoff)
+        return min(backoff * 2, MAX_ERROR_BACKOFF)
+
+    def _load_window(
+        self, wheel: HierarchicalTimingWheel[str], horizon: timedelta
+    ) -> datetime:
+        window_end = timezone.now() + horizon
+        rows = get_due_reminders(window_end).values_list("id", "notify_at")
+
+        loaded = 0
+        for reminder_id, notify_at in rows.iterator(chunk_size=2000):
+            if wheel.schedule(str(reminder_id), notify_at.timestamp()):
+                loaded += 1
+
+        logger.info(
+            "Reminder window loaded",
+            extra={"loaded": loaded, "window_end": window_end, "pending": len(wheel)},
+        )
+        return window_end
+
+    def _apply_event(
+        self,
+        wheel: HierarchicalTimingWheel[str],
+        fields: dict[str, str],
+        window_end: datetime,
+    ) -> None:
+        reminder_id = fields["reminder_id"]
+        if fields["op"] == OP_DELETE or fields.get("sent") == "1":
+            wheel.cancel(reminder_id)
+            return
+
+        notify_at = float(fields["notify_at"])
+        if datetime.fromtimestamp(notify_at, tz=UTC) > window_end:
+            # Попадёт в колесо при следующей загрузке окна.
+            wheel.cancel(reminder_id)
+            return
+        wheel.schedule(reminder_id, notify_at)
+
+    def _dispatch(self, reminder_ids: list[str]) -> None:
+        now = timezone.now()
+        sent = 0
+        for start in range(0, len(reminder_ids), DISPATCH_CHUNK_SIZE):
+            chunk = reminder_ids[start : start + DISPATCH_CHUNK_SIZE]
+            try:
+                sent += dispatch_reminder_ids(chunk, now)
+            except Exception:
+                # Напоминания останутся unsent и будут подобраны sweep-ом.
+                logger.exception(
+                    "Reminder dispatch failed", extra={"count": len(chunk)}
+                )
+
+        logger.info(
+            "Reminders dispatched",
+            extra={"expired": len(reminder_ids), "sent": sent},
+        )
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (("tasks", "0005_task_completed_at"),)
+
+    operations = (
+        migrations.AddIndex(
+            model_name="reminder",
+            index=models.Index(
+                condition=models.Q(("sent", False)),
+                fields=["notify_at"],
+                name="reminder_unsent_notify_at_idx",
+            ),
+        ),
+    )
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:14
+
+import uuid
+
+import django.db.models.deletion
+import tasks.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (
+        ("tasks", "0006_reminder_unsent_notify_at_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    )
+
+    operations = (
+        migrations.CreateModel(
+            name="UserDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("local_date", models.DateField()),
+                ("created_count", models.IntegerField(default=0)),
+                ("done_count", models.IntegerField(default=0)),
+                ("on_time_count", models.IntegerField(default=0)),
+                ("overdue_count", models.IntegerField(default=0)),
+                ("no_due_count", models.IntegerField(default=0)),
+                ("reminder_helped_count", models.IntegerField(default=0)),
+                ("reminders_before_done_count", models.IntegerField(default=0)),
+                (
+                    "done_by_hour",
+                    models.JSONField(default=tasks.models._empty_hour_histogram),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["local_date"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "local_date"),
+                        name="user_daily_stats_unique_day",
+                    )
+                ],
+            },
+        ),
+    )
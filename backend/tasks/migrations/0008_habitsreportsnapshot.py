@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:24
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (
+        ("tasks", "0007_userdailystats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    )
+
+    operations = (
+        migrations.CreateModel(
+            name="HabitsReportSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("days", models.PositiveSmallIntegerField()),
+                ("short_text", models.TextField()),
+                ("long_text", models.TextField()),
+                ("metrics", models.JSONField(default=dict)),
+                ("data_version", models.BigIntegerField(default=0)),
+                ("generated_at", models.DateTimeField()),
+                ("generation_ms", models.PositiveIntegerField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="habits_snapshots",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["generated_at"], name="habits_snapshot_generated_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "days"), name="habits_snapshot_unique_period"
+                    )
+                ],
+            },
+        ),
+    )
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (
+        ("tasks", "0010_task_updated_at_tombstones"),
+        ("topics", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    )
+
+    operations = (
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["user", "due_at"], name="task_user_due_idx"),
+        ),
+    )
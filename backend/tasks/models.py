@@ -1,7 +1,7 @@
 import uuid
-from typing import ClassVar
+from typing import Any, ClassVar
 
-from django.db import models
+from django.db import models, transaction
 
 from topics.models import Topic
 from users.models import User
@@ -55,13 +55,62 @@ class Task(models.Model):
     completed_at: ClassVar[models.DateTimeField] = models.DateTimeField(
         null=True, blank=True
     )
+    updated_at: ClassVar[models.DateTimeField] = models.DateTimeField(auto_now=True)
+
+    # (topic_id, status) строки в БД, прочитанные под блокировкой в pre_save
+    # и pre_delete; по ним сигналы сдвигают счётчики тем и курсов.
+    saved_state: tuple[Any, str] | None = None
+    # (completed_at, due_at) выполнения из той же строки — для UserDailyStats.
+    saved_completion: Any = None
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = (
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="task_user_created_id_idx",
+            ),
+            # Фильтры today/week/overdue/upcoming/from/to — range scan по due_at.
+            models.Index(fields=["user", "due_at"], name="task_user_due_idx"),
+            # Дельта-синхронизация: updated_at > changed_since.
+            models.Index(fields=["user", "updated_at"], name="task_user_updated_idx"),
+        )
 
     def __str__(self) -> str:
         return f"{self.title} ({self.status})"
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        # Блокировка строки из pre_save держится до сдвига счётчиков в post_save.
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+
+
+class TaskTombstone(models.Model):
+    """
+    След удалённой задачи для дельта-синхронизации (`/tasks/changes/`).
+    Хранится TASK_TOMBSTONE_RETENTION_DAYS дней.
+    """
+
+    id: models.UUIDField = models.UUIDField(
+        primary_key=True, default=uuid.uuid4, editable=False
+    )
+    user = models.ForeignKey(  # type: ignore
+        User, on_delete=models.CASCADE, related_name="task_tombstones"
+    )
+    task_id: models.UUIDField = models.UUIDField()
+    deleted_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("deleted_at",)
+        indexes = (
+            models.Index(
+                fields=["user", "deleted_at"], name="tombstone_user_deleted_idx"
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"Tombstone {self.task_id} @ {self.deleted_at}"
+
 
 class Reminder(models.Model):
     id: models.UUIDField = models.UUIDField(
@@ -73,6 +122,86 @@ class Reminder(models.Model):
 
     class Meta:
         ordering = ["notify_at"]
+        indexes = (
+            # Частичный индекс для due-скана: отправленные напоминания в него не попадают.
+            models.Index(
+                fields=["notify_at"],
+                name="reminder_unsent_notify_at_idx",
+                condition=models.Q(sent=False),
+            ),
+        )
 
     def __str__(self) -> str:
         return f"Reminder for {self.task.title} at {self.notify_at}"
+
+
+def _empty_hour_histogram() -> list[int]:
+    return [0] * 24
+
+
+class UserDailyStats(models.Model):
+    """
+    Дневной срез привычек пользователя (дата — в его таймзоне).
+    Обновляется инкрементально при создании, смене статуса и удалении задач.
+    """
+
+    id: models.UUIDField = models.UUIDField(
+        primary_key=True, default=uuid.uuid4, editable=False
+    )
+    user = models.ForeignKey(  # type: ignore
+        User, on_delete=models.CASCADE, related_name="daily_stats"
+    )
+    local_date: models.DateField = models.DateField()
+    created_count: models.IntegerField = models.IntegerField(default=0)
+    done_count: models.IntegerField = models.IntegerField(default=0)
+    on_time_count: models.IntegerField = models.IntegerField(default=0)
+    overdue_count: models.IntegerField = models.IntegerField(default=0)
+    no_due_count: models.IntegerField = models.IntegerField(default=0)
+    reminder_helped_count: models.IntegerField = models.IntegerField(default=0)
+    reminders_before_done_count: models.IntegerField = models.IntegerField(default=0)
+    done_by_hour: models.JSONField = models.JSONField(default=_empty_hour_histogram)
+
+    class Meta:
+        ordering = ("local_date",)
+        constraints = (
+            models.UniqueConstraint(
+                fields=["user", "local_date"], name="user_daily_stats_unique_day"
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"Stats {self.user_id} {self.local_date}"
+
+
+class HabitsReportSnapshot(models.Model):
+    """
+    Готовый отчёт о привычках за период `days`. Пересчитывается фоново
+    (ночью и по запросу, если устарел) и отдаётся без ожидания LLM.
+    """
+
+    id: models.UUIDField = models.UUIDField(
+        primary_key=True, default=uuid.uuid4, editable=False
+    )
+    user = models.ForeignKey(  # type: ignore
+        User, on_delete=models.CASCADE, related_name="habits_snapshots"
+    )
+    days: models.PositiveSmallIntegerField = models.PositiveSmallIntegerField()
+    short_text: models.TextField = models.TextField()
+    long_text: models.TextField = models.TextField()
+    metrics: models.JSONField = models.JSONField(default=dict)
+    data_version: models.BigIntegerField = models.BigIntegerField(default=0)
+    generated_at: models.DateTimeField = models.DateTimeField()
+    generation_ms: models.PositiveIntegerField = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=["user", "days"], name="habits_snapshot_unique_period"
+            ),
+        )
+        indexes = (
+            models.Index(fields=["generated_at"], name="habits_snapshot_generated_idx"),
+        )
+
+    def __str__(self) -> str:
+        return f"Habits {self.user_id} {self.days}d @ {self.generated_at}"
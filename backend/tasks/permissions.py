@@ -7,8 +7,9 @@ from rest_framework.views import APIView
 
 class IsOwner(permissions.BasePermission):
     """
-    Разрешает доступ только владельцу объекта.
+    Разрешает доступ только владельцу объекта. Сравнивает user_id,
+    чтобы не загружать пользователя объекта.
     """
 
     def has_object_permission(self, request: Request, view: APIView, obj: Any) -> bool:
-        return bool(obj.user == request.user)
+        return bool(obj.user_id == request.user.pk)
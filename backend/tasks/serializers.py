@@ -1,4 +1,4 @@
-from datetime import timezone as dt_timezone, datetime
+from datetime import timezone as dt_timezone, datetime, tzinfo
 import logging
 from typing import Any, Optional, cast
 
@@ -9,10 +9,66 @@ from .models import Task
 from topics.models import Topic
 
 from users.models import User
-from users.utils.timezone import get_user_timezone
+from users.utils.timezone import get_user_timezone, localize
 
 logger = logging.getLogger(__name__)
 
+USER_TZ_CONTEXT_KEY = "user_tz"
+
+_datetime_field = serializers.DateTimeField()
+
+
+def _format_datetime(value: datetime | None) -> str | None:
+    if value is None:
+        return None
+    return cast(str, _datetime_field.to_representation(value))
+
+
+def render_task(task: Task, user_tz: tzinfo | None) -> dict[str, Any]:
+    """
+    Быстрый рендер задачи для чтения: тот же JSON, что у TaskSerializer,
+    но без обхода полей ModelSerializer. topic должен быть подгружен
+    через select_related("topic").
+    """
+    topic = cast(Topic | None, task.topic)
+    due_at = cast(datetime | None, task.due_at)
+    if due_at is not None:
+        due_at_text: str | None = (
+            due_at.astimezone(user_tz).isoformat() if user_tz else due_at.isoformat()
+        )
+    else:
+        due_at_text = None
+
+    return {
+        "id": str(task.id),
+        "title": task.title,
+        "description": task.description,
+        "due_at": due_at_text,
+        "status": task.status,
+        "priority": task.priority,
+        "topic": {"id": str(topic.id), "title": topic.title} if topic else None,
+        "created_at": _format_datetime(cast(datetime, task.created_at)),
+        "completed_at": _format_datetime(cast(datetime | None, task.completed_at)),
+    }
+
+
+class TaskListSerializer(serializers.ListSerializer):
+    def to_representation(self, data: Any) -> list[dict[str, Any]]:
+        user_tz = cast(TaskSerializer, self.child).get_user_tz()
+        return [render_task(task, user_tz) for task in data]
+
+
+class UserLocalDateTimeField(serializers.DateTimeField):
+    """
+    Naive datetime остаётся naive: его как локальное время пользователя
+    трактует validate_due_at, а не TIME_ZONE сервера.
+    """
+
+    def enforce_timezone(self, value: datetime) -> datetime:
+        if timezone.is_naive(value):
+            return value
+        return cast(datetime, super().enforce_timezone(value))
+
 
 class TaskSerializer(serializers.ModelSerializer):
     topic_id = serializers.UUIDField(
@@ -22,7 +78,7 @@ class TaskSerializer(serializers.ModelSerializer):
     )
 
     topic = serializers.SerializerMethodField(read_only=True)
-    due_at = serializers.DateTimeField(
+    due_at = UserLocalDateTimeField(
         required=False,
         allow_null=True,
     )
@@ -47,6 +103,7 @@ class TaskSerializer(serializers.ModelSerializer):
             "completed_at",
         ]
         read_only_fields = ["id", "created_at", "completed_at"]
+        list_serializer_class = TaskListSerializer
 
     def get_topic(self, obj: Task) -> Optional[dict[str, str]]:
         topic = cast(Optional[Topic], obj.topic)
@@ -58,9 +115,14 @@ class TaskSerializer(serializers.ModelSerializer):
         }
 
     def to_representation(self, instance: Task) -> dict[str, Any]:
-        data = cast(dict[str, Any], super().to_representation(instance))
-        data["due_at"] = self._format_due_at(instance)
-        return data
+        return render_task(instance, self.get_user_tz())
+
+    def get_user_tz(self) -> tzinfo | None:
+        """Таймзона из контекста (view считает её один раз на запрос)."""
+        if USER_TZ_CONTEXT_KEY in self.context:
+            return cast(tzinfo | None, self.context[USER_TZ_CONTEXT_KEY])
+        user = self._get_context_user()
+        return get_user_timezone(user) if user else None
 
     def create(self, validated_data: dict[str, Any]) -> Task:
         self._apply_topic_id(validated_data)
@@ -89,22 +151,10 @@ class TaskSerializer(serializers.ModelSerializer):
             return None
         return cast(User, cast(Any, request).user)
 
-    def _format_due_at(self, instance: Task) -> str | None:
-        if not instance.due_at:
-            return None
-
-        due_at = cast(datetime, instance.due_at)
-        user = self._get_context_user()
-        if not user:
-            return due_at.isoformat()
-
-        return due_at.astimezone(get_user_timezone(user)).isoformat()
-
     @staticmethod
     def _normalize_due_at(value: datetime, user: User) -> datetime:
-        user_tz = get_user_timezone(user)
         if timezone.is_naive(value):
-            return cast(datetime, user_tz.localize(value))
+            return localize(value, get_user_timezone(user))
         return value
 
     def _require_context_user(self) -> User:
@@ -140,3 +190,4 @@ class HabitsReportSerializer(serializers.Serializer):
     short_text = serializers.CharField()
     long_text = serializers.CharField()
     metrics = serializers.JSONField()
+    generated_at = serializers.DateTimeField(required=False)
@@ -0,0 +1,9 @@
+from .stream import OP_DELETE, OP_UPSERT, publish_reminder_events
+from .timing_wheel import HierarchicalTimingWheel
+
+__all__ = [
+    "OP_DELETE",
+    "OP_UPSERT",
+    "HierarchicalTimingWheel",
+    "publish_reminder_events",
+]
@@ -0,0 +1,96 @@
+"""Redis stream с изменениями напоминаний для диспетчера."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+import redis
+from django.conf import settings
+from django.db import transaction
+
+if TYPE_CHECKING:
+    from tasks.models import Reminder
+
+logger = logging.getLogger(__name__)
+
+OP_UPSERT = "upsert"
+OP_DELETE = "delete"
+
+StreamEvent = tuple[str, dict[str, str]]
+
+
+def is_dispatcher_enabled() -> bool:
+    return bool(getattr(settings, "REMINDER_DISPATCHER_ENABLED", False))
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> redis.Redis:
+    url = getattr(settings, "REMINDER_DISPATCHER_REDIS_URL", None) or getattr(
+        settings, "CELERY_BROKER_URL", "redis://localhost:6379/0"
+    )
+    return redis.Redis.from_url(url, decode_responses=True)
+
+
+def get_stream_name() -> str:
+    return str(getattr(settings, "REMINDER_DISPATCHER_STREAM", "reminders:events"))
+
+
+def publish_reminder_events(op: str, reminders: Iterable[Reminder]) -> None:
+    """
+    Публикует изменения напоминаний в stream после коммита транзакции,
+    чтобы диспетчер не увидел откатившиеся изменения.
+    """
+    if not is_dispatcher_enabled():
+        return
+
+    events = [_build_event(op, reminder) for reminder in reminders]
+    if not events:
+        return
+
+    transaction.on_commit(lambda: _xadd(events))
+
+
+def read_reminder_events(
+    last_id: str, block_ms: int, count: int = 1000
+) -> list[StreamEvent]:
+    response: Any = get_redis().xread(
+        {get_stream_name(): last_id}, count=count, block=block_ms
+    )
+    if not response:
+        return []
+    _, events = response[0]
+    return list(events)
+
+
+def get_last_event_id() -> str:
+    """ID последнего события в stream (или "0-0", если stream пуст)."""
+    last: Any = get_redis().xrevrange(get_stream_name(), count=1)
+    return str(last[0][0]) if last else "0-0"
+
+
+def _build_event(op: str, reminder: Reminder) -> dict[str, str]:
+    return {
+        "op": op,
+        "reminder_id": str(reminder.id),
+        "notify_at": str(reminder.notify_at.timestamp()),
+        "sent": "1" if reminder.sent else "0",
+    }
+
+
+def _xadd(events: list[dict[str, str]]) -> None:
+    maxlen = int(getattr(settings, "REMINDER_DISPATCHER_STREAM_MAXLEN", 100_000))
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for event in events:
+            pipe.xadd(get_stream_name(), event, maxlen=maxlen, approximate=True)
+        pipe.execute()
+    except redis.RedisError:
+        # Диспетчер всё равно перечитывает окно из БД, событие не критично.
+        logger.warning(
+            "Failed to publish reminder events",
+            extra={"count": len(events)},
+            exc_info=True,
+        )
@@ -0,0 +1,126 @@
+"""Иерархическое колесо таймеров (hashed hierarchical timing wheel).
+
+Вставка и отмена — O(1), истечение — O(1) на таймер плюс каскадирование
+с верхних уровней. Модуль не зависит от Django, чтобы его можно было
+тестировать и бенчмаркать отдельно.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+Bucket = list[tuple[K, int]]
+
+
+# Generic вместо синтаксиса PEP 695: модуль импортируют и под Python 3.11.
+class HierarchicalTimingWheel(Generic[K]):  # noqa: UP046
+    """
+    Уровень 0 хранит таймеры с точностью до одного тика, каждый следующий
+    уровень — в wheel_size раз грубее. Когда время доходит до слота верхнего
+    уровня, его таймеры перекладываются ниже (каскад).
+
+    Таймер идентифицируется ключом: повторный schedule() с тем же ключом
+    переносит его, cancel() удаляет. Устаревшие записи в слотах отбрасываются
+    лениво при срабатывании.
+    """
+
+    def __init__(
+        self,
+        start: float,
+        tick: float = 1.0,
+        wheel_size: int = 60,
+        levels: int = 4,
+    ) -> None:
+        if tick <= 0 or wheel_size < 2 or levels < 1:
+            raise ValueError("Invalid timing wheel geometry")
+
+        self.tick = tick
+        self.wheel_size = wheel_size
+        self._spans = [wheel_size**level for level in range(levels)]
+        self._wheels: list[list[Bucket[K]]] = [
+            [[] for _ in range(wheel_size)] for _ in range(levels)
+        ]
+        self._current = self._to_tick(start)
+        self._deadlines: dict[K, int] = {}
+        self._ready: Bucket[K] = []
+
+    @property
+    def max_delay(self) -> float:
+        """Максимальная задержка, которую колесо принимает от текущего момента."""
+        return self._spans[-1] * self.wheel_size * self.tick
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._deadlines
+
+    def schedule(self, key: K, expires_at: float) -> bool:
+        """
+        Ставит (или переносит) таймер. Возвращает False, если срок дальше
+        max_delay: такой таймер нужно добавить позже.
+        """
+        deadline = self._to_tick(expires_at)
+        if deadline - self._current >= self._spans[-1] * self.wheel_size:
+            self._deadlines.pop(key, None)
+            return False
+
+        self._deadlines[key] = deadline
+        self._place(key, deadline)
+        return True
+
+    def cancel(self, key: K) -> bool:
+        return self._deadlines.pop(key, None) is not None
+
+    def advance(self, now: float) -> list[K]:
+        """Сдвигает время до now и возвращает ключи истёкших таймеров."""
+        target = self._to_tick(now)
+        expired: list[K] = []
+
+        while self._current < target:
+            self._current += 1
+            for level in range(len(self._spans) - 1, 0, -1):
+                span = self._spans[level]
+                if self._current % span == 0:
+                    self._cascade(level, (self._current // span) % self.wheel_size)
+
+            slot = self._current % self.wheel_size
+            bucket = self._wheels[0][slot]
+            self._wheels[0][slot] = []
+            self._collect(bucket, expired)
+
+        # Просроченные на момент schedule() и выпавшие при каскаде ровно в свой тик.
+        self._collect(self._ready, expired)
+        self._ready = []
+        return expired
+
+    def _to_tick(self, value: float) -> int:
+        return int(value // self.tick)
+
+    def _place(self, key: K, deadline: int) -> None:
+        delay = deadline - self._current
+        if delay <= 0:
+            self._ready.append((key, deadline))
+            return
+
+        for level, span in enumerate(self._spans):
+            if delay < span * self.wheel_size:
+                slot = (deadline // span) % self.wheel_size
+                self._wheels[level][slot].append((key, deadline))
+                return
+
+    def _cascade(self, level: int, slot: int) -> None:
+        bucket = self._wheels[level][slot]
+        self._wheels[level][slot] = []
+        for key, deadline in bucket:
+            if self._deadlines.get(key) == deadline:
+                self._place(key, deadline)
+
+    def _collect(self, bucket: Bucket[K], expired: list[K]) -> None:
+        for key, deadline in bucket:
+            if self._deadlines.get(key) == deadline:
+                del self._deadlines[key]
+                expired.append(key)
@@ -1,4 +1,10 @@
-from .report import build_habits_report
+from .cache import get_cached_habits_report
+from .report import build_habits_report, build_habits_reports
 from .types import HabitsReport
 
-__all__ = ["build_habits_report", "HabitsReport"]
+__all__ = [
+    "build_habits_report",
+    "build_habits_reports",
+    "get_cached_habits_report",
+    "HabitsReport",
+]
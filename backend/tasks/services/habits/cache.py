@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from users.models import User
+from users.utils.timezone import get_user_timezone
+
+from .report import build_habits_report
+from .types import HabitsReport
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "habits:version:{user_id}"
+REPORT_KEY = "habits:report:{user_id}:{days}:{language}:{tz}:{version}:{local_date}"
+
+
+class BoundedLRUCache:
+    """
+    Потокобезопасный LRU в памяти процесса с ограничением по байтам
+    (размер значения — длина pickle). Считает попадания, промахи и вытеснения.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._items: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key: str, value: Any) -> None:
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._items[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "items": len(self._items),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_local_reports = BoundedLRUCache(
+    getattr(settings, "HABITS_REPORT_CACHE_MAX_BYTES", 16 * 1024 * 1024)
+)
+_shared_counters = {"hits": 0, "misses": 0}
+_shared_counters_lock = threading.Lock()
+
+
+def _count_shared(outcome: str) -> None:
+    with _shared_counters_lock:
+        _shared_counters[outcome] += 1
+
+
+def get_user_data_version(user_id: Any) -> int:
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        # Если ключ версии потерян, новая версия не должна совпасть со старой.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key, 0)
+    return int(version)
+
+
+def _incr_version(user_id: Any) -> None:
+    key = VERSION_KEY.format(user_id=user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def bump_user_data_version(user_id: Any) -> None:
+    # После коммита: иначе параллельный запрос может закэшировать
+    # незакоммиченное состояние уже под новой версией.
+    transaction.on_commit(lambda: _incr_version(user_id))
+
+
+def bump_users_data_version(user_ids: Iterable[Any]) -> None:
+    for user_id in set(user_ids):
+        bump_user_data_version(user_id)
+
+
+def _report_key(user: User, days: int) -> str:
+    # Таймзона в ключе: по ней отчёт раскладывает задачи по дням и часам.
+    user_tz = get_user_timezone(user)
+    local_date = timezone.localtime(timezone.now(), user_tz).date()
+    return REPORT_KEY.format(
+        user_id=user.id,
+        days=days,
+        language=getattr(user, "language", ""),
+        tz=str(user_tz),
+        version=get_user_data_version(user.id),
+        local_date=local_date.isoformat(),
+    )
+
+
+def get_cached_habits_report(
+    user: User, days: int = 30, use_llm: bool = True
+) -> HabitsReport:
+    """
+    Отчёт из кэша: сначала память процесса, затем общий кэш Django.
+    Ключ включает версию данных пользователя (меняется при любом изменении
+    его задач и напоминаний), язык, таймзону и локальную дату, поэтому TTL
+    нужен только для уборки.
+    """
+    key = _report_key(user, days)
+    if not use_llm:
+        key = f"{key}:rules"
+
+    report = _local_reports.get(key)
+    if report is not None:
+        return report
+
+    report = cache.get(key)
+    if report is not None:
+        _count_shared("hits")
+    else:
+        _count_shared("misses")
+        report = build_habits_report(user, days=days, use_llm=use_llm)
+        cache.set(
+            key, report, timeout=getattr(settings, "HABITS_REPORT_CACHE_TTL", 86400)
+        )
+        logger.debug(
+            "Habits report cached",
+            extra={"user_id": str(user.id), "days": days},
+        )
+
+    _local_reports.set(key, report)
+    return report
+
+
+def habits_cache_stats() -> dict[str, Any]:
+    with _shared_counters_lock:
+        shared = dict(_shared_counters)
+    return {"local": _local_reports.stats(), "shared": shared}
@@ -1,19 +1,47 @@
 from __future__ import annotations
 
 import ast
+import hashlib
 import json
 import logging
 import re
 import time
+from dataclasses import dataclass
+from typing import Any
 from urllib import request as urlrequest
 from urllib.error import HTTPError, URLError
 
 from django.conf import settings
+from django.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
+LLM_TEMPERATURE = 0.2
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+LLM_CACHE_KEY = "llm:completion:{digest}"
+# Не влияют на текст ответа (в промпте уже есть длина периода), но делают
+# каждый промпт уникальным и ломают кэш ответов.
+PROMPT_EXCLUDED_METRICS = ("period_start", "period_end")
+
+
+def normalize_prompt_metrics(metrics: dict[str, object]) -> dict[str, object]:
+    return {
+        key: value
+        for key, value in metrics.items()
+        if key not in PROMPT_EXCLUDED_METRICS
+    }
+
+
+def llm_cache_key(model: str, prompt: str, max_tokens: int, temperature: float) -> str:
+    material = json.dumps(
+        [model, prompt, max_tokens, temperature], ensure_ascii=False, sort_keys=True
+    )
+    digest = hashlib.sha256(material.encode("utf-8")).hexdigest()
+    return LLM_CACHE_KEY.format(digest=digest)
+
 
 def build_llm_prompt(metrics: dict[str, object], days: int, language: str) -> str:
+    metrics = normalize_prompt_metrics(metrics)
     if language.lower().startswith("ru"):
         return (
             "Ты — аналитик привычек для бота задач. "
@@ -41,7 +69,34 @@ def build_llm_prompt(metrics: dict[str, object], days: int, language: str) -> st
     )
 
 
-def call_hf_api(prompt: str) -> str | None:
+@dataclass(frozen=True)
+class LLMConfig:
+    url: str
+    token: str
+    model: str
+    max_tokens: int
+    timeout: float
+    retries: int
+
+    def cache_key(self, prompt: str) -> str:
+        return llm_cache_key(self.model, prompt, self.max_tokens, LLM_TEMPERATURE)
+
+    def headers(self) -> dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.token}",
+            "Content-Type": "application/json",
+        }
+
+    def payload(self, prompt: str) -> dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": self.max_tokens,
+            "temperature": LLM_TEMPERATURE,
+        }
+
+
+def get_llm_config() -> LLMConfig | None:
     token = getattr(settings, "HUGGINGFACE_API_TOKEN", None)
     model = getattr(settings, "HUGGINGFACE_MODEL", None)
     enabled = getattr(settings, "HUGGINGFACE_ENABLED", False)
@@ -56,29 +111,62 @@ def call_hf_api(prompt: str) -> str | None:
         )
         return None
 
-    url = getattr(
-        settings,
-        "HUGGINGFACE_API_BASE",
-        "https://router.huggingface.co/v1/chat/completions",
+    return LLMConfig(
+        url=getattr(
+            settings,
+            "HUGGINGFACE_API_BASE",
+            "https://router.huggingface.co/v1/chat/completions",
+        ),
+        token=token,
+        model=model,
+        max_tokens=int(getattr(settings, "HUGGINGFACE_MAX_NEW_TOKENS", 160)),
+        timeout=float(getattr(settings, "HUGGINGFACE_TIMEOUT", 12)),
+        retries=int(getattr(settings, "HUGGINGFACE_RETRIES", 1)),
     )
-    max_new_tokens = int(getattr(settings, "HUGGINGFACE_MAX_NEW_TOKENS", 160))
-    timeout = float(getattr(settings, "HUGGINGFACE_TIMEOUT", 12))
-    retries = int(getattr(settings, "HUGGINGFACE_RETRIES", 1))
-
-    payload_obj = {
-        "model": model,
-        "messages": [{"role": "user", "content": prompt}],
-        "max_tokens": max_new_tokens,
-        "temperature": 0.2,
-    }
 
-    payload = json.dumps(payload_obj).encode("utf-8")
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
+def extract_completion_text(data: Any) -> str | None:
+    if isinstance(data, dict) and data.get("error"):
+        logger.warning("LLM response error: %s", data.get("error"))
+        return None
+    if isinstance(data, dict) and "choices" in data:
+        try:
+            return str(data["choices"][0]["message"]["content"]).strip()
+        except (KeyError, IndexError, TypeError):
+            return None
+    return None
+
+
+def call_hf_api(prompt: str) -> str | None:
+    config = get_llm_config()
+    if config is None:
+        return None
+
+    cache_key = config.cache_key(prompt)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        logger.debug("LLM cache hit", extra={"model": config.model})
+        return str(cached)
+
+    payload = json.dumps(config.payload(prompt)).encode("utf-8")
+    text = _request_completion(
+        config.url, payload, config.headers(), config.timeout, config.retries
+    )
+    if text:
+        cache.set(
+            cache_key, text, timeout=getattr(settings, "HUGGINGFACE_CACHE_TTL", None)
+        )
+    return text
 
+
+def _request_completion(
+    url: str,
+    payload: bytes,
+    headers: dict[str, str],
+    timeout: float,
+    retries: int,
+) -> str | None:
+    data: Any = None
     for attempt in range(retries + 1):
         req = urlrequest.Request(url, data=payload, method="POST", headers=headers)
         try:
@@ -96,7 +184,7 @@ def call_hf_api(prompt: str) -> str | None:
                 extra={"status": exc.code, "body": body},
                 exc_info=True,
             )
-            if exc.code in {429, 500, 502, 503, 504} and attempt < retries:
+            if exc.code in RETRYABLE_STATUSES and attempt < retries:
                 time.sleep(0.5)
                 continue
             return None
@@ -107,15 +195,7 @@ def call_hf_api(prompt: str) -> str | None:
                 continue
             return None
 
-    if isinstance(data, dict) and data.get("error"):
-        logger.warning("LLM response error: %s", data.get("error"))
-        return None
-    if isinstance(data, dict) and "choices" in data:
-        try:
-            return str(data["choices"][0]["message"]["content"]).strip()
-        except (KeyError, IndexError, TypeError):
-            return None
-    return None
+    return extract_completion_text(data)
 
 
 def parse_llm_response(text: str) -> tuple[str | None, str | None, list[str] | None]:
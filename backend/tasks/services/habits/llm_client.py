@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections.abc import Sequence
+from types import TracebackType
+from typing import Any, Self
+
+import httpx
+from django.conf import settings
+from django.core.cache import cache
+
+from .llm import (
+    RETRYABLE_STATUSES,
+    LLMConfig,
+    extract_completion_text,
+    get_llm_config,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF = 30.0
+
+
+class AsyncLLMClient:
+    """
+    Асинхронный клиент LLM: один keep-alive httpx.AsyncClient на пакет
+    запросов, не больше `concurrency` запросов одновременно, повторы
+    с экспоненциальной задержкой и jitter (или по Retry-After).
+    """
+
+    def __init__(
+        self,
+        config: LLMConfig,
+        concurrency: int = 8,
+        backoff_base: float = 0.5,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.config = config
+        self.backoff_base = backoff_base
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._client = httpx.AsyncClient(
+            headers=config.headers(),
+            timeout=config.timeout,
+            limits=httpx.Limits(
+                max_connections=concurrency,
+                max_keepalive_connections=concurrency,
+            ),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def complete(self, prompt: str) -> str | None:
+        payload = self.config.payload(prompt)
+        attempts = self.config.retries + 1
+        for attempt in range(attempts):
+            retry_after: float | None = None
+            try:
+                async with self._semaphore:
+                    response = await self._client.post(self.config.url, json=payload)
+            except httpx.HTTPError:
+                logger.warning("LLM request failed", exc_info=True)
+            else:
+                if response.status_code == 200:
+                    try:
+                        return extract_completion_text(response.json())
+                    except ValueError:
+                        logger.warning("LLM returned invalid JSON")
+                        return None
+                logger.warning(
+                    "LLM request failed",
+                    extra={"status": response.status_code, "body": response.text},
+                )
+                if response.status_code not in RETRYABLE_STATUSES:
+                    return None
+                retry_after = _parse_retry_after(response)
+
+            if attempt + 1 < attempts:
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+        return None
+
+    async def complete_many(self, prompts: Sequence[str]) -> list[str | None]:
+        """Результаты в порядке prompts; одинаковые промпты запрашиваются один раз."""
+        unique = list(dict.fromkeys(prompts))
+        results = await asyncio.gather(*(self.complete(prompt) for prompt in unique))
+        by_prompt = dict(zip(unique, results))
+        return [by_prompt[prompt] for prompt in prompts]
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float:
+        if retry_after is not None:
+            return min(MAX_BACKOFF, retry_after)
+        delay = min(MAX_BACKOFF, self.backoff_base * 2**attempt)
+        return float(delay * random.uniform(0.5, 1.0))
+
+
+def _parse_retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def complete_prompts(prompts: Sequence[str], **client_kwargs: Any) -> list[str | None]:
+    """
+    Синхронная обёртка для Celery: ответы из кэша (HUGGINGFACE_CACHE_TTL)
+    берутся одним get_many, остальные запрашиваются конкурентно.
+    """
+    config = get_llm_config()
+    if config is None or not prompts:
+        return [None] * len(prompts)
+
+    keys = [config.cache_key(prompt) for prompt in prompts]
+    cached = cache.get_many(keys)
+    missing = list(
+        dict.fromkeys(p for p, key in zip(prompts, keys) if key not in cached)
+    )
+
+    if missing:
+        client_kwargs.setdefault(
+            "concurrency", int(getattr(settings, "HUGGINGFACE_CONCURRENCY", 8))
+        )
+        fetched = asyncio.run(_complete_many(config, missing, client_kwargs))
+        fresh = {
+            config.cache_key(prompt): text
+            for prompt, text in zip(missing, fetched)
+            if text
+        }
+        cache.set_many(fresh, timeout=getattr(settings, "HUGGINGFACE_CACHE_TTL", None))
+        cached.update(fresh)
+
+    logger.info(
+        "LLM batch completed",
+        extra={"prompts": len(prompts), "requested": len(missing)},
+    )
+    return [cached.get(key) for key in keys]
+
+
+async def _complete_many(
+    config: LLMConfig, prompts: list[str], client_kwargs: dict[str, Any]
+) -> list[str | None]:
+    async with AsyncLLMClient(config, **client_kwargs) as client:
+        return await client.complete_many(prompts)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+RUN_KEY = "habits:weekly:{run_id}:{field}"
+LAST_RUN_KEY = "habits:weekly:last_run"
+PROGRESS_FIELDS = ("users_total", "chunks_total", "users_done", "chunks_done")
+PROGRESS_TTL = 7 * 24 * 3600
+
+
+def _key(run_id: str, field: str) -> str:
+    return RUN_KEY.format(run_id=run_id, field=field)
+
+
+def _incr(key: str, delta: int) -> int:
+    try:
+        return int(cache.incr(key, delta))
+    except ValueError:
+        # Счётчик вытеснен из кэша: прогресс станет неточным, но не сломает чанк.
+        cache.add(key, delta, timeout=PROGRESS_TTL)
+        return delta
+
+
+def init_weekly_run_progress(run_id: str, users: int, chunks: int) -> None:
+    values = {
+        "users_total": users,
+        "chunks_total": chunks,
+        "users_done": 0,
+        "chunks_done": 0,
+    }
+    cache.set_many(
+        {_key(run_id, field): value for field, value in values.items()},
+        timeout=PROGRESS_TTL,
+    )
+    cache.set(LAST_RUN_KEY, run_id, timeout=PROGRESS_TTL)
+
+
+def record_weekly_chunk_done(run_id: str, users: int) -> None:
+    _incr(_key(run_id, "users_done"), users)
+    _incr(_key(run_id, "chunks_done"), 1)
+
+    progress = get_weekly_run_progress(run_id) or {}
+    message = (
+        "Weekly habits run finished"
+        if progress.get("chunks_done") == progress.get("chunks_total")
+        else "Weekly habits chunk finished"
+    )
+    logger.info(message, extra=progress)
+
+
+def get_weekly_run_progress(run_id: str | None = None) -> dict[str, Any] | None:
+    """Прогресс запуска (по умолчанию последнего): сколько чанков и пользователей готово."""
+    run_id = run_id or cache.get(LAST_RUN_KEY)
+    if not run_id:
+        return None
+    values = cache.get_many([_key(run_id, field) for field in PROGRESS_FIELDS])
+    progress: dict[str, Any] = {
+        field: values.get(_key(run_id, field), 0) for field in PROGRESS_FIELDS
+    }
+    progress["run_id"] = run_id
+    return progress
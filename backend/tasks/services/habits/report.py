@@ -1,16 +1,20 @@
 from __future__ import annotations
 
-from datetime import timedelta
+from dataclasses import replace
+from collections.abc import Sequence
+from datetime import datetime, timedelta, tzinfo
 from typing import Any
 import logging
 
+from django.conf import settings
 from django.utils import timezone
 
-from tasks.models import Task
 from users.models import User
 from users.utils.timezone import get_user_timezone
 
-from .types import DAY_NAMES, HabitsReport
+from .rollup import collect_rollup_counts, collect_rollup_counts_many
+from .stats import collect_habits_counts, collect_habits_counts_many
+from .types import DAY_NAMES, HabitsCounts, HabitsReport
 from .llm import (
     build_llm_prompt,
     call_hf_api,
@@ -103,23 +107,13 @@ def _build_rule_texts(
     return "\n".join(short_lines), "\n".join(long_lines)
 
 
-def _apply_llm_overlay(
-    short_text: str,
-    long_text: str,
-    metrics: dict[str, object],
-    user: User,
-    days: int,
-) -> tuple[str, str]:
+def build_report_prompt(report: HabitsReport, user: User, days: int) -> str:
     language = getattr(user, "language", "ru")
-    prompt = build_llm_prompt(metrics, days, language)
-    llm_text = call_hf_api(prompt)
-    if not llm_text:
-        logger.info(
-            "LLM fallback to rule-based report",
-            extra={"user_id": str(user.id), "days": days},
-        )
-        return short_text, long_text
+    return build_llm_prompt(report.metrics, days, language)
+
 
+def merge_llm_text(short_text: str, long_text: str, llm_text: str) -> tuple[str, str]:
+    """Накладывает ответ LLM на текст отчёта по правилам. Без побочных эффектов."""
     llm_short, llm_long, llm_tips = parse_llm_response(llm_text)
     fallback_short, fallback_long = fallback_split(llm_text)
     looks_like_dict = "short" in llm_text and "long" in llm_text and "{" in llm_text
@@ -148,11 +142,27 @@ def _apply_llm_overlay(
         else:
             long_text = f"Рекомендации:\n{tips_block}"
 
+    return short_text, long_text
+
+
+def apply_llm_text(
+    report: HabitsReport, llm_text: str | None, user: User, days: int
+) -> HabitsReport:
+    if not llm_text:
+        logger.info(
+            "LLM fallback to rule-based report",
+            extra={"user_id": str(user.id), "days": days},
+        )
+        return report
+
+    short_text, long_text = merge_llm_text(
+        report.short_text, report.long_text, llm_text
+    )
     logger.info(
         "LLM report generated",
         extra={"user_id": str(user.id), "days": days},
     )
-    return short_text, long_text
+    return replace(report, short_text=short_text, long_text=long_text)
 
 
 def build_habits_report(
@@ -162,58 +172,53 @@ def build_habits_report(
     start = now - timedelta(days=days)
     user_tz = get_user_timezone(user)
 
-    created_count = Task.objects.filter(
-        user=user, created_at__gte=start, created_at__lte=now
-    ).count()
-
-    done_tasks = (
-        Task.objects.filter(
-            user=user,
-            status=Task.Status.DONE,
-            completed_at__isnull=False,
-            completed_at__gte=start,
-            completed_at__lte=now,
-        )
-        .prefetch_related("reminders")
-        .all()
-    )
+    if getattr(settings, "HABITS_USE_DAILY_STATS", False):
+        counts = collect_rollup_counts(user, start, now, user_tz)
+    else:
+        counts = collect_habits_counts(user, start, now, user_tz)
+    return build_report_from_counts(user, days, start, now, counts, use_llm)
+
+
+def build_habits_reports(
+    users: Sequence[User], days: int = 30, use_llm: bool = False
+) -> list[HabitsReport]:
+    """
+    Пакетный вариант build_habits_report: метрики всех пользователей
+    считаются несколькими групповыми запросами (по одному на таймзону
+    для гистограмм) вместо пары запросов на пользователя.
+    """
+    now = timezone.now()
+    start = now - timedelta(days=days)
+    user_ids_by_tz: dict[tzinfo, list[Any]] = {}
+    for user in users:
+        user_ids_by_tz.setdefault(get_user_timezone(user), []).append(user.pk)
 
-    done_count = 0
-    due_done_count = 0
-    on_time_count = 0
-    overdue_count = 0
-    no_due_count = 0
-    reminder_helped_tasks = 0
-    reminders_sent_before_done = 0
-
-    by_day = [0] * 7
-    by_hour = [0] * 24
-
-    for task in done_tasks:
-        if not task.completed_at:
-            continue
-        done_count += 1
-        completed_local = timezone.localtime(task.completed_at, user_tz)
-        by_day[completed_local.weekday()] += 1
-        by_hour[completed_local.hour] += 1
-
-        if task.due_at:
-            due_done_count += 1
-            if task.completed_at <= task.due_at:
-                on_time_count += 1
-            else:
-                overdue_count += 1
-        else:
-            no_due_count += 1
+    if getattr(settings, "HABITS_USE_DAILY_STATS", False):
+        counts = collect_rollup_counts_many(user_ids_by_tz, start, now)
+    else:
+        counts = collect_habits_counts_many(user_ids_by_tz, start, now)
+    return [
+        build_report_from_counts(user, days, start, now, counts[user.pk], use_llm)
+        for user in users
+    ]
 
-        reminders = list(task.reminders.all())
-        reminder_before_done = False
-        for reminder in reminders:
-            if reminder.sent and reminder.notify_at <= task.completed_at:
-                reminders_sent_before_done += 1
-                reminder_before_done = True
-        if reminder_before_done:
-            reminder_helped_tasks += 1
+
+def build_report_from_counts(
+    user: User,
+    days: int,
+    start: datetime,
+    now: datetime,
+    counts: HabitsCounts,
+    use_llm: bool,
+) -> HabitsReport:
+    done_count = counts.done_count
+    due_done_count = counts.due_done_count
+    on_time_count = counts.on_time_count
+    overdue_count = counts.overdue_count
+    no_due_count = counts.no_due_count
+    reminder_helped_tasks = counts.reminder_helped_tasks
+    by_day = counts.by_day
+    by_hour = counts.by_hour
 
     best_day_idx = max(range(7), key=by_day.__getitem__) if done_count else None
     best_hour = max(range(24), key=by_hour.__getitem__) if done_count else None
@@ -237,7 +242,7 @@ def build_habits_report(
     )
 
     stats = {
-        "created_count": created_count,
+        "created_count": counts.created_count,
         "done_count": done_count,
         "due_done_count": due_done_count,
         "on_time_count": on_time_count,
@@ -259,13 +264,13 @@ def build_habits_report(
         "period_start": start.isoformat(),
         "period_end": now.isoformat(),
         "counts": {
-            "created": created_count,
+            "created": counts.created_count,
             "completed": done_count,
             "completed_on_time": on_time_count,
             "completed_overdue": overdue_count,
             "completed_no_due": no_due_count,
             "completed_with_reminder": reminder_helped_tasks,
-            "reminders_sent_before_done": reminders_sent_before_done,
+            "reminders_sent_before_done": counts.reminders_sent_before_done,
         },
         "patterns": {
             "best_day": best_day,
@@ -280,9 +285,8 @@ def build_habits_report(
         "suggestions": suggestions,
     }
 
+    report = HabitsReport(short_text=short_text, long_text=long_text, metrics=metrics)
     if use_llm:
-        short_text, long_text = _apply_llm_overlay(
-            short_text, long_text, metrics, user, days
-        )
-
-    return HabitsReport(short_text=short_text, long_text=long_text, metrics=metrics)
+        llm_text = call_hf_api(build_report_prompt(report, user, days))
+        report = apply_llm_text(report, llm_text, user, days)
+    return report
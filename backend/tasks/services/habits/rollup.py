@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import date, datetime, tzinfo
+from typing import Any
+
+from django.contrib.postgres.fields import ArrayField
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Count,
+    F,
+    Func,
+    IntegerField,
+    JSONField,
+    Q,
+    TextField,
+    Value,
+)
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast, ExtractHour, TruncDate
+from tasks.models import Reminder, Task, UserDailyStats
+from users.models import User
+from users.utils.timezone import get_user_timezone
+
+from .types import HabitsCounts
+
+COUNTER_FIELDS = (
+    "created_count",
+    "done_count",
+    "on_time_count",
+    "overdue_count",
+    "no_due_count",
+    "reminder_helped_count",
+    "reminders_before_done_count",
+)
+
+
+# (completed_at, due_at) выполненной задачи; None — выполнение не учитывается
+TaskCompletion = tuple[datetime, datetime | None] | None
+
+
+def task_completion(
+    status: str, completed_at: datetime | None, due_at: datetime | None
+) -> TaskCompletion:
+    if status == Task.Status.DONE and completed_at:
+        return completed_at, due_at
+    return None
+
+
+def _local(value: datetime, user_tz: tzinfo) -> datetime:
+    return value.astimezone(user_tz)
+
+
+def _apply_deltas(
+    user_id: Any,
+    local_date: date,
+    deltas: dict[str, int],
+    hour: int | None = None,
+    hour_delta: int = 0,
+) -> None:
+    """
+    Применяет приращения к строке (user, local_date) одним UPDATE через F():
+    параллельные изменения не теряются, строку не нужно читать. Если строки
+    ещё нет, она создаётся и UPDATE повторяется.
+    """
+    updates: dict[str, Any] = {
+        field: F(field) + delta for field, delta in deltas.items()
+    }
+    if hour is not None and hour_delta:
+        updates["done_by_hour"] = _add_to_hour(hour, hour_delta)
+
+    rows = UserDailyStats.objects.filter(user_id=user_id, local_date=local_date)
+    if rows.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            UserDailyStats.objects.create(user_id=user_id, local_date=local_date)
+    except IntegrityError:
+        # Строку успел создать параллельный запрос.
+        pass
+    rows.update(**updates)
+
+
+def _add_to_hour(hour: int, delta: int) -> Func:
+    """done_by_hour[hour] + delta на стороне БД (jsonb_set)."""
+    current = Cast(KeyTextTransform(str(hour), "done_by_hour"), IntegerField())
+    return Func(
+        F("done_by_hour"),
+        Value([str(hour)], output_field=ArrayField(TextField())),
+        Func(current + delta, function="to_jsonb"),
+        function="jsonb_set",
+        output_field=JSONField(),
+    )
+
+
+def _completion_deltas(
+    task: Task, completed_at: datetime, due_at: datetime | None, sign: int
+) -> dict[str, int]:
+    reminders_before_done = Reminder.objects.filter(
+        task=task, sent=True, notify_at__lte=completed_at
+    ).count()
+    deltas = {
+        "done_count": sign,
+        "reminders_before_done_count": sign * reminders_before_done,
+    }
+    if reminders_before_done:
+        deltas["reminder_helped_count"] = sign
+    if due_at is None:
+        deltas["no_due_count"] = sign
+    elif completed_at <= due_at:
+        deltas["on_time_count"] = sign
+    else:
+        deltas["overdue_count"] = sign
+    return deltas
+
+
+def record_task_created(task: Task) -> None:
+    user_tz = get_user_timezone(task.user)
+    local_date = _local(task.created_at, user_tz).date()
+    _apply_deltas(task.user_id, local_date, {"created_count": 1})
+    completion = task_completion(task.status, task.completed_at, task.due_at)
+    if completion is not None:
+        record_task_completion(task, *completion, sign=1)
+
+
+def record_task_completion(
+    task: Task, completed_at: datetime, due_at: datetime | None, sign: int
+) -> None:
+    """
+    Учитывает (sign=1) или откатывает (sign=-1) выполнение задачи в день
+    completed_at. due_at передаётся явно: при откате нужен срок, который
+    действовал в момент выполнения.
+    """
+    user_tz = get_user_timezone(task.user)
+    local_completed = _local(completed_at, user_tz)
+    _apply_deltas(
+        task.user_id,
+        local_completed.date(),
+        _completion_deltas(task, completed_at, due_at, sign),
+        hour=local_completed.hour,
+        hour_delta=sign,
+    )
+
+
+def record_task_completion_change(
+    task: Task, old: TaskCompletion, new: TaskCompletion
+) -> None:
+    """Переносит вклад выполнения при смене статуса, completed_at или due_at."""
+    if old == new:
+        return
+    if old is not None:
+        record_task_completion(task, *old, sign=-1)
+    if new is not None:
+        record_task_completion(task, *new, sign=1)
+
+
+def record_task_deleted(task: Task, completion: TaskCompletion) -> None:
+    """Вызывается до удаления задачи: напоминания ещё на месте."""
+    user_tz = get_user_timezone(task.user)
+    local_date = _local(task.created_at, user_tz).date()
+    _apply_deltas(task.user_id, local_date, {"created_count": -1})
+    if completion is not None:
+        record_task_completion(task, *completion, sign=-1)
+
+
+def collect_rollup_counts(
+    user: User, start: datetime, now: datetime, user_tz: tzinfo
+) -> HabitsCounts:
+    return collect_rollup_counts_many({user_tz: [user.pk]}, start, now)[user.pk]
+
+
+def collect_rollup_counts_many(
+    user_ids_by_tz: Mapping[tzinfo, Sequence[Any]], start: datetime, now: datetime
+) -> dict[Any, HabitsCounts]:
+    """
+    Суммирует дневные строки за период (границы — локальные даты start и now),
+    по запросу на таймзону. День недели считается по local_date, час — из
+    done_by_hour.
+    """
+    counts: dict[Any, HabitsCounts] = {}
+    for user_tz, ids in user_ids_by_tz.items():
+        for user_id in ids:
+            counts[user_id] = HabitsCounts()
+        rows = UserDailyStats.objects.filter(
+            user_id__in=ids,
+            local_date__gte=_local(start, user_tz).date(),
+            local_date__lte=_local(now, user_tz).date(),
+        )
+        for row in rows:
+            _add_row(counts[row.user_id], row)
+
+    for user_counts in counts.values():
+        user_counts.due_done_count = (
+            user_counts.on_time_count + user_counts.overdue_count
+        )
+    return counts
+
+
+def _add_row(counts: HabitsCounts, row: UserDailyStats) -> None:
+    counts.created_count += row.created_count
+    counts.done_count += row.done_count
+    counts.on_time_count += row.on_time_count
+    counts.overdue_count += row.overdue_count
+    counts.no_due_count += row.no_due_count
+    counts.reminder_helped_tasks += row.reminder_helped_count
+    counts.reminders_sent_before_done += row.reminders_before_done_count
+    counts.by_day[row.local_date.weekday()] += row.done_count
+    for hour, value in enumerate(row.done_by_hour):
+        counts.by_hour[hour] += value
+
+
+def _empty_row(user: User, local_date: date) -> UserDailyStats:
+    return UserDailyStats(user=user, local_date=local_date, done_by_hour=[0] * 24)
+
+
+def build_user_daily_stats(user: User) -> list[UserDailyStats]:
+    """Пересчитывает дневные строки пользователя по сырым задачам."""
+    user_tz = get_user_timezone(user)
+    rows: dict[date, UserDailyStats] = {}
+
+    def row_for(local_date: date) -> UserDailyStats:
+        if local_date not in rows:
+            rows[local_date] = _empty_row(user, local_date)
+        return rows[local_date]
+
+    tasks = Task.objects.filter(user=user).order_by()
+    created = (
+        tasks.annotate(day=TruncDate("created_at", tzinfo=user_tz))
+        .values("day")
+        .annotate(count=Count("pk"))
+    )
+    for item in created:
+        row_for(item["day"]).created_count = item["count"]
+
+    done = tasks.filter(status=Task.Status.DONE, completed_at__isnull=False)
+    due_q = Q(due_at__isnull=False)
+    reminders_q = Q(reminders__sent=True, reminders__notify_at__lte=F("completed_at"))
+    done_rows = (
+        done.annotate(
+            day=TruncDate("completed_at", tzinfo=user_tz),
+            hour=ExtractHour("completed_at", tzinfo=user_tz),
+        )
+        .values("day", "hour")
+        .annotate(
+            done_count=Count("pk", distinct=True),
+            on_time_count=Count(
+                "pk", distinct=True, filter=due_q & Q(completed_at__lte=F("due_at"))
+            ),
+            overdue_count=Count(
+                "pk", distinct=True, filter=due_q & Q(completed_at__gt=F("due_at"))
+            ),
+            no_due_count=Count("pk", distinct=True, filter=Q(due_at__isnull=True)),
+            reminder_helped_count=Count("pk", distinct=True, filter=reminders_q),
+            reminders_before_done_count=Count("reminders", filter=reminders_q),
+        )
+    )
+    for item in done_rows:
+        row = row_for(item["day"])
+        for field in COUNTER_FIELDS[1:]:
+            setattr(row, field, getattr(row, field) + item[field])
+        row.done_by_hour[item["hour"]] += item["done_count"]
+
+    return list(rows.values())
+
+
+def rebuild_user_daily_stats(users: Iterable[User]) -> int:
+    total = 0
+    for user in users:
+        rows = build_user_daily_stats(user)
+        with transaction.atomic():
+            UserDailyStats.objects.filter(user=user).delete()
+            UserDailyStats.objects.bulk_create(rows)
+        total += len(rows)
+    return total
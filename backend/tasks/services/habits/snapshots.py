@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta
+from typing import Any
+
+from celery import current_app
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from tasks.models import HabitsReportSnapshot
+from users.models import User
+
+from .cache import get_user_data_version
+from .types import HabitsReport
+
+logger = logging.getLogger(__name__)
+
+REFRESH_LOCK_KEY = "habits:snapshot:refresh:{user_id}:{days}"
+REFRESH_LOCK_TIMEOUT = 300
+SNAPSHOT_UPDATE_FIELDS = [
+    "short_text",
+    "long_text",
+    "metrics",
+    "data_version",
+    "generated_at",
+    "generation_ms",
+]
+
+
+def _max_age() -> timedelta:
+    return timedelta(seconds=getattr(settings, "HABITS_SNAPSHOT_MAX_AGE", 6 * 3600))
+
+
+def get_habits_snapshot(user: User, days: int) -> HabitsReportSnapshot | None:
+    return HabitsReportSnapshot.objects.filter(user=user, days=days).first()
+
+
+def is_snapshot_stale(
+    snapshot: HabitsReportSnapshot, now: datetime | None = None
+) -> bool:
+    """Устарел, если старше HABITS_SNAPSHOT_MAX_AGE или данные пользователя менялись."""
+    now = now or timezone.now()
+    if snapshot.generated_at < now - _max_age():
+        return True
+    return snapshot.data_version != get_user_data_version(snapshot.user_id)
+
+
+def save_habits_snapshots(
+    users: Sequence[User],
+    days: int,
+    reports: Sequence[HabitsReport],
+    versions: Mapping[Any, int],
+    generation_ms: int,
+) -> None:
+    now = timezone.now()
+    HabitsReportSnapshot.objects.bulk_create(
+        [
+            HabitsReportSnapshot(
+                user=user,
+                days=days,
+                short_text=report.short_text,
+                long_text=report.long_text,
+                metrics=report.metrics,
+                data_version=versions[user.pk],
+                generated_at=now,
+                generation_ms=generation_ms,
+            )
+            for user, report in zip(users, reports)
+        ],
+        update_conflicts=True,
+        unique_fields=["user", "days"],
+        update_fields=SNAPSHOT_UPDATE_FIELDS,
+    )
+
+
+def request_snapshot_refresh(user_id: Any, days: int) -> bool:
+    """
+    Ставит фоновый пересчёт снапшота. Повторные запросы в течение
+    REFRESH_LOCK_TIMEOUT секунд не плодят задачи.
+    """
+    lock_key = REFRESH_LOCK_KEY.format(user_id=user_id, days=days)
+    if not cache.add(lock_key, 1, timeout=REFRESH_LOCK_TIMEOUT):
+        return False
+
+    transaction.on_commit(
+        lambda: current_app.send_task(
+            "tasks.tasks.refresh_habits_snapshot", args=[str(user_id), days]
+        )
+    )
+    logger.debug(
+        "Habits snapshot refresh requested",
+        extra={"user_id": str(user_id), "days": days},
+    )
+    return True
+
+
+def release_snapshot_refresh(user_id: Any, days: int) -> None:
+    cache.delete(REFRESH_LOCK_KEY.format(user_id=user_id, days=days))
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from datetime import datetime, tzinfo
+from typing import Any
+
+from django.db.models import (
+    Count,
+    Exists,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce, ExtractHour, ExtractIsoWeekDay
+from tasks.models import Reminder, Task
+from users.models import User
+
+from .types import HabitsCounts
+
+
+def _done_filter(start: datetime, now: datetime) -> Q:
+    return Q(
+        status=Task.Status.DONE,
+        completed_at__isnull=False,
+        completed_at__gte=start,
+        completed_at__lte=now,
+    )
+
+
+def _reminders_before_done() -> QuerySet[Reminder]:
+    return Reminder.objects.filter(
+        task=OuterRef("pk"),
+        sent=True,
+        notify_at__lte=OuterRef("completed_at"),
+    )
+
+
+def collect_habits_counts(
+    user: User, start: datetime, now: datetime, user_tz: tzinfo
+) -> HabitsCounts:
+    return collect_habits_counts_many({user_tz: [user.pk]}, start, now)[user.pk]
+
+
+def collect_habits_counts_many(
+    user_ids_by_tz: Mapping[tzinfo, Sequence[Any]], start: datetime, now: datetime
+) -> dict[Any, HabitsCounts]:
+    """
+    Считает метрики привычек сразу для многих пользователей: счётчики —
+    одним запросом с GROUP BY user_id (Count с filter, Exists по
+    напоминаниям), гистограмма день недели × час — по запросу на таймзону
+    (Extract ... AT TIME ZONE).
+    """
+    user_ids = [user_id for ids in user_ids_by_tz.values() for user_id in ids]
+    counts = {user_id: HabitsCounts() for user_id in user_ids}
+
+    created_q = Q(created_at__gte=start, created_at__lte=now)
+    done_q = _done_filter(start, now)
+    due_done_q = done_q & Q(due_at__isnull=False)
+    reminders = _reminders_before_done()
+    reminders_count = Subquery(
+        reminders.order_by()
+        .values("task")
+        .annotate(count=Count("pk"))
+        .values("count")[:1],
+        output_field=IntegerField(),
+    )
+
+    totals = (
+        Task.objects.filter(user_id__in=user_ids)
+        .filter(created_q | done_q)
+        .order_by()
+        .values("user_id")
+        .annotate(
+            created_count=Count("pk", filter=created_q),
+            done_count=Count("pk", filter=done_q),
+            due_done_count=Count("pk", filter=due_done_q),
+            on_time_count=Count(
+                "pk", filter=due_done_q & Q(completed_at__lte=F("due_at"))
+            ),
+            overdue_count=Count(
+                "pk", filter=due_done_q & Q(completed_at__gt=F("due_at"))
+            ),
+            no_due_count=Count("pk", filter=done_q & Q(due_at__isnull=True)),
+            reminder_helped_tasks=Count("pk", filter=done_q & Q(Exists(reminders))),
+            reminders_sent_before_done=Coalesce(
+                Sum(Coalesce(reminders_count, Value(0)), filter=done_q), Value(0)
+            ),
+        )
+    )
+    for row in totals:
+        user_id = row.pop("user_id")
+        counts[user_id] = HabitsCounts(**row)
+
+    for user_tz, ids in user_ids_by_tz.items():
+        histogram = (
+            Task.objects.filter(done_q, user_id__in=ids)
+            .annotate(
+                weekday=ExtractIsoWeekDay("completed_at", tzinfo=user_tz),
+                hour=ExtractHour("completed_at", tzinfo=user_tz),
+            )
+            .order_by()
+            .values("user_id", "weekday", "hour")
+            .annotate(count=Count("pk"))
+        )
+        for row in histogram:
+            user_counts = counts[row["user_id"]]
+            user_counts.by_day[row["weekday"] - 1] += row["count"]
+            user_counts.by_hour[row["hour"]] += row["count"]
+
+    return counts
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 DAY_NAMES = ["Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс"]
@@ -11,3 +11,17 @@ class HabitsReport:
     short_text: str
     long_text: str
     metrics: dict[str, object]
+
+
+@dataclass
+class HabitsCounts:
+    created_count: int = 0
+    done_count: int = 0
+    due_done_count: int = 0
+    on_time_count: int = 0
+    overdue_count: int = 0
+    no_due_count: int = 0
+    reminder_helped_tasks: int = 0
+    reminders_sent_before_done: int = 0
+    by_day: list[int] = field(default_factory=lambda: [0] * 7)
+    by_hour: list[int] = field(default_factory=lambda: [0] * 24)
@@ -1,11 +1,17 @@
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta
 
+from celery import current_app
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
 from django.utils import timezone
 from datetime import timezone as dt_timezone
 
 from tasks.models import Reminder, Task
 
+from .dispatcher import OP_UPSERT, publish_reminder_events
+
 from users.utils.timezone import get_user_timezone
 
 logger = logging.getLogger(__name__)
@@ -74,6 +80,8 @@ def create_default_reminders(task: Task) -> None:
         return
 
     Reminder.objects.bulk_create(reminders)
+    # bulk_create не шлёт post_save, поэтому диспетчер уведомляем явно.
+    publish_reminder_events(OP_UPSERT, reminders)
 
     logger.info(
         "Default reminders created",
@@ -84,3 +92,74 @@ def create_default_reminders(task: Task) -> None:
             "notify_at_list": [r.notify_at for r in reminders],
         },
     )
+
+    if getattr(settings, "REMINDERS_ETA_ENABLED", False):
+        schedule_reminders(reminders)
+
+
+def _eta_horizon() -> timedelta:
+    return timedelta(seconds=float(getattr(settings, "REMINDER_ETA_HORIZON", 3000)))
+
+
+def schedule_reminders(reminders: list[Reminder], now: datetime | None = None) -> None:
+    """
+    Ставит по задаче send_reminder с eta=notify_at на каждое напоминание
+    в пределах REMINDER_ETA_HORIZON. Более дальние поставит
+    schedule_upcoming_reminders, когда они войдут в горизонт.
+
+    Задачи не отзываются: если напоминание удалено (смена due_at), уже отправлено
+    sweep-ом или задача закрыта, send_reminder просто ничего не найдёт.
+    """
+    horizon_end = (now or timezone.now()) + _eta_horizon()
+    payload = [
+        (str(reminder.id), reminder.notify_at)
+        for reminder in reminders
+        if reminder.notify_at <= horizon_end
+    ]
+    if not payload:
+        return
+
+    def _enqueue() -> None:
+        for reminder_id, notify_at in payload:
+            current_app.send_task(
+                "tasks.tasks.send_reminder",
+                args=[reminder_id],
+                eta=notify_at,
+            )
+
+    transaction.on_commit(_enqueue)
+
+
+def schedule_upcoming_reminders(now: datetime, window: timedelta) -> int:
+    """
+    Ставит с eta напоминания, вошедшие в горизонт за последний интервал sweep:
+    notify_at в (now + горизонт - window, now + горизонт]. Пропущенные (sweep
+    не запускался) отправит сам sweep, когда они станут due.
+    """
+    horizon_end = now + _eta_horizon()
+    reminders = list(
+        Reminder.objects.filter(
+            sent=False,
+            notify_at__gt=horizon_end - window,
+            notify_at__lte=horizon_end,
+            task__status=Task.Status.PENDING,
+        )
+    )
+    schedule_reminders(reminders, now)
+    return len(reminders)
+
+
+def get_due_reminders(now: datetime) -> QuerySet[Reminder]:
+    """
+    Неотправленные напоминания с notify_at <= now по задачам в статусе pending.
+
+    Условие sent=False совпадает с предикатом частичного индекса
+    reminder_unsent_notify_at_idx: скан идёт диапазоном по notify_at,
+    а Task подтягивается по PK, поэтому стоимость зависит только от
+    количества due-напоминаний, а не от всей истории отправок.
+    """
+    return Reminder.objects.filter(
+        sent=False,
+        notify_at__lte=now,
+        task__status=Task.Status.PENDING,
+    ).order_by("notify_at")
@@ -1,21 +1,34 @@
 import logging
-from datetime import timedelta
+import time
+from datetime import datetime, timedelta
 from typing import Any
 
-from celery import shared_task
+from celery import group, shared_task
 from django.conf import settings
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Q, QuerySet
 from django.utils import timezone
 
 from notifications.publisher import publish_telegram_message
 from users.models import User
 
-from ..models import Reminder, Task
-from .habits import build_habits_report
+from ..models import HabitsReportSnapshot, Reminder, Task
+from .habits import HabitsReport, build_habits_reports
+from .habits.cache import bump_users_data_version, get_user_data_version
+from .habits.llm_client import complete_prompts
+from .habits.progress import init_weekly_run_progress, record_weekly_chunk_done
+from .habits.report import apply_llm_text, build_report_prompt
+from .habits.snapshots import release_snapshot_refresh, save_habits_snapshots
 from .messages import format_task
+from .reminders import get_due_reminders, schedule_upcoming_reminders
+from .sync import prune_task_tombstones as _prune_task_tombstones
 
 logger = logging.getLogger(__name__)
 
+# Допуск на расхождение часов воркера и БД для задач, запущенных по eta.
+ETA_CLOCK_SKEW = timedelta(seconds=5)
+WEEKLY_REPORT_DAYS = 7
+
 
 @shared_task(  # type: ignore
     name="tasks.tasks.send_task_reminders",
@@ -26,37 +39,120 @@ logger = logging.getLogger(__name__)
 )
 def send_task_reminders(self: Any) -> None:
     now = timezone.now()
+    batch_size = int(getattr(settings, "REMINDER_BATCH_SIZE", 500))
+
+    total = 0
+    while True:
+        claimed = _dispatch_reminder_batch(now, batch_size)
+        total += claimed
+        if claimed < batch_size:
+            break
+
+    scheduled = 0
+    if getattr(settings, "REMINDERS_ETA_ENABLED", False):
+        interval = float(getattr(settings, "REMINDER_SWEEP_INTERVAL", 600))
+        scheduled = schedule_upcoming_reminders(now, timedelta(seconds=interval))
+
+    logger.info(
+        "Reminder sweep finished",
+        extra={"claimed": total, "scheduled": scheduled, "batch_size": batch_size},
+    )
+
+
+def _dispatch_reminder_batch(now: datetime, batch_size: int) -> int:
+    """
+    Захватывает пачку due-напоминаний (FOR UPDATE SKIP LOCKED), отправляет их
+    и помечает sent одним UPDATE. Параллельные воркеры получают разные пачки.
+    """
+    with transaction.atomic():
+        reminders = _claim_due_reminders(now, batch_size)
+        if not reminders:
+            return 0
+
+        _publish_and_mark_sent(reminders)
+
+    return len(reminders)
+
+
+def _claim_due_reminders(now: datetime, batch_size: int) -> list[Reminder]:
+    return list(build_claim_queryset(now, batch_size))
 
-    reminders = Reminder.objects.select_related("task", "task__user").filter(
-        sent=False,
-        notify_at__lte=now,
-        task__status=Task.Status.PENDING,
+
+def build_claim_queryset(now: datetime, batch_size: int) -> QuerySet[Reminder]:
+    return (
+        get_due_reminders(now)
+        .select_related("task", "task__user")
+        .select_for_update(skip_locked=True, of=("self",))[:batch_size]
     )
 
+
+def _publish_and_mark_sent(reminders: list[Reminder]) -> None:
     for reminder in reminders:
-        task = reminder.task
-        user = task.user
-
-        if not user.telegram_id:
-            logger.warning(
-                "User has no telegram_id",
-                extra={"user_id": user.id, "task_id": task.id},
-            )
-            continue
-
-        publish_telegram_message(
-            telegram_id=user.telegram_id,
-            text=_build_task_reminder_text(task),
-            extra={"task_id": str(task.id), "reminder_id": str(reminder.id)},
+        _publish_reminder(reminder)
+
+    Reminder.objects.filter(pk__in=[reminder.pk for reminder in reminders]).update(
+        sent=True
+    )
+    bump_users_data_version(reminder.task.user_id for reminder in reminders)
+
+
+def _publish_reminder(reminder: Reminder) -> None:
+    task = reminder.task
+    user = task.user
+
+    if not user.telegram_id:
+        logger.warning(
+            "User has no telegram_id",
+            extra={"user_id": user.id, "task_id": task.id},
+        )
+        return
+
+    publish_telegram_message(
+        telegram_id=user.telegram_id,
+        text=_build_task_reminder_text(task),
+        extra={"task_id": str(task.id), "reminder_id": str(reminder.id)},
+        idempotency_key=f"reminder:{reminder.id}",
+    )
+
+    logger.info(
+        "Reminder sent",
+        extra={"task_id": task.id, "user_id": user.id},
+    )
+
+
+@shared_task(  # type: ignore
+    name="tasks.tasks.send_reminder",
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=30,
+    retry_kwargs={"max_retries": 3},
+)
+def send_reminder(self: Any, reminder_id: str) -> None:
+    if not dispatch_reminder_ids([reminder_id], timezone.now() + ETA_CLOCK_SKEW):
+        logger.debug(
+            "Scheduled reminder is gone or already handled",
+            extra={"reminder_id": reminder_id},
         )
 
-        reminder.sent = True
-        reminder.save(update_fields=["sent"])
 
-        logger.info(
-            "Reminder sent",
-            extra={"task_id": task.id, "user_id": user.id},
+def dispatch_reminder_ids(reminder_ids: list[str], now: datetime) -> int:
+    """
+    Отправляет конкретные напоминания, если они ещё due. Удалённые, уже
+    отправленные и захваченные другим воркером напоминания пропускаются.
+    """
+    with transaction.atomic():
+        reminders = list(
+            get_due_reminders(now)
+            .filter(pk__in=reminder_ids)
+            .select_related("task", "task__user")
+            .select_for_update(skip_locked=True, of=("self",))
         )
+        if not reminders:
+            return 0
+
+        _publish_and_mark_sent(reminders)
+
+    return len(reminders)
 
 
 def _build_task_reminder_text(task: Task) -> str:
@@ -70,11 +166,65 @@ def _build_task_reminder_text(task: Task) -> str:
     retry_backoff=30,
     retry_kwargs={"max_retries": 3},
 )
-def send_weekly_habits_reports(self: Any) -> None:
+def send_weekly_habits_reports(self: Any) -> str:
+    """
+    Координатор: делит подходящих пользователей на чанки и запускает их
+    группой независимых задач. Повтор координатора безопасен: чанки заново
+    проверяют last_habits_report_at, а сообщения дедуплицируются по
+    idempotency_key.
+    """
     now = timezone.now()
-    cutoff = now - timedelta(days=7)
+    run_id = now.strftime("%Y%m%dT%H%M%S")
+    chunk_size = getattr(settings, "HABITS_REPORT_CHUNK_SIZE", 100)
 
-    users = (
+    user_ids = [
+        str(user_id)
+        for user_id in _weekly_report_users(now)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    ]
+    chunks = [
+        user_ids[index : index + chunk_size]
+        for index in range(0, len(user_ids), chunk_size)
+    ]
+
+    init_weekly_run_progress(run_id, users=len(user_ids), chunks=len(chunks))
+    if chunks:
+        group(
+            send_habits_reports_chunk.s(chunk, now.isoformat(), run_id)
+            for chunk in chunks
+        ).apply_async()
+
+    logger.info(
+        "Weekly habits reports dispatched",
+        extra={"run_id": run_id, "users": len(user_ids), "chunks": len(chunks)},
+    )
+    return run_id
+
+
+@shared_task(  # type: ignore
+    name="tasks.tasks.send_habits_reports_chunk",
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=30,
+    retry_kwargs={"max_retries": 3},
+)
+def send_habits_reports_chunk(
+    self: Any, user_ids: list[str], now_iso: str, run_id: str
+) -> int:
+    now = datetime.fromisoformat(now_iso)
+    users = list(_weekly_report_users(now).filter(pk__in=user_ids))
+    if users:
+        use_llm = getattr(settings, "HUGGINGFACE_USE_LLM_WEEKLY", True)
+        _send_habits_reports_batch(users, now, use_llm)
+
+    record_weekly_chunk_done(run_id, users=len(users))
+    return len(users)
+
+
+def _weekly_report_users(now: datetime) -> QuerySet[User]:
+    cutoff = now - timedelta(days=WEEKLY_REPORT_DAYS)
+    return (
         User.objects.filter(is_active=True)
         .filter(telegram_id__isnull=False)
         .filter(
@@ -82,19 +232,133 @@ def send_weekly_habits_reports(self: Any) -> None:
         )
     )
 
-    use_llm = getattr(settings, "HUGGINGFACE_USE_LLM_WEEKLY", True)
 
-    for user in users.iterator():
-        report = build_habits_report(user, days=7, use_llm=use_llm)
-        publish_telegram_message(
-            telegram_id=user.telegram_id,
-            text=report.short_text,
-            extra={"user_id": str(user.id), "type": "habits_short"},
-        )
-        publish_telegram_message(
-            telegram_id=user.telegram_id,
-            text=report.long_text,
-            extra={"user_id": str(user.id), "type": "habits_long"},
+def _build_reports_batch(
+    users: list[User], days: int, use_llm: bool
+) -> list[HabitsReport]:
+    """
+    Отчёты по правилам строятся для всей пачки, затем промпты уходят в LLM
+    одним конкурентным пакетом.
+    """
+    reports = build_habits_reports(users, days=days, use_llm=False)
+    if not use_llm:
+        return reports
+
+    prompts = [
+        build_report_prompt(report, user, days) for user, report in zip(users, reports)
+    ]
+    llm_texts = complete_prompts(prompts)
+    return [
+        apply_llm_text(report, llm_text, user, days)
+        for user, report, llm_text in zip(users, reports, llm_texts)
+    ]
+
+
+def _send_habits_reports_batch(users: list[User], now: datetime, use_llm: bool) -> None:
+    """Сообщения и last_habits_report_at записываются одной транзакцией."""
+    reports = _build_reports_batch(users, WEEKLY_REPORT_DAYS, use_llm)
+    with transaction.atomic():
+        for user, report in zip(users, reports):
+            _publish_habits_report(user, report, now)
+        User.objects.filter(pk__in=[user.pk for user in users]).update(
+            last_habits_report_at=now
         )
-        user.last_habits_report_at = now
-        user.save(update_fields=["last_habits_report_at"])
+
+
+def _publish_habits_report(user: User, report: HabitsReport, now: datetime) -> None:
+    key_suffix = f"{user.id}:{now.date().isoformat()}"
+    publish_telegram_message(
+        telegram_id=user.telegram_id,
+        text=report.short_text,
+        extra={"user_id": str(user.id), "type": "habits_short"},
+        idempotency_key=f"habits_short:{key_suffix}",
+    )
+    publish_telegram_message(
+        telegram_id=user.telegram_id,
+        text=report.long_text,
+        extra={"user_id": str(user.id), "type": "habits_long"},
+        idempotency_key=f"habits_long:{key_suffix}",
+    )
+
+
+@shared_task(  # type: ignore
+    name="tasks.tasks.refresh_habits_snapshots",
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=30,
+    retry_kwargs={"max_retries": 3},
+)
+def refresh_habits_snapshots(self: Any) -> int:
+    """Ночной пересчёт всех снапшотов отчётов чанками (по периоду отчёта)."""
+    chunk_size = getattr(settings, "HABITS_REPORT_CHUNK_SIZE", 100)
+    pairs = (
+        HabitsReportSnapshot.objects.filter(user__is_active=True)
+        .order_by("days", "user_id")
+        .values_list("days", "user_id")
+    )
+    user_ids_by_days: dict[int, list[str]] = {}
+    for days, user_id in pairs:
+        user_ids_by_days.setdefault(days, []).append(str(user_id))
+
+    signatures = [
+        refresh_habits_snapshots_chunk.s(user_ids[index : index + chunk_size], days)
+        for days, user_ids in user_ids_by_days.items()
+        for index in range(0, len(user_ids), chunk_size)
+    ]
+    if signatures:
+        group(signatures).apply_async()
+
+    logger.info(
+        "Habits snapshot refresh dispatched",
+        extra={"chunks": len(signatures)},
+    )
+    return len(signatures)
+
+
+@shared_task(  # type: ignore
+    name="tasks.tasks.refresh_habits_snapshots_chunk",
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=30,
+    retry_kwargs={"max_retries": 3},
+)
+def refresh_habits_snapshots_chunk(self: Any, user_ids: list[str], days: int) -> int:
+    users = list(User.objects.filter(pk__in=user_ids, is_active=True))
+    _refresh_snapshots(users, days)
+    return len(users)
+
+
+@shared_task(  # type: ignore
+    name="tasks.tasks.refresh_habits_snapshot",
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=10,
+    retry_kwargs={"max_retries": 3},
+)
+def refresh_habits_snapshot(self: Any, user_id: str, days: int) -> None:
+    try:
+        user = User.objects.filter(pk=user_id, is_active=True).first()
+        if user is not None:
+            _refresh_snapshots([user], days)
+    finally:
+        release_snapshot_refresh(user_id, days)
+
+
+@shared_task(name="tasks.tasks.prune_task_tombstones")  # type: ignore
+def prune_task_tombstones() -> int:
+    return _prune_task_tombstones()
+
+
+def _refresh_snapshots(users: list[User], days: int) -> None:
+    if not users:
+        return
+    # Версия берётся до расчёта: изменения во время расчёта сделают снапшот устаревшим.
+    versions = {user.pk: get_user_data_version(user.pk) for user in users}
+    started = time.perf_counter()
+    reports = _build_reports_batch(users, days, use_llm=True)
+    generation_ms = int((time.perf_counter() - started) * 1000 / len(users))
+    save_habits_snapshots(users, days, reports, versions, generation_ms)
+    logger.info(
+        "Habits snapshots refreshed",
+        extra={"users": len(users), "days": days, "generation_ms": generation_ms},
+    )
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import datetime, timedelta, tzinfo
+from typing import Any
+
+from django.conf import settings
+from django.utils import timezone
+from tasks.models import Task, TaskTombstone
+from users.models import User
+
+from .habits.cache import get_user_data_version
+
+logger = logging.getLogger(__name__)
+
+CHANGES_SINCE_HEADER = "X-Changes-Since"
+
+
+def _tombstone_retention() -> timedelta:
+    return timedelta(days=int(getattr(settings, "TASK_TOMBSTONE_RETENTION_DAYS", 30)))
+
+
+def build_task_list_etag(
+    user: User, query: str, user_tz: tzinfo, now: datetime | None = None
+) -> str:
+    """
+    ETag списка задач без обращения к БД: версия данных пользователя из кэша
+    (растёт после коммита любого изменения его задач), строка запроса,
+    таймзона и язык пользователя (в них рендерятся даты и тексты) и
+    локальная дата — от неё зависят фильтры today/week.
+    """
+    now = now or timezone.now()
+    raw = "|".join(
+        [
+            str(user.pk),
+            str(get_user_data_version(user.pk)),
+            query,
+            str(user_tz),
+            getattr(user, "language", ""),
+            now.astimezone(user_tz).date().isoformat(),
+        ]
+    )
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
+def is_changed_since_expired(since: datetime, now: datetime | None = None) -> bool:
+    """Старше срока хранения следов удаления — дельта может быть неполной."""
+    return since < (now or timezone.now()) - _tombstone_retention()
+
+
+def collect_task_changes(
+    user: User, since: datetime, now: datetime | None = None
+) -> dict[str, Any]:
+    """
+    Задачи, созданные или изменённые после `since`, и id удалённых.
+    `next_since` отстаёт от текущего времени на TASK_CHANGES_OVERLAP секунд:
+    транзакции, закоммиченные позже чтения, попадут в следующую дельту,
+    а повторно пришедшие задачи клиент просто перезапишет.
+    """
+    now = now or timezone.now()
+    changed = (
+        Task.objects.filter(user=user, updated_at__gt=since)
+        .select_related("topic")
+        .order_by("updated_at", "id")
+    )
+    deleted = TaskTombstone.objects.filter(user=user, deleted_at__gt=since).values_list(
+        "task_id", flat=True
+    )
+    return {
+        "changed": list(changed),
+        "deleted": [str(task_id) for task_id in deleted],
+        "next_since": max(since, changes_mark(now)),
+    }
+
+
+def changes_mark(now: datetime | None = None) -> datetime:
+    """Отметка для следующего changed_since (с запасом TASK_CHANGES_OVERLAP)."""
+    overlap = timedelta(seconds=float(getattr(settings, "TASK_CHANGES_OVERLAP", 5)))
+    return (now or timezone.now()) - overlap
+
+
+def prune_task_tombstones() -> int:
+    deleted, _ = TaskTombstone.objects.filter(
+        deleted_at__lt=timezone.now() - _tombstone_retention()
+    ).delete()
+    logger.info("Task tombstones pruned", extra={"deleted": deleted})
+    return deleted
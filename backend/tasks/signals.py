@@ -1,33 +1,229 @@
 from typing import Any, cast
 
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
 
-from .models import Task
-from topics.models import Topic
+from .models import Reminder, Task, TaskTombstone
+from .services.dispatcher import OP_DELETE, OP_UPSERT, publish_reminder_events
+from .services.habits.cache import bump_user_data_version, bump_users_data_version
+from .services.habits.rollup import (
+    record_task_completion_change,
+    record_task_created,
+    record_task_deleted,
+    task_completion,
+)
+from topics.models import TOPIC_COUNTER_FIELDS, Topic
+from topics.progress import (
+    move_topic_counters,
+    recalc_topics_progress,
+    record_task_state_change,
+)
+from users.models import User
+
+
+def _locked_task_row(task_id: Any) -> tuple[Any, ...] | None:
+    return (
+        Task.objects.select_for_update()
+        .filter(pk=task_id)
+        .values_list("topic_id", "status", "completed_at", "due_at")
+        .first()
+    )
+
+
+def _remember_task_row(instance: Task, row: tuple[Any, ...] | None) -> None:
+    if row is None:
+        instance.saved_state = instance.saved_completion = None
+        return
+    topic_id, status, completed_at, due_at = row
+    instance.saved_state = (topic_id, status)
+    instance.saved_completion = task_completion(status, completed_at, due_at)
+
+
+@receiver(pre_save, sender=Task)
+def lock_task_state_on_save(
+    sender: type[Task],
+    instance: Task,
+    raw: bool = False,
+    **kwargs: Any,
+) -> None:
+    # Прежнее состояние берём из БД, а не из загруженного экземпляра: он мог
+    # устареть, а параллельное сохранение той же задачи ждёт блокировку.
+    # Новый объект вставляется без UPDATE, кроме raw-сохранения (loaddata).
+    if instance._state.adding and not raw:
+        _remember_task_row(instance, None)
+    else:
+        _remember_task_row(instance, _locked_task_row(instance.pk))
 
 
 @receiver(post_save, sender=Task)
-def update_topic_progress_on_save(
+def update_topic_counters_on_save(
     sender: type[Task],
     instance: Task,
+    created: bool = False,
     **kwargs: Any,
 ) -> None:
-    if not instance.topic:
-        return
+    old = instance.saved_state
+    new = (instance.topic_id, instance.status)
+    if created:
+        record_task_state_change(None, new)
+    elif old is None:
+        # Строки не было видно до сохранения: прежнее состояние неизвестно.
+        recalc_topics_progress({instance.topic_id})
+    elif old != new:
+        record_task_state_change(old, new)
+
+
+@receiver(post_save, sender=Task)
+def update_daily_stats_on_save(
+    sender: type[Task],
+    instance: Task,
+    created: bool = False,
+    **kwargs: Any,
+) -> None:
+    # Любое сохранение (API, админка, ORM) сдвигает UserDailyStats.
+    if created:
+        record_task_created(instance)
+    elif instance.saved_state is not None:
+        record_task_completion_change(
+            instance,
+            instance.saved_completion,
+            task_completion(instance.status, instance.completed_at, instance.due_at),
+        )
+    _remember_task_row(
+        instance,
+        (instance.topic_id, instance.status, instance.completed_at, instance.due_at),
+    )
+
+
+@receiver(pre_delete, sender=Task)
+def lock_task_state_on_delete(
+    sender: type[Task],
+    instance: Task,
+    origin: Any = None,
+    **kwargs: Any,
+) -> None:
+    if origin is instance:
+        # task.delete() на экземпляре, который мог устареть.
+        _remember_task_row(instance, _locked_task_row(instance.pk))
+    else:
+        # Каскад и QuerySet.delete(): коллектор только что загрузил строки.
+        _remember_task_row(
+            instance,
+            (
+                instance.topic_id,
+                instance.status,
+                instance.completed_at,
+                instance.due_at,
+            ),
+        )
+    # До удаления: напоминания задачи ещё на месте. Строки статистики
+    # удаляемого пользователя уйдут каскадом, сдвигать их незачем.
+    if instance.saved_state is not None and not isinstance(origin, User):
+        record_task_deleted(instance, instance.saved_completion)
+
+
+@receiver(post_delete, sender=Task)
+def update_topic_counters_on_delete(
+    sender: type[Task],
+    instance: Task,
+    **kwargs: Any,
+) -> None:
+    # None — строку уже удалил параллельный запрос, он и сдвинул счётчики.
+    if instance.saved_state is not None:
+        record_task_state_change(instance.saved_state, None)
+    _remember_task_row(instance, None)
 
-    topic = cast(Topic, instance.topic)
-    topic.recalc_progress()
+
+@receiver(post_save, sender=Reminder)
+def publish_reminder_on_save(
+    sender: type[Reminder],
+    instance: Reminder,
+    **kwargs: Any,
+) -> None:
+    publish_reminder_events(OP_UPSERT, [instance])
+
+
+@receiver(post_delete, sender=Reminder)
+def publish_reminder_on_delete(
+    sender: type[Reminder],
+    instance: Reminder,
+    **kwargs: Any,
+) -> None:
+    publish_reminder_events(OP_DELETE, [instance])
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def bump_habits_version_on_task_change(
+    sender: type[Task],
+    instance: Task,
+    **kwargs: Any,
+) -> None:
+    bump_user_data_version(instance.user_id)
+
+
+@receiver(post_save, sender=Reminder)
+@receiver(post_delete, sender=Reminder)
+def bump_habits_version_on_reminder_change(
+    sender: type[Reminder],
+    instance: Reminder,
+    **kwargs: Any,
+) -> None:
+    try:
+        task = cast(Task, instance.task)
+    except Task.DoesNotExist:
+        # Напоминание удаляется каскадом вместе с задачей: версию сдвинет она.
+        return
+    bump_user_data_version(task.user_id)
 
 
 @receiver(post_delete, sender=Task)
-def update_topic_progress_on_delete(
+def record_task_tombstone(
     sender: type[Task],
     instance: Task,
+    origin: Any = None,
+    **kwargs: Any,
+) -> None:
+    # При удалении пользователя каскадом синхронизировать уже некого.
+    if isinstance(origin, User):
+        return
+    TaskTombstone.objects.create(user_id=instance.user_id, task_id=instance.pk)
+
+
+@receiver(post_save, sender=Topic)
+def update_course_on_topic_change(
+    sender: type[Topic],
+    instance: Topic,
+    created: bool = False,
+    update_fields: Any = None,
     **kwargs: Any,
 ) -> None:
-    if not instance.topic:
+    if not created and instance.course_id != instance.saved_course_id:
+        move_topic_counters(instance, instance.saved_course_id, instance.course_id)
+    instance.saved_course_id = instance.course_id
+
+    # Название темы входит в задачу в списке; пересчёт счётчиков его не меняет.
+    if update_fields is not None and set(update_fields) <= set(TOPIC_COUNTER_FIELDS):
         return
+    _touch_topic_tasks(instance)
+
+
+@receiver(pre_delete, sender=Topic)
+def update_course_on_topic_delete(
+    sender: type[Topic],
+    instance: Topic,
+    **kwargs: Any,
+) -> None:
+    move_topic_counters(instance, instance.course_id, None)
+    # SET_NULL выполняется UPDATE-ом без сигналов и не трогает updated_at.
+    _touch_topic_tasks(instance)
 
-    topic = cast(Topic, instance.topic)
-    topic.recalc_progress()
+
+def _touch_topic_tasks(topic: Topic) -> None:
+    tasks = Task.objects.filter(topic=topic)
+    user_ids = list(tasks.values_list("user_id", flat=True).distinct())
+    if not user_ids:
+        return
+    tasks.update(updated_at=timezone.now())
+    bump_users_data_version(user_ids)
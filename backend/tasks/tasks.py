@@ -1,3 +1,21 @@
-from .services.scheduled import send_task_reminders, send_weekly_habits_reports
+from .services.scheduled import (
+    prune_task_tombstones,
+    refresh_habits_snapshot,
+    refresh_habits_snapshots,
+    refresh_habits_snapshots_chunk,
+    send_habits_reports_chunk,
+    send_reminder,
+    send_task_reminders,
+    send_weekly_habits_reports,
+)
 
-__all__ = ["send_task_reminders", "send_weekly_habits_reports"]
+__all__ = [
+    "prune_task_tombstones",
+    "refresh_habits_snapshot",
+    "refresh_habits_snapshots",
+    "refresh_habits_snapshots_chunk",
+    "send_habits_reports_chunk",
+    "send_reminder",
+    "send_task_reminders",
+    "send_weekly_habits_reports",
+]
@@ -0,0 +1,157 @@
+from datetime import timedelta
+from typing import Any
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from tasks.models import Reminder, Task, UserDailyStats
+from tasks.services.habits import build_habits_report
+from tasks.services.habits.rollup import (
+    COUNTER_FIELDS,
+    build_user_daily_stats,
+    collect_rollup_counts,
+    rebuild_user_daily_stats,
+)
+from tasks.services.habits.stats import collect_habits_counts
+from users.models import User
+from users.utils.timezone import get_user_timezone, local_day_start
+
+from .test_habits_report import create_random_tasks
+
+
+def _rows(user: User) -> dict[Any, tuple[Any, ...]]:
+    rows = UserDailyStats.objects.filter(user=user)
+    return {
+        row.local_date: (*(getattr(row, f) for f in COUNTER_FIELDS), row.done_by_hour)
+        for row in rows
+        if any(getattr(row, f) for f in COUNTER_FIELDS)
+    }
+
+
+class DailyStatsIncrementalTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(telegram_id=555, timezone="Europe/Moscow")
+        self.client.force_authenticate(user=self.user)
+
+    def _detail(self, task_id: str) -> str:
+        return reverse("tasks-detail", kwargs={"pk": task_id})
+
+    def test_api_updates_match_backfill(self) -> None:
+        list_url = reverse("tasks-list-create")
+        due_at = (timezone.now() + timedelta(days=1)).isoformat()
+        ids = [
+            self.client.post(
+                list_url, {"title": f"T{i}", "due_at": due_at}, format="json"
+            ).data["id"]
+            for i in range(3)
+        ]
+        self.client.post(
+            list_url, {"title": "Сразу готово", "status": "done"}, format="json"
+        )
+        Reminder.objects.filter(task_id=ids[0]).update(
+            sent=True, notify_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        self.client.patch(self._detail(ids[0]), {"status": "done"}, format="json")
+        # Смена срока у выполненной задачи с отправленным напоминанием.
+        later_due = (timezone.now() + timedelta(days=2)).isoformat()
+        self.client.patch(self._detail(ids[0]), {"due_at": later_due}, format="json")
+        self.client.patch(self._detail(ids[1]), {"status": "done"}, format="json")
+        past_due = (timezone.now() - timedelta(days=1)).isoformat()
+        self.client.patch(self._detail(ids[1]), {"due_at": past_due}, format="json")
+        self.client.patch(self._detail(ids[1]), {"status": "pending"}, format="json")
+        self.client.patch(self._detail(ids[2]), {"status": "done"}, format="json")
+        self.client.delete(self._detail(ids[2]))
+
+        incremental = _rows(self.user)
+        rebuild_user_daily_stats([self.user])
+        self.assertEqual(incremental, _rows(self.user))
+
+        row = UserDailyStats.objects.get(user=self.user)
+        self.assertEqual(row.created_count, 3)
+        self.assertEqual(row.done_count, 2)
+        self.assertEqual(row.reminder_helped_count, 1)
+        self.assertEqual(row.no_due_count, 1)
+
+
+class DailyStatsReportTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(telegram_id=556, timezone="Asia/Tokyo")
+        create_random_tasks(self.user, count=300, days=30)
+        rebuild_user_daily_stats([self.user])
+
+    def test_backfill_rows_sum_to_task_totals(self) -> None:
+        rows = build_user_daily_stats(self.user)
+        tasks = Task.objects.filter(user=self.user)
+        self.assertEqual(sum(r.created_count for r in rows), tasks.count())
+        self.assertEqual(
+            sum(r.done_count for r in rows),
+            tasks.filter(status=Task.Status.DONE).count(),
+        )
+        self.assertEqual(
+            sum(sum(r.done_by_hour) for r in rows),
+            sum(r.done_count for r in rows),
+        )
+
+    def test_report_from_rollup_matches_raw_scan_over_whole_history(self) -> None:
+        raw = build_habits_report(self.user, days=90, use_llm=False).metrics
+        with override_settings(HABITS_USE_DAILY_STATS=True):
+            rolled = build_habits_report(self.user, days=90, use_llm=False).metrics
+
+        self.assertEqual(rolled["counts"], raw["counts"])
+        self.assertEqual(rolled["patterns"], raw["patterns"])
+
+
+class DailyStatsOrmTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(telegram_id=557, timezone="Asia/Tokyo")
+        self.user_tz = get_user_timezone(self.user)
+        self.now = timezone.now()
+        # Окно отчёта начинается ровно в локальную полночь три дня назад.
+        self.start = local_day_start(
+            timezone.localtime(self.now, self.user_tz).date() - timedelta(days=3),
+            self.user_tz,
+        )
+
+    def _complete(self, task: Task, completed_at: Any) -> None:
+        task.status = Task.Status.DONE
+        task.completed_at = completed_at
+        task.save()
+
+    def test_orm_changes_keep_rollup_equal_to_raw_counts(self) -> None:
+        second = timedelta(seconds=1)
+        completions = [
+            (self.start - second, None),  # 23:59:59 накануне — вне окна
+            (self.start, self.start + timedelta(hours=1)),  # 00:00:00 — в окне
+            (self.start + timedelta(days=1) - second, self.start),
+            (self.now - timedelta(hours=2), None),
+        ]
+        tasks = []
+        for index, (completed_at, due_at) in enumerate(completions):
+            task = Task.objects.create(user=self.user, title=f"T{index}", due_at=due_at)
+            Reminder.objects.create(
+                task=task, notify_at=completed_at - timedelta(hours=1), sent=True
+            )
+            self._complete(task, completed_at)
+            tasks.append(task)
+
+        # Изменения в обход API: правка срока, возврат в работу, удаление.
+        tasks[1].due_at = self.start - timedelta(hours=1)
+        tasks[1].save()
+        stale = Task.objects.get(pk=tasks[3].pk)
+        tasks[3].status = Task.Status.PENDING
+        tasks[3].completed_at = None
+        tasks[3].save()
+        self._complete(stale, self.now - timedelta(minutes=5))
+        Task.objects.filter(pk=tasks[2].pk).delete()
+
+        now = timezone.now()
+        raw = collect_habits_counts(self.user, self.start, now, self.user_tz)
+        rolled = collect_rollup_counts(self.user, self.start, now, self.user_tz)
+
+        self.assertEqual(rolled, raw)
+        self.assertEqual((raw.done_count, raw.overdue_count), (2, 1))
+        incremental = _rows(self.user)
+        rebuild_user_daily_stats([self.user])
+        self.assertEqual(incremental, _rows(self.user))
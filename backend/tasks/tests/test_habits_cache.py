@@ -0,0 +1,67 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from tasks.models import Task
+from tasks.services.habits import get_cached_habits_report
+from tasks.services.habits.cache import BoundedLRUCache
+from tasks.services.habits.types import HabitsReport
+from users.models import User
+
+
+class BoundedLRUCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used_over_byte_budget(self) -> None:
+        lru = BoundedLRUCache(max_bytes=300)
+        lru.set("a", "x" * 100)
+        lru.set("b", "x" * 100)
+        lru.get("a")
+        lru.set("c", "x" * 100)
+
+        self.assertEqual(lru.get("b"), None)
+        self.assertIsNotNone(lru.get("a"))
+        self.assertIsNotNone(lru.get("c"))
+        stats = lru.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertLessEqual(stats["bytes"], 300)
+        self.assertEqual((stats["hits"], stats["misses"]), (3, 1))
+
+
+@mock.patch("tasks.services.habits.cache.build_habits_report")
+class HabitsReportCacheTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(telegram_id=901)
+
+    def _report(self, text: str) -> HabitsReport:
+        return HabitsReport(short_text=text, long_text=text, metrics={})
+
+    def test_repeat_request_is_served_from_cache(self, build: mock.Mock) -> None:
+        build.return_value = self._report("first")
+
+        get_cached_habits_report(self.user, days=30)
+        report = get_cached_habits_report(self.user, days=30)
+
+        self.assertEqual(report.short_text, "first")
+        self.assertEqual(build.call_count, 1)
+
+    def test_task_change_invalidates_cached_report(self, build: mock.Mock) -> None:
+        build.return_value = self._report("before")
+        get_cached_habits_report(self.user, days=7)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(user=self.user, title="Новая задача")
+        build.return_value = self._report("after")
+
+        self.assertEqual(
+            get_cached_habits_report(self.user, days=7).short_text, "after"
+        )
+        self.assertEqual(build.call_count, 2)
+
+    def test_timezone_change_misses_cached_report(self, build: mock.Mock) -> None:
+        build.return_value = self._report("moscow")
+        get_cached_habits_report(self.user, days=7)
+
+        self.user.timezone = "Asia/Tokyo"
+        build.return_value = self._report("tokyo")
+
+        self.assertEqual(
+            get_cached_habits_report(self.user, days=7).short_text, "tokyo"
+        )
@@ -0,0 +1,189 @@
+import random
+from datetime import datetime, timedelta
+from typing import Any
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from tasks.models import Reminder, Task
+from tasks.services.habits import build_habits_report, build_habits_reports
+from tasks.services.habits.rollup import rebuild_user_daily_stats
+from tasks.services.habits.types import DAY_NAMES, HabitsCounts
+from users.models import User
+from users.utils.timezone import get_user_timezone
+
+
+def reference_habits_counts(user: User, start: datetime, now: datetime) -> HabitsCounts:
+    """Прежний построчный подсчёт на Python — эталон для SQL-агрегации."""
+    user_tz = get_user_timezone(user)
+    counts = HabitsCounts(
+        created_count=Task.objects.filter(
+            user=user, created_at__gte=start, created_at__lte=now
+        ).count()
+    )
+    done_tasks = Task.objects.filter(
+        user=user,
+        status=Task.Status.DONE,
+        completed_at__isnull=False,
+        completed_at__gte=start,
+        completed_at__lte=now,
+    ).prefetch_related("reminders")
+
+    for task in done_tasks:
+        counts.done_count += 1
+        completed_local = timezone.localtime(task.completed_at, user_tz)
+        counts.by_day[completed_local.weekday()] += 1
+        counts.by_hour[completed_local.hour] += 1
+
+        if task.due_at:
+            counts.due_done_count += 1
+            if task.completed_at <= task.due_at:
+                counts.on_time_count += 1
+            else:
+                counts.overdue_count += 1
+        else:
+            counts.no_due_count += 1
+
+        helped = False
+        for reminder in task.reminders.all():
+            if reminder.sent and reminder.notify_at <= task.completed_at:
+                counts.reminders_sent_before_done += 1
+                helped = True
+        if helped:
+            counts.reminder_helped_tasks += 1
+
+    return counts
+
+
+def create_random_tasks(user: User, count: int, days: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    now = timezone.now()
+    tasks: list[Task] = []
+    reminders: list[Reminder] = []
+
+    for index in range(count):
+        created_at = now - timedelta(days=rng.uniform(0, days * 1.5))
+        due_at = (
+            created_at + timedelta(hours=rng.uniform(1, 24 * 7))
+            if rng.random() < 0.7
+            else None
+        )
+        status = rng.choice(
+            [
+                Task.Status.DONE,
+                Task.Status.DONE,
+                Task.Status.PENDING,
+                Task.Status.CANCELED,
+            ]
+        )
+        completed_at = (
+            min(now, created_at + timedelta(hours=rng.uniform(0, 24 * 10)))
+            if status == Task.Status.DONE
+            else None
+        )
+        task = Task(
+            user=user,
+            title=f"Задача {index}",
+            due_at=due_at,
+            status=status,
+            completed_at=completed_at,
+        )
+        tasks.append(task)
+        for _ in range(rng.randint(0, 2)):
+            reminders.append(
+                Reminder(
+                    task=task,
+                    notify_at=created_at + timedelta(hours=rng.uniform(0, 24 * 5)),
+                    sent=rng.random() < 0.6,
+                )
+            )
+
+    Task.objects.bulk_create(tasks)
+    Reminder.objects.bulk_create(reminders)
+    for task in tasks:
+        # created_at задаётся auto_now_add, поэтому переписываем его отдельно.
+        Task.objects.filter(pk=task.pk).update(
+            created_at=now - timedelta(days=rng.uniform(0, days * 1.5))
+        )
+
+
+class HabitsReportParityTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(telegram_id=777, timezone="Asia/Tokyo")
+        create_random_tasks(self.user, count=300, days=30)
+
+    def _metrics(self, days: int) -> dict[str, Any]:
+        report = build_habits_report(self.user, days=days, use_llm=False)
+        return report.metrics
+
+    def test_sql_counts_match_reference_implementation(self) -> None:
+        for days in (7, 30, 90):
+            metrics = self._metrics(days)
+            start = datetime.fromisoformat(str(metrics["period_start"]))
+            now = datetime.fromisoformat(str(metrics["period_end"]))
+            expected = reference_habits_counts(self.user, start, now)
+
+            self.assertEqual(
+                metrics["counts"],
+                {
+                    "created": expected.created_count,
+                    "completed": expected.done_count,
+                    "completed_on_time": expected.on_time_count,
+                    "completed_overdue": expected.overdue_count,
+                    "completed_no_due": expected.no_due_count,
+                    "completed_with_reminder": expected.reminder_helped_tasks,
+                    "reminders_sent_before_done": expected.reminders_sent_before_done,
+                },
+            )
+            best_day = max(range(7), key=expected.by_day.__getitem__)
+            best_hour = max(range(24), key=expected.by_hour.__getitem__)
+            self.assertEqual(
+                metrics["patterns"],
+                {"best_day": DAY_NAMES[best_day], "best_hour": best_hour},
+            )
+
+    def test_best_slot_uses_user_timezone(self) -> None:
+        Task.objects.filter(user=self.user).delete()
+        completed_at = timezone.now() - timedelta(days=1)
+        Task.objects.create(
+            user=self.user,
+            title="Ночная задача",
+            status=Task.Status.DONE,
+            completed_at=completed_at,
+        )
+
+        metrics = self._metrics(7)
+        local = timezone.localtime(completed_at, get_user_timezone(self.user))
+        patterns: Any = metrics["patterns"]
+        self.assertEqual(patterns["best_hour"], local.hour)
+
+
+class HabitsReportBatchTests(TestCase):
+    def setUp(self) -> None:
+        timezones = ["Asia/Tokyo", "Europe/Moscow", "America/New_York", "Bad/Zone"]
+        self.users = []
+        for index in range(8):
+            user = User.objects.create_user(
+                telegram_id=900 + index, timezone=timezones[index % len(timezones)]
+            )
+            create_random_tasks(user, count=40, days=30, seed=index)
+            self.users.append(user)
+        # Пользователь без задач тоже должен получить отчёт.
+        self.users.append(User.objects.create_user(telegram_id=999))
+
+    def _assert_batch_matches_single(self) -> None:
+        now = timezone.now()
+        with mock.patch("tasks.services.habits.report.timezone.now", return_value=now):
+            batch = build_habits_reports(self.users, days=30)
+            single = [
+                build_habits_report(user, days=30, use_llm=False) for user in self.users
+            ]
+        self.assertEqual(batch, single)
+
+    def test_batch_reports_match_per_user_reports(self) -> None:
+        self._assert_batch_matches_single()
+
+    @override_settings(HABITS_USE_DAILY_STATS=True)
+    def test_batch_reports_match_per_user_reports_from_rollup(self) -> None:
+        rebuild_user_daily_stats(self.users)
+        self._assert_batch_matches_single()
@@ -0,0 +1,71 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from tasks.models import HabitsReportSnapshot
+from tasks.services.habits.cache import get_user_data_version
+from tasks.tasks import refresh_habits_snapshot
+from users.models import User
+
+
+@mock.patch("tasks.services.habits.snapshots.current_app")
+class HabitsSnapshotViewTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(telegram_id=4242)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("tasks-habits")
+
+    def _snapshot(self, **fields: object) -> HabitsReportSnapshot:
+        values: dict[str, object] = {
+            "user": self.user,
+            "days": 30,
+            "short_text": "снапшот",
+            "long_text": "снапшот подробно",
+            "metrics": {},
+            "data_version": get_user_data_version(self.user.id),
+            "generated_at": timezone.now(),
+        }
+        values.update(fields)
+        return HabitsReportSnapshot.objects.create(**values)
+
+    def test_fresh_snapshot_is_served_without_refresh(self, app: mock.Mock) -> None:
+        self._snapshot()
+
+        response = self.client.get(self.url, {"fresh": "false"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["long_text"], "снапшот подробно")
+        self.assertIn("generated_at", response.data)
+        app.send_task.assert_not_called()
+
+    def test_stale_snapshot_is_served_and_refreshed_once(self, app: mock.Mock) -> None:
+        self._snapshot(generated_at=timezone.now() - timedelta(days=1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.client.get(self.url, {"fresh": "false"})
+            self.client.get(self.url, {"fresh": "false"})
+
+        self.assertEqual(first.data["short_text"], "снапшот")
+        app.send_task.assert_called_once_with(
+            "tasks.tasks.refresh_habits_snapshot", args=[str(self.user.id), 30]
+        )
+
+    def test_missing_snapshot_falls_back_to_rule_report(self, app: mock.Mock) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(self.url, {"fresh": "false", "days": 7})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("generated_at", response.data)
+        app.send_task.assert_called_once()
+
+    def test_refresh_task_stores_snapshot(self, app: mock.Mock) -> None:
+        with self.settings(HUGGINGFACE_ENABLED=False):
+            refresh_habits_snapshot(str(self.user.id), 7)
+
+        snapshot = HabitsReportSnapshot.objects.get(user=self.user, days=7)
+        self.assertTrue(snapshot.long_text)
+        self.assertEqual(snapshot.data_version, get_user_data_version(self.user.id))
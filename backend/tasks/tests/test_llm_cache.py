@@ -0,0 +1,46 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from tasks.services.habits.llm import build_llm_prompt, call_hf_api
+
+
+def _metrics(completed: int, period_end: str) -> dict[str, object]:
+    return {
+        "period_days": 7,
+        "period_start": "2026-01-01T00:00:00+00:00",
+        "period_end": period_end,
+        "counts": {"created": 0, "completed": completed},
+    }
+
+
+@override_settings(
+    HUGGINGFACE_ENABLED=True,
+    HUGGINGFACE_API_TOKEN="token",
+    HUGGINGFACE_MODEL="test-model",
+)
+@mock.patch("tasks.services.habits.llm._request_completion")
+class LLMCompletionCacheTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_prompts_differing_only_in_period_share_completion(
+        self, request: mock.Mock
+    ) -> None:
+        request.return_value = '{"short": "ok", "long": "ok"}'
+
+        first = call_hf_api(build_llm_prompt(_metrics(0, "2026-01-08"), 7, "ru"))
+        second = call_hf_api(build_llm_prompt(_metrics(0, "2026-01-15"), 7, "ru"))
+        call_hf_api(build_llm_prompt(_metrics(3, "2026-01-15"), 7, "ru"))
+
+        self.assertEqual(first, second)
+        self.assertEqual(request.call_count, 2)
+
+    def test_failed_completion_is_not_cached(self, request: mock.Mock) -> None:
+        request.return_value = None
+        prompt = build_llm_prompt(_metrics(1, "2026-01-08"), 7, "en")
+
+        self.assertIsNone(call_hf_api(prompt))
+        request.return_value = "text"
+        self.assertEqual(call_hf_api(prompt), "text")
+        self.assertEqual(request.call_count, 2)
@@ -0,0 +1,103 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from tasks.services.habits.llm_client import complete_prompts
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    """Отвечает эхом промпта с задержкой; первый запрос на промпт получает 429."""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float) -> None:
+        super().__init__(("127.0.0.1", 0), StubLLMHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.seen: set[str] = set()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    server: StubLLMServer
+
+    def do_POST(self) -> None:
+        length = int(self.headers["Content-Length"])
+        prompt = json.loads(self.rfile.read(length))["messages"][0]["content"]
+        stub = self.server
+        with stub.lock:
+            stub.requests += 1
+            stub.in_flight += 1
+            stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+            first_attempt = prompt not in stub.seen
+            stub.seen.add(prompt)
+
+        time.sleep(stub.latency)
+        if first_attempt:
+            self._reply(429, {"error": "rate limited"}, {"Retry-After": "0"})
+        else:
+            self._reply(200, {"choices": [{"message": {"content": f"echo:{prompt}"}}]})
+
+        with stub.lock:
+            stub.in_flight -= 1
+
+    def _reply(
+        self, status: int, body: dict[str, Any], headers: dict[str, str] | None = None
+    ) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class AsyncLLMClientTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.server = StubLLMServer(latency=0.05)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        host, port = self.server.server_address[:2]
+        self.settings_override = override_settings(
+            HUGGINGFACE_ENABLED=True,
+            HUGGINGFACE_API_TOKEN="token",
+            HUGGINGFACE_MODEL="stub",
+            HUGGINGFACE_API_BASE=f"http://{host}:{port}/v1/chat/completions",
+            HUGGINGFACE_RETRIES=2,
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def test_batch_keeps_order_retries_429_and_bounds_concurrency(self) -> None:
+        prompts = [f"prompt-{i % 15}" for i in range(20)]
+
+        started = time.monotonic()
+        results = complete_prompts(prompts, concurrency=5)
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(results, [f"echo:{prompt}" for prompt in prompts])
+        # 15 уникальных промптов × (429 + успешный повтор)
+        self.assertEqual(self.server.requests, 30)
+        self.assertLessEqual(self.server.max_in_flight, 5)
+        # Последовательно это заняло бы 30 × 50 мс.
+        self.assertLess(elapsed, 30 * 0.05)
+
+    def test_cached_completions_skip_the_network(self) -> None:
+        complete_prompts(["a", "b"], concurrency=2)
+        requests_before = self.server.requests
+
+        self.assertEqual(complete_prompts(["b", "a"]), ["echo:b", "echo:a"])
+        self.assertEqual(self.server.requests, requests_before)
@@ -0,0 +1,161 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from tasks.models import Reminder, Task
+from tasks.services.reminders import (
+    create_default_reminders,
+    schedule_upcoming_reminders,
+)
+from tasks.services.scheduled import (
+    build_claim_queryset,
+    send_reminder,
+    send_task_reminders,
+)
+from users.models import User
+
+
+class SendTaskRemindersTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(telegram_id=111222333)
+        self.task = Task.objects.create(
+            user=self.user,
+            title="Подготовить доклад",
+            due_at=timezone.now() + timedelta(hours=2),
+        )
+
+    def _create_reminder(self, minutes_ago: int) -> Reminder:
+        return Reminder.objects.create(
+            task=self.task,
+            notify_at=timezone.now() - timedelta(minutes=minutes_ago),
+        )
+
+    @override_settings(REMINDER_BATCH_SIZE=2)
+    @mock.patch("tasks.services.scheduled.publish_telegram_message")
+    def test_due_reminders_are_sent_in_batches(self, publish: mock.Mock) -> None:
+        reminders = [self._create_reminder(minutes_ago) for minutes_ago in (1, 2, 3)]
+        future = Reminder.objects.create(
+            task=self.task, notify_at=timezone.now() + timedelta(hours=1)
+        )
+
+        send_task_reminders()
+
+        self.assertEqual(publish.call_count, 3)
+        self.assertEqual(
+            Reminder.objects.filter(
+                pk__in=[r.pk for r in reminders], sent=True
+            ).count(),
+            3,
+        )
+        future.refresh_from_db()
+        self.assertFalse(future.sent)
+
+    @mock.patch("tasks.services.scheduled.publish_telegram_message")
+    def test_sent_reminders_are_not_claimed_again(self, publish: mock.Mock) -> None:
+        self._create_reminder(minutes_ago=5)
+
+        send_task_reminders()
+        send_task_reminders()
+
+        self.assertEqual(publish.call_count, 1)
+
+    @mock.patch("tasks.services.scheduled.publish_telegram_message")
+    def test_reminders_of_finished_tasks_are_skipped(self, publish: mock.Mock) -> None:
+        reminder = self._create_reminder(minutes_ago=5)
+        Task.objects.filter(pk=self.task.pk).update(status=Task.Status.DONE)
+
+        send_task_reminders()
+
+        publish.assert_not_called()
+        reminder.refresh_from_db()
+        self.assertFalse(reminder.sent)
+
+
+class EtaReminderSchedulingTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(telegram_id=444555666)
+        self.task = Task.objects.create(
+            user=self.user,
+            title="Сдать лабораторную",
+            # Напоминание за час попадает в горизонт eta, за сутки — в прошлом.
+            due_at=timezone.now() + timedelta(minutes=90),
+        )
+
+    @override_settings(REMINDERS_ETA_ENABLED=True)
+    @mock.patch("tasks.services.reminders.current_app")
+    def test_created_reminders_are_enqueued_with_eta(self, app: mock.Mock) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            create_default_reminders(self.task)
+
+        reminders = list(Reminder.objects.filter(task=self.task))
+        self.assertEqual(len(reminders), 1)
+        self.assertEqual(app.send_task.call_count, len(reminders))
+        scheduled = {
+            call.kwargs["args"][0]: call.kwargs["eta"]
+            for call in app.send_task.call_args_list
+        }
+        self.assertEqual(
+            scheduled, {str(reminder.id): reminder.notify_at for reminder in reminders}
+        )
+
+    @override_settings(REMINDERS_ETA_ENABLED=True, REMINDER_ETA_HORIZON=3000)
+    @mock.patch("tasks.services.reminders.current_app")
+    def test_far_reminders_wait_for_the_sweep(self, app: mock.Mock) -> None:
+        self.task.due_at = timezone.now() + timedelta(days=3)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_default_reminders(self.task)
+
+        app.send_task.assert_not_called()
+
+        reminder = Reminder.objects.filter(task=self.task).earliest("notify_at")
+        sweep_at = reminder.notify_at - timedelta(seconds=3000 - 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            scheduled = schedule_upcoming_reminders(sweep_at, timedelta(seconds=600))
+
+        self.assertEqual(scheduled, 1)
+        app.send_task.assert_called_once_with(
+            "tasks.tasks.send_reminder", args=[str(reminder.id)], eta=reminder.notify_at
+        )
+
+    @mock.patch("tasks.services.scheduled.publish_telegram_message")
+    def test_send_reminder_marks_due_reminder_sent(self, publish: mock.Mock) -> None:
+        reminder = Reminder.objects.create(task=self.task, notify_at=timezone.now())
+
+        send_reminder(str(reminder.id))
+
+        publish.assert_called_once()
+        reminder.refresh_from_db()
+        self.assertTrue(reminder.sent)
+
+    @mock.patch("tasks.services.scheduled.publish_telegram_message")
+    def test_send_reminder_ignores_deleted_reminder(self, publish: mock.Mock) -> None:
+        reminder = Reminder.objects.create(task=self.task, notify_at=timezone.now())
+        reminder_id = str(reminder.id)
+        reminder.delete()
+
+        send_reminder(reminder_id)
+
+        publish.assert_not_called()
+
+
+class DueReminderQueryPlanTests(TestCase):
+    def setUp(self) -> None:
+        # План зависит от статистики: на пустой таблице без ANALYZE
+        # планировщик выбирает индекс по задачам или seq scan.
+        user = User.objects.create_user(telegram_id=999000111)
+        task = Task.objects.create(user=user, title="Курсовая")
+        now = timezone.now()
+        Reminder.objects.bulk_create(
+            Reminder(task=task, notify_at=now - timedelta(minutes=i), sent=i >= 20)
+            for i in range(5000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE tasks_reminder")
+
+    def test_due_scan_uses_partial_index(self) -> None:
+        plan = build_claim_queryset(timezone.now(), batch_size=100).explain()
+
+        self.assertIn("reminder_unsent_notify_at_idx", plan)
+        self.assertNotIn("Seq Scan on tasks_reminder", plan)
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+import pytz
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from tasks.api.helpers import build_task_list_queryset
+from tasks.models import Task
+from users.models import User
+from users.utils.timezone import local_days_range
+
+
+class TaskDueFilterTests(APITestCase):
+    def setUp(self) -> None:
+        # +9 к UTC и +6 к TIME_ZONE сервера: «сегодня» у них разное.
+        self.user = User.objects.create_user(telegram_id=6161, timezone="Asia/Tokyo")
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("tasks-list-create")
+        self.now = timezone.now()
+        self.today_start, self.today_end = local_days_range(
+            self.now, pytz.timezone("Asia/Tokyo")
+        )
+
+    def _task(self, title: str, due_at: object, **fields: object) -> Task:
+        task = Task.objects.create(user=self.user, title=title, **fields)
+        Task.objects.filter(pk=task.pk).update(due_at=due_at)
+        return task
+
+    def _titles(self, params: dict[str, str]) -> set[str]:
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return {task["title"] for task in response.data["results"]}
+
+    def test_today_and_week_use_user_local_days(self) -> None:
+        minute = timedelta(minutes=1)
+        self._task("вчера", self.today_start - minute)
+        self._task("утро", self.today_start)
+        self._task("ночь", self.today_end - minute)
+        self._task("завтра", self.today_end)
+        week_end = self.today_start + timedelta(days=8)
+        self._task("седьмой день", week_end - minute)
+        self._task("восьмой день", week_end)
+
+        self.assertEqual(self._titles({"filter": "today"}), {"утро", "ночь"})
+        self.assertEqual(
+            self._titles({"filter": "week"}),
+            {"утро", "ночь", "завтра", "седьмой день"},
+        )
+
+    def test_overdue_upcoming_and_explicit_range(self) -> None:
+        hour = timedelta(hours=1)
+        self._task("просрочена", self.now - hour)
+        self._task("сделана", self.now - hour, status=Task.Status.DONE)
+        self._task("впереди", self.now + hour)
+        self._task("без дедлайна", None)
+
+        self.assertEqual(self._titles({"filter": "overdue"}), {"просрочена"})
+        self.assertEqual(self._titles({"filter": "upcoming"}), {"впереди"})
+
+        local_today = self.now.astimezone(pytz.timezone("Asia/Tokyo")).date()
+        self.assertEqual(
+            self._titles(
+                {"from": (self.now - 2 * hour).isoformat(), "to": self.now.isoformat()}
+            ),
+            {"просрочена", "сделана"},
+        )
+        titles = self._titles(
+            {
+                "from": (local_today - timedelta(days=1)).isoformat(),
+                "to": (local_today + timedelta(days=1)).isoformat(),
+            }
+        )
+        self.assertLessEqual({"просрочена", "сделана"}, titles)
+        self.assertNotIn("без дедлайна", titles)
+
+    def test_time_relative_filters_have_no_etag(self) -> None:
+        self.assertNotIn("ETag", self.client.get(self.url, {"filter": "overdue"}))
+        self.assertIn("ETag", self.client.get(self.url, {"filter": "today"}))
+
+    def test_invalid_range_bound_is_rejected(self) -> None:
+        response = self.client.get(self.url, {"from": "завтра"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("from", response.data)
+
+    def test_due_filters_use_index_range_scan(self) -> None:
+        factory = APIRequestFactory()
+        for params in ({"filter": "today"}, {"filter": "week"}, {"from": "2030-01-01"}):
+            request = Request(factory.get("/", params))
+            queryset = build_task_list_queryset(request, self.user)
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                plan = queryset.explain()
+
+            self.assertIn("task_user_due_idx", plan, params)
+            self.assertRegex(plan, r"Index Cond: .*due_at >", params)
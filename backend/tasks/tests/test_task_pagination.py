@@ -0,0 +1,93 @@
+import uuid
+from datetime import timedelta
+from typing import Any
+
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from tasks.api.pagination import TaskCursorPagination, keyset_filter
+from tasks.models import Task
+from users.models import User
+
+
+class TaskCursorPaginationTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(telegram_id=3131)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("tasks-list-create")
+        now = timezone.now()
+        tasks = Task.objects.bulk_create(
+            Task(user=self.user, title=f"T{i}", due_at=now + timedelta(hours=i))
+            for i in range(25)
+        )
+        # Половина задач с одинаковым created_at: порядок решает id.
+        for index, task in enumerate(tasks):
+            created_at = now if index % 2 else now - timedelta(minutes=index)
+            Task.objects.filter(pk=task.pk).update(created_at=created_at)
+
+    def _walk(self, params: dict[str, Any]) -> list[str]:
+        ids: list[str] = []
+        response = self.client.get(self.url, {**params, "pagination": "cursor"})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            ids.extend(item["id"] for item in response.data["results"])
+            if not response.data["next"]:
+                return ids
+            if len(ids) == 5:
+                # Вставка между страницами не должна сдвигать выдачу.
+                Task.objects.create(user=self.user, title="Новая")
+            response = self.client.get(response.data["next"])
+
+    def test_cursor_pages_follow_created_at_and_id(self) -> None:
+        ids = self._walk({"limit": 5})
+
+        expected = [
+            str(pk)
+            for pk in Task.objects.filter(user=self.user)
+            .exclude(title="Новая")
+            .order_by("-created_at", "-id")
+            .values_list("pk", flat=True)
+        ]
+        self.assertEqual(ids, expected)
+
+    def test_previous_link_returns_prior_page(self) -> None:
+        first = self.client.get(self.url, {"limit": 5, "pagination": "cursor"})
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+
+        self.assertEqual(back.data["results"], first.data["results"])
+
+    def test_week_filter_pages_by_due_at(self) -> None:
+        ids = self._walk({"limit": 4, "filter": "week"})
+
+        due = list(
+            Task.objects.filter(pk__in=ids)
+            .order_by("due_at")
+            .values_list("pk", flat=True)
+        )
+        self.assertEqual(ids, [str(pk) for pk in due])
+
+    def test_default_pagination_is_unchanged(self) -> None:
+        response = self.client.get(self.url, {"limit": 5})
+
+        self.assertEqual(response.data["count"], 25)
+
+
+class TaskCursorQueryPlanTests(APITestCase):
+    def test_deep_page_uses_composite_index(self) -> None:
+        user = User.objects.create_user(telegram_id=3132)
+        ordering = TaskCursorPagination.ordering
+        position = f"{timezone.now()}|{uuid.uuid4()}"
+        queryset = (
+            Task.objects.filter(user=user)
+            .filter(keyset_filter(ordering, position))
+            .order_by(*ordering)[:21]
+        )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("task_user_created_id_idx", plan)
+        self.assertNotIn("Sort", plan)
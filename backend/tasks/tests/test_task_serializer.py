@@ -0,0 +1,58 @@
+from datetime import timedelta
+from typing import Any
+
+from courses.models import Course
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory, APITestCase
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+from topics.models import Topic
+from users.models import User
+
+
+class TaskListRenderingTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(telegram_id=4141, timezone="Asia/Tokyo")
+        course = Course.objects.create(user=self.user, title="Алгебра")
+        topics = [
+            Topic.objects.create(course=course, title=f"Тема {i}") for i in range(3)
+        ]
+        now = timezone.now()
+        Task.objects.bulk_create(
+            Task(
+                user=self.user,
+                title=f"T{i}",
+                description="Описание" if i % 2 else None,
+                topic=topics[i % 3] if i % 4 else None,
+                due_at=now + timedelta(hours=i) if i % 5 else None,
+                status=Task.Status.DONE if i % 7 == 0 else Task.Status.PENDING,
+                completed_at=now if i % 7 == 0 else None,
+            )
+            for i in range(100)
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_of_100_tasks_takes_two_queries(self) -> None:
+        # COUNT(*) для пагинации и одна выборка задач вместе с темами.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("tasks-list-create"), {"limit": 100})
+
+        self.assertEqual(len(response.data["results"]), 100)
+
+    def test_fast_renderer_matches_model_serializer(self) -> None:
+        request = APIRequestFactory().get("/")
+        request.user = self.user
+        serializer = TaskSerializer(context={"request": request})
+
+        for task in Task.objects.select_related("topic"):
+            expected: dict[str, Any] = serializers.ModelSerializer.to_representation(
+                serializer, task
+            )
+            expected["due_at"] = (
+                task.due_at.astimezone(serializer.get_user_tz()).isoformat()
+                if task.due_at
+                else None
+            )
+            self.assertEqual(serializer.to_representation(task), expected)
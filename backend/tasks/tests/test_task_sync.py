@@ -0,0 +1,121 @@
+from datetime import timedelta
+
+from courses.models import Course
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from tasks.models import Task, TaskTombstone
+from topics.models import Topic
+from users.models import User
+
+
+class TaskListETagTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(telegram_id=5151)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("tasks-list-create")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task = Task.objects.create(user=self.user, title="Конспект")
+
+    def test_unchanged_list_returns_304_without_queries(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertIn("X-Changes-Since", response)
+
+    def test_change_or_other_filter_invalidates_etag(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+
+        other = self.client.get(self.url, {"filter": "today"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(other.status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                reverse("tasks-detail", args=[self.task.id]),
+                {"status": "done"},
+                format="json",
+            )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["status"], "done")
+
+    def test_timezone_change_invalidates_etag(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+
+        self.user.timezone = "Asia/Tokyo"
+        self.user.save(update_fields=["timezone"])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class TaskChangesTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(telegram_id=5252)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("tasks-changes")
+        course = Course.objects.create(user=self.user, title="Физика")
+        self.topic = Topic.objects.create(course=course, title="Механика")
+        self.kept = Task.objects.create(user=self.user, title="Старая")
+        self.updated = Task.objects.create(user=self.user, title="Изменится")
+        self.removed = Task.objects.create(user=self.user, title="Удалится")
+        self.in_topic = Task.objects.create(
+            user=self.user, title="По теме", topic=self.topic
+        )
+        self.since = timezone.now()
+
+    def _changes(self) -> dict:
+        response = self.client.get(self.url, {"changed_since": self.since.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_delta_contains_created_updated_and_deleted(self) -> None:
+        self.updated.title = "Изменилась"
+        self.updated.save()
+        self.client.delete(reverse("tasks-detail", args=[self.removed.id]))
+        created = Task.objects.create(user=self.user, title="Новая")
+
+        data = self._changes()
+
+        self.assertEqual(
+            [task["id"] for task in data["changed"]],
+            [str(self.updated.id), str(created.id)],
+        )
+        self.assertEqual(data["changed"][0]["title"], "Изменилась")
+        self.assertEqual(data["deleted"], [str(self.removed.id)])
+        self.assertLessEqual(data["next_since"], timezone.now().isoformat())
+
+    def test_topic_rename_and_delete_mark_tasks_changed(self) -> None:
+        self.topic.title = "Кинематика"
+        self.topic.save()
+
+        self.assertEqual(
+            [t["id"] for t in self._changes()["changed"]], [str(self.in_topic.id)]
+        )
+        self.assertEqual(self._changes()["changed"][0]["topic"]["title"], "Кинематика")
+
+        self.topic.recalc_progress()
+        self.since = timezone.now()
+        self.assertEqual(self._changes()["changed"], [])
+
+        self.topic.delete()
+        self.assertEqual(self._changes()["changed"][0]["topic"], None)
+
+    def test_user_deletion_leaves_no_tombstones(self) -> None:
+        self.user.delete()
+
+        self.assertFalse(TaskTombstone.objects.exists())
+
+    def test_invalid_or_expired_changed_since(self) -> None:
+        self.assertEqual(
+            self.client.get(self.url, {"changed_since": "вчера"}).status_code, 400
+        )
+        expired = timezone.now() - timedelta(days=31)
+        response = self.client.get(self.url, {"changed_since": expired.isoformat()})
+        self.assertEqual(response.status_code, 410)
@@ -0,0 +1,79 @@
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import SimpleTestCase
+from django.utils import timezone
+from redis import RedisError
+from tasks.services.dispatcher import HierarchicalTimingWheel
+
+COMMAND = "tasks.management.commands.run_reminder_dispatcher"
+
+
+class HierarchicalTimingWheelTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.wheel: HierarchicalTimingWheel[str] = HierarchicalTimingWheel(start=0.0)
+
+    def test_timer_fires_in_its_second(self) -> None:
+        self.wheel.schedule("a", 5.4)
+
+        self.assertEqual(self.wheel.advance(4.9), [])
+        self.assertEqual(self.wheel.advance(5.0), ["a"])
+        self.assertEqual(len(self.wheel), 0)
+
+    def test_timers_cascade_from_upper_levels(self) -> None:
+        self.wheel.schedule("hour", 3600.0)
+        self.wheel.schedule("day", 86_400.0 + 61)
+
+        self.assertEqual(self.wheel.advance(3599.0), [])
+        self.assertEqual(self.wheel.advance(3600.0), ["hour"])
+        self.assertEqual(self.wheel.advance(86_400.0 + 60), [])
+        self.assertEqual(self.wheel.advance(86_400.0 + 61), ["day"])
+
+    def test_cancel_and_reschedule(self) -> None:
+        self.wheel.schedule("cancelled", 10.0)
+        self.wheel.schedule("moved", 10.0)
+        self.wheel.cancel("cancelled")
+        self.wheel.schedule("moved", 200.0)
+
+        self.assertEqual(self.wheel.advance(100.0), [])
+        self.assertEqual(self.wheel.advance(200.0), ["moved"])
+
+    def test_overdue_timer_fires_on_next_advance(self) -> None:
+        self.wheel.advance(50.0)
+        self.wheel.schedule("late", 10.0)
+
+        self.assertEqual(self.wheel.advance(50.0), ["late"])
+
+    def test_rejects_timers_beyond_range(self) -> None:
+        self.assertFalse(self.wheel.schedule("far", self.wheel.max_delay + 1))
+        self.assertNotIn("far", self.wheel)
+
+
+class _Stop(Exception):
+    pass
+
+
+class ReminderDispatcherCommandTests(SimpleTestCase):
+    @mock.patch(f"{COMMAND}.close_old_connections")
+    @mock.patch(f"{COMMAND}.time.sleep")
+    @mock.patch(f"{COMMAND}.Command._load_window")
+    @mock.patch(f"{COMMAND}.get_last_event_id", return_value="0-0")
+    @mock.patch(f"{COMMAND}.read_reminder_events")
+    def test_backs_off_on_redis_and_db_errors(
+        self,
+        read_events: mock.Mock,
+        last_event_id: mock.Mock,
+        load_window: mock.Mock,
+        sleep: mock.Mock,
+        close_connections: mock.Mock,
+    ) -> None:
+        load_window.side_effect = [DatabaseError("gone"), timezone.now()]
+        read_events.side_effect = [RedisError("down"), RedisError("down"), _Stop]
+
+        with self.assertRaises(_Stop):
+            call_command("run_reminder_dispatcher")
+
+        self.assertEqual(load_window.call_count, 2)
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [1.0, 1.0, 2.0])
+        self.assertGreaterEqual(close_connections.call_count, 5)
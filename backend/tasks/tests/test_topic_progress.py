@@ -0,0 +1,192 @@
+from io import StringIO
+
+from courses.models import Course
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from tasks.models import Task
+from topics import progress
+from topics.models import Topic
+from users.models import User
+
+
+class TopicProgressTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(telegram_id=7171)
+        course = Course.objects.create(user=self.user, title="Химия")
+        self.topic = Topic.objects.create(course=course, title="Кислоты")
+        self.other = Topic.objects.create(course=course, title="Соли")
+        statuses = [Task.Status.DONE, Task.Status.PENDING, Task.Status.CANCELED]
+        Task.objects.bulk_create(
+            Task(user=self.user, title=status, status=status, topic=self.topic)
+            for status in statuses
+        )
+
+    def test_single_aggregate_ignores_canceled_tasks(self) -> None:
+        with self.assertNumQueries(2):
+            self.topic.recalc_progress()
+
+        self.assertEqual(self.topic.progress, 50)
+
+    def test_bulk_recalc_touches_each_topic_once(self) -> None:
+        # bulk_create обходит сигналы: счётчики догоняет пересчёт
+        with self.assertNumQueries(4):
+            changed = progress.recalc_topics_progress([self.topic.pk, self.other.pk])
+
+        self.assertEqual(changed, 1)
+        self.topic.refresh_from_db()
+        self.topic.course.refresh_from_db()
+        self.assertEqual(self.topic.progress, 50)
+        self.assertEqual(
+            (self.topic.course.total_count, self.topic.course.counters_progress),
+            (3, 50),
+        )
+
+    def test_reconcile_command_fixes_drift(self) -> None:
+        Topic.objects.filter(pk=self.other.pk).update(total_count=5, progress=40)
+        out = StringIO()
+
+        call_command("reconcile_task_counters", stdout=out)
+
+        self.assertIn("Reconciled 2 topics, 1 courses", out.getvalue())
+        self.other.refresh_from_db()
+        self.assertEqual((self.other.total_count, self.other.progress), (0, 0))
+        self.assertEqual(progress.reconcile_task_counters(), (0, 0))
+
+
+class TaskCountersTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(telegram_id=7373)
+        self.course = Course.objects.create(user=self.user, title="Физика")
+        self.topic = Topic.objects.create(course=self.course, title="Оптика")
+        self.other = Topic.objects.create(course=self.course, title="Механика")
+
+    def assertCountersMatchReconcile(self) -> None:
+        self.assertEqual(progress.reconcile_task_counters(), (0, 0))
+
+    def test_counters_follow_task_lifecycle(self) -> None:
+        task = Task.objects.create(user=self.user, title="Линзы", topic=self.topic)
+        Task.objects.create(user=self.user, title="Призмы", topic=self.topic)
+
+        # Смена статуса — блокировка строки задачи, её UPDATE и по одному
+        # UPDATE темы и курса, без пересчёта.
+        task.status = Task.Status.DONE
+        with self.assertNumQueries(4):
+            task.save(update_fields=["status"])
+
+        self.topic.refresh_from_db()
+        self.assertEqual(
+            (self.topic.total_count, self.topic.done_count, self.topic.progress),
+            (2, 1, 50),
+        )
+        self.assertCountersMatchReconcile()
+
+        task.topic = self.other
+        task.save()
+        Task.objects.filter(title="Призмы").get().delete()
+
+        self.topic.refresh_from_db()
+        self.other.refresh_from_db()
+        self.course.refresh_from_db()
+        self.assertEqual((self.topic.total_count, self.topic.progress), (0, 0))
+        self.assertEqual((self.other.done_count, self.other.progress), (1, 100))
+        self.assertEqual((self.course.total_count, self.course.done_count), (1, 1))
+        self.assertCountersMatchReconcile()
+
+    def test_moving_topic_moves_course_counters(self) -> None:
+        Task.objects.create(
+            user=self.user, title="Линзы", topic=self.topic, status=Task.Status.CANCELED
+        )
+        target = Course.objects.create(user=self.user, title="Астрономия")
+        topic = Topic.objects.get(pk=self.topic.pk)
+
+        topic.course = target
+        topic.save()
+
+        self.course.refresh_from_db()
+        target.refresh_from_db()
+        self.assertEqual((self.course.total_count, target.cancelled_count), (0, 1))
+        self.assertCountersMatchReconcile()
+
+        topic.delete()
+        target.refresh_from_db()
+        self.assertEqual((target.total_count, target.cancelled_count), (0, 0))
+        self.assertCountersMatchReconcile()
+
+    def test_stale_task_instances_do_not_apply_change_twice(self) -> None:
+        task = Task.objects.create(user=self.user, title="Линзы", topic=self.topic)
+        first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+
+        first.status = Task.Status.DONE
+        first.save()
+        # second загружен до первого сохранения и видит старый статус.
+        second.status = Task.Status.DONE
+        second.topic = self.other
+        second.save()
+
+        self.other.refresh_from_db()
+        self.assertEqual((self.other.total_count, self.other.done_count), (1, 1))
+        self.assertCountersMatchReconcile()
+
+        first.delete()
+        second.delete()
+
+        self.course.refresh_from_db()
+        self.assertEqual((self.course.total_count, self.course.done_count), (0, 0))
+        self.assertCountersMatchReconcile()
+
+    def test_raw_save_moves_counters_from_stored_topic(self) -> None:
+        task = Task.objects.create(user=self.user, title="Линзы", topic=self.topic)
+
+        # Так сохраняет loaddata: новый объект поверх существующей строки.
+        Task(
+            pk=task.pk,
+            user=self.user,
+            title="Линзы",
+            topic=self.other,
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+        ).save_base(raw=True)
+
+        self.topic.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual((self.topic.total_count, self.other.total_count), (0, 1))
+        self.assertCountersMatchReconcile()
+
+    def test_deleting_stale_topic_removes_current_counters(self) -> None:
+        topic = Topic.objects.get(pk=self.topic.pk)
+        Task.objects.create(user=self.user, title="Линзы", topic=self.topic)
+
+        topic.delete()
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.total_count, 0)
+        self.assertCountersMatchReconcile()
+
+
+class TaskMoveProgressTests(APITestCase):
+    def test_moving_task_recalculates_both_topics(self) -> None:
+        user = User.objects.create_user(telegram_id=7272)
+        course = Course.objects.create(user=user, title="История")
+        source = Topic.objects.create(course=course, title="Рим")
+        target = Topic.objects.create(course=course, title="Греция")
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(
+                user=user, title="Доклад", topic=source, status=Task.Status.DONE
+            )
+        source.refresh_from_db()
+        self.assertEqual(source.progress, 100)
+
+        self.client.force_authenticate(user=user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse("tasks-detail", args=[task.id]),
+                {"topic_id": str(target.id)},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        source.refresh_from_db()
+        target.refresh_from_db()
+        self.assertEqual((source.progress, target.progress), (0, 100))
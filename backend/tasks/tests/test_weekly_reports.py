@@ -0,0 +1,63 @@
+from datetime import timedelta
+from typing import Any
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from tasks.services.habits.progress import get_weekly_run_progress
+from tasks.tasks import send_habits_reports_chunk, send_weekly_habits_reports
+from users.models import User
+
+
+@override_settings(HABITS_REPORT_CHUNK_SIZE=2, HUGGINGFACE_USE_LLM_WEEKLY=False)
+@mock.patch("tasks.services.scheduled.publish_telegram_message")
+class WeeklyHabitsReportsTests(TestCase):
+    def setUp(self) -> None:
+        for index in range(5):
+            User.objects.create_user(telegram_id=1000 + index)
+        User.objects.create_user(
+            telegram_id=2000, last_habits_report_at=timezone.now() - timedelta(days=1)
+        )
+
+    def _dispatch(self) -> tuple[str, list[Any]]:
+        with mock.patch("tasks.services.scheduled.group") as group:
+            run_id = send_weekly_habits_reports()
+        return run_id, list(group.call_args.args[0])
+
+    def test_coordinator_shards_users_into_chunk_tasks(
+        self, publish: mock.Mock
+    ) -> None:
+        run_id, signatures = self._dispatch()
+
+        self.assertEqual([len(sig.args[0]) for sig in signatures], [2, 2, 1])
+        for signature in signatures:
+            send_habits_reports_chunk(*signature.args)
+
+        self.assertEqual(publish.call_count, 10)
+        self.assertFalse(
+            User.objects.filter(
+                telegram_id__lt=2000, last_habits_report_at__isnull=True
+            ).exists()
+        )
+        progress = get_weekly_run_progress(run_id)
+        self.assertEqual(progress, get_weekly_run_progress())
+        self.assertEqual(
+            progress,
+            {
+                "run_id": run_id,
+                "users_total": 5,
+                "chunks_total": 3,
+                "users_done": 5,
+                "chunks_done": 3,
+            },
+        )
+
+    def test_retried_chunk_skips_already_reported_users(
+        self, publish: mock.Mock
+    ) -> None:
+        _, signatures = self._dispatch()
+
+        send_habits_reports_chunk(*signatures[0].args)
+        send_habits_reports_chunk(*signatures[0].args)
+
+        self.assertEqual(publish.call_count, 4)
@@ -1,8 +1,14 @@
 from django.urls import path
-from .views import TaskListCreateView, TaskDetailView, HabitsReportView
+from .views import (
+    TaskChangesView,
+    TaskListCreateView,
+    TaskDetailView,
+    HabitsReportView,
+)
 
 urlpatterns = [
     path("", TaskListCreateView.as_view(), name="tasks-list-create"),
+    path("changes/", TaskChangesView.as_view(), name="tasks-changes"),
     path("<uuid:pk>/", TaskDetailView.as_view(), name="tasks-detail"),
     path("habits/", HabitsReportView.as_view(), name="tasks-habits"),
 ]
@@ -1,8 +1,13 @@
+from datetime import tzinfo
 from typing import Any, cast
 
+from django.db import transaction
 from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import generics, permissions
+from rest_framework.pagination import BasePagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
@@ -10,21 +15,50 @@ from rest_framework.views import APIView
 
 from .models import Task
 from .permissions import IsOwner
-from .serializers import HabitsReportSerializer, TaskSerializer
-from .services.habits import build_habits_report
+from .serializers import (
+    USER_TZ_CONTEXT_KEY,
+    HabitsReportSerializer,
+    TaskSerializer,
+    render_task,
+)
+from .services.habits import get_cached_habits_report
+from .services.sync import (
+    CHANGES_SINCE_HEADER,
+    build_task_list_etag,
+    changes_mark,
+    collect_task_changes,
+    is_changed_since_expired,
+)
+from .services.habits.snapshots import (
+    get_habits_snapshot,
+    is_snapshot_stale,
+    request_snapshot_refresh,
+)
 from .api.helpers import (
     TaskUserMixin,
     build_task_list_queryset,
+    canonical_query,
+    etag_matches,
     handle_created_task,
     handle_deleted_task,
     handle_updated_task,
+    is_time_relative_request,
     log_retrieved_task,
+    parse_changed_since,
+    parse_fresh_flag,
     parse_habits_days,
     serialize_habits_report,
+    serialize_habits_snapshot,
     snapshot_task_fields,
 )
-from .api.schema import HABITS_REPORT_PARAMETERS, TASK_LIST_PARAMETERS
+from .api.pagination import select_task_paginator
+from .api.schema import (
+    HABITS_REPORT_PARAMETERS,
+    TASK_CHANGES_PARAMETERS,
+    TASK_LIST_PARAMETERS,
+)
 from users.models import User
+from users.utils.timezone import get_user_timezone
 
 
 @extend_schema_view(
@@ -45,9 +79,50 @@ class TaskListCreateView(TaskUserMixin, generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     queryset = Task.objects.none()
 
-    def get_queryset(self) -> QuerySet[Any]:
-        return build_task_list_queryset(self.get_request(), self.get_user())
+    @property
+    def paginator(self) -> BasePagination | None:
+        if not hasattr(self, "_paginator"):
+            self._paginator = select_task_paginator(self.get_request())
+        return self._paginator
 
+    def get_queryset(self) -> QuerySet[Any]:
+        return build_task_list_queryset(
+            self.get_request(), self.get_user(), self.get_user_tz()
+        )
+
+    def get_serializer_context(self) -> dict[str, Any]:
+        context = super().get_serializer_context()
+        context[USER_TZ_CONTEXT_KEY] = self.get_user_tz()
+        return context
+
+    def get_user_tz(self) -> tzinfo:
+        if not hasattr(self, "_user_tz"):
+            self._user_tz = get_user_timezone(self.get_user())
+        return self._user_tz
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Условный GET: при совпадении If-None-Match — 304 без выборки и рендера.
+        X-Changes-Since — отметка для последующей дельта-синхронизации.
+        Для overdue/upcoming ETag не выдаётся: их состав меняется со временем.
+        """
+        mark = changes_mark()
+        etag = None
+        if not is_time_relative_request(request):
+            etag = build_task_list_etag(
+                self.get_user(), canonical_query(request), self.get_user_tz()
+            )
+        if etag is not None and etag_matches(request, etag):
+            response = Response(status=304)
+        else:
+            response = super().list(request, *args, **kwargs)
+        if etag is not None:
+            response["ETag"] = etag
+        response[CHANGES_SINCE_HEADER] = mark.isoformat()
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    @transaction.atomic
     def perform_create(self, serializer: BaseSerializer) -> None:
         user = self.get_user()
         task = serializer.save(user=user)
@@ -60,7 +135,14 @@ class TaskDetailView(TaskUserMixin, generics.RetrieveUpdateDestroyAPIView):
 
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwner]
-    queryset = Task.objects.all()
+    queryset = Task.objects.select_related("topic")
+
+    def get_object(self) -> Task:
+        task = cast(Task, super().get_object())
+        # IsOwner проверил владельца: подставляем пользователя запроса (снапшот
+        # из кэша), чтобы task.user в обработчиках не делал SELECT.
+        task.user = self.get_user()
+        return task
 
     def retrieve(
         self, request: Request, *args: Any, **kwargs: dict[str, Any]
@@ -69,16 +151,55 @@ class TaskDetailView(TaskUserMixin, generics.RetrieveUpdateDestroyAPIView):
         log_retrieved_task(task, self.get_user().id)
         return super().retrieve(request, *args, **kwargs)
 
+    # Атомарно: задача, её напоминания и счётчики темы меняются вместе.
+    @transaction.atomic
     def perform_update(self, serializer: BaseSerializer) -> None:
         task = self.get_object()
         old_data = snapshot_task_fields(task, serializer.validated_data)
         updated_task = serializer.save()
         handle_updated_task(updated_task, old_data)
 
+    @transaction.atomic
     def perform_destroy(self, instance: Task) -> None:
         handle_deleted_task(instance)
 
 
+@extend_schema(
+    tags=["Tasks"],
+    summary="Изменения задач",
+    description=(
+        "Задачи, созданные или изменённые после changed_since, и id удалённых. "
+        "Следующий запрос делается с changed_since=next_since."
+    ),
+    parameters=TASK_CHANGES_PARAMETERS,
+)
+class TaskChangesView(TaskUserMixin, APIView):
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request: Request, *args: Any, **kwargs: dict[str, Any]) -> Response:
+        since = parse_changed_since(request)
+        if isinstance(since, Response):
+            return since
+
+        now = timezone.now()
+        if is_changed_since_expired(since, now):
+            return Response(
+                {"detail": "changed_since is too old, fetch the full list"},
+                status=410,
+            )
+
+        user = self.get_user()
+        changes = collect_task_changes(user, since, now)
+        user_tz = get_user_timezone(user)
+        return Response(
+            {
+                "changed": [render_task(task, user_tz) for task in changes["changed"]],
+                "deleted": changes["deleted"],
+                "next_since": changes["next_since"].isoformat(),
+            }
+        )
+
+
 @extend_schema(
     tags=["Habits"],
     summary="Отчет по привычкам",
@@ -95,5 +216,23 @@ class HabitsReportView(APIView):
         if isinstance(days, Response):
             return days
 
-        report = build_habits_report(cast(User, request.user), days=days, use_llm=True)
+        user = cast(User, request.user)
+        if not parse_fresh_flag(request):
+            return self._snapshot_response(user, days)
+
+        report = get_cached_habits_report(user, days=days, use_llm=True)
+        return Response(serialize_habits_report(report))
+
+    def _snapshot_response(self, user: User, days: int) -> Response:
+        """
+        stale-while-revalidate: отдаём готовый снапшот сразу, а устаревший
+        пересчитываем в фоне. Без снапшота — отчёт по правилам, без LLM.
+        """
+        snapshot = get_habits_snapshot(user, days)
+        if snapshot is None or is_snapshot_stale(snapshot):
+            request_snapshot_refresh(user.id, days)
+        if snapshot is not None:
+            return Response(serialize_habits_snapshot(snapshot))
+
+        report = get_cached_habits_report(user, days=days, use_llm=False)
         return Response(serialize_habits_report(report))
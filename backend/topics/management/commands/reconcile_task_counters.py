@@ -0,0 +1,27 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from topics.progress import reconcile_task_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Сверяет денормализованные счётчики задач тем и курсов с таблицей задач. "
+        "Нужен после массовых операций в обход сигналов (bulk_create, update())."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Сколько тем/курсов сверять одним запросом.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        topics_fixed, courses_fixed = reconcile_task_counters(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled {topics_fixed} topics, {courses_fixed} courses"
+            )
+        )
@@ -0,0 +1,63 @@
+from typing import Any
+
+from django.db import migrations
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+
+
+def _count(tasks: Any, link: str, status: str | None = None) -> Coalesce:
+    filtered = tasks.filter(**{link: OuterRef("pk")})
+    if status is not None:
+        filtered = filtered.filter(status=status)
+    subquery = (
+        filtered.order_by().values(link).annotate(count=Count("pk")).values("count")
+    )
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+
+def _counters(tasks: Any, link: str) -> dict[str, Coalesce]:
+    return {
+        "total_count": _count(tasks, link),
+        "done_count": _count(tasks, link, "done"),
+        "cancelled_count": _count(tasks, link, "canceled"),
+    }
+
+
+def backfill_task_counters(apps: Any, schema_editor: Any) -> None:
+    Task = apps.get_model("tasks", "Task")
+    Topic = apps.get_model("topics", "Topic")
+    Course = apps.get_model("courses", "Course")
+
+    Topic.objects.update(**_counters(Task.objects, "topic"))
+    Topic.objects.update(
+        progress=Case(
+            When(
+                Q(total_count__gt=F("cancelled_count")),
+                then=F("done_count") * 100 / (F("total_count") - F("cancelled_count")),
+            ),
+            default=Value(0),
+        )
+    )
+    Course.objects.update(**_counters(Task.objects, "topic__course"))
+
+
+class Migration(migrations.Migration):
+    dependencies = (
+        ("topics", "0002_topic_task_counters"),
+        ("courses", "0002_course_task_counters"),
+        ("tasks", "0011_task_user_due_idx"),
+    )
+
+    operations = (
+        migrations.RunPython(backfill_task_counters, migrations.RunPython.noop),
+    )
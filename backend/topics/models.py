@@ -1,14 +1,52 @@
 import uuid
 from django.db import models
-from courses.models import Course
-from typing import TYPE_CHECKING, ClassVar
+from django.db.models import Case, Count, F, Q, Value, When
+from django.db.models.expressions import Combinable
+from django.db.models.lookups import GreaterThan
+from courses.models import Course, TaskCounters
+from typing import TYPE_CHECKING, Any, ClassVar
 
 if TYPE_CHECKING:
     from tasks.models import Task
     from django.db.models.manager import Manager
 
 
-class Topic(models.Model):
+# Значения Task.Status (импорт tasks.models отсюда был бы циклическим)
+TASK_STATUS_DONE = "done"
+TASK_STATUS_CANCELED = "canceled"
+
+
+def progress_counts(relation: str = "") -> dict[str, Count]:
+    """
+    Условные агрегаты для прогресса: всего, отменённых и выполненных задач.
+    relation — путь к задачам ("tasks" для аннотации Topic, "" для self.tasks).
+    """
+    prefix = f"{relation}__" if relation else ""
+    key = relation or "pk"
+    return {
+        "total_tasks": Count(key),
+        "cancelled_tasks": Count(
+            key, filter=Q(**{f"{prefix}status": TASK_STATUS_CANCELED})
+        ),
+        "done_tasks": Count(key, filter=Q(**{f"{prefix}status": TASK_STATUS_DONE})),
+    }
+
+
+# Поля, которые пишет пересчёт: их сохранение не меняет задачи в списках.
+TOPIC_COUNTER_FIELDS = ["total_count", "done_count", "cancelled_count", "progress"]
+
+
+def progress_expression(total: Any, cancelled: Any, done: Any) -> Case:
+    """То же, что progress_percent, но SQL-выражением для UPDATE ... SET progress."""
+    active: Combinable = total - cancelled
+    return Case(
+        When(GreaterThan(active, 0), then=done * 100 / active),
+        default=Value(0),
+        output_field=models.PositiveSmallIntegerField(),
+    )
+
+
+class Topic(TaskCounters):
     id: ClassVar[models.UUIDField] = models.UUIDField(
         primary_key=True, default=uuid.uuid4, editable=False
     )
@@ -22,6 +60,8 @@ class Topic(models.Model):
         models.PositiveSmallIntegerField(default=0)
     )
 
+    saved_course_id: Any = None
+
     class Meta:
         ordering = ["title"]
 
@@ -29,15 +69,32 @@ class Topic(models.Model):
         return f"{self.title} ({self.progress}%)"
 
     def recalc_progress(self) -> None:
+        """Пересчёт счётчиков и прогресса по задачам (сверка, не горячий путь)."""
         tasks: "Manager[Task]" = self.tasks  # type: ignore[attr-defined]
 
-        total = tasks.count() - tasks.filter(status="cancelled").count()
+        counts = tasks.aggregate(**progress_counts())
+        self.total_count = counts["total_tasks"]  # type: ignore
+        self.cancelled_count = counts["cancelled_tasks"]  # type: ignore
+        self.done_count = counts["done_tasks"]  # type: ignore
+        self.progress = self.counters_progress  # type: ignore
+        self.save(update_fields=TOPIC_COUNTER_FIELDS)
+
+    @classmethod
+    def from_db(cls, db: Any, field_names: Any, values: Any) -> "Topic":
+        instance = super().from_db(db, field_names, values)
+        # Курс на момент загрузки: при переносе темы счётчики переезжают с ней.
+        instance.saved_course_id = instance.__dict__.get("course_id")
+        return instance
 
-        if total == 0:
-            self.progress = 0  # type: ignore
-            self.save(update_fields=["progress"])
-            return
 
-        done = tasks.filter(status="done").count()
-        self.progress = int(done / total * 100)  # type: ignore
-        self.save(update_fields=["progress"])
+def topic_counter_update(total: int, cancelled: int, done: int) -> dict[str, Any]:
+    """Аргументы Topic.objects.update(): сдвиг счётчиков и прогресс по новым значениям."""
+    new_total = F("total_count") + total
+    new_cancelled = F("cancelled_count") + cancelled
+    new_done = F("done_count") + done
+    return {
+        "total_count": new_total,
+        "cancelled_count": new_cancelled,
+        "done_count": new_done,
+        "progress": progress_expression(new_total, new_cancelled, new_done),
+    }
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from courses.models import COUNTER_FIELDS, Course, progress_percent
+from django.db import transaction
+from django.db.models import F, QuerySet
+
+from .models import (
+    TASK_STATUS_CANCELED,
+    TASK_STATUS_DONE,
+    TOPIC_COUNTER_FIELDS,
+    Topic,
+    progress_counts,
+    topic_counter_update,
+)
+
+logger = logging.getLogger(__name__)
+
+# (topic_id, status) задачи; None — задачи нет (до создания или после удаления)
+TaskState = tuple[Any, str] | None
+
+
+def record_task_state_change(old: TaskState, new: TaskState) -> None:
+    """
+    Сдвигает счётчики тем и их курсов F()-обновлениями при создании,
+    смене статуса, переносе в другую тему и удалении задачи.
+    """
+    deltas: dict[Any, list[int]] = {}
+    for state, sign in ((old, -1), (new, 1)):
+        if state is None or state[0] is None:
+            continue
+        topic_id, status = state
+        delta = deltas.setdefault(topic_id, [0, 0, 0])
+        delta[0] += sign
+        delta[1] += sign * (status == TASK_STATUS_CANCELED)
+        delta[2] += sign * (status == TASK_STATUS_DONE)
+
+    for topic_id, (total, cancelled, done) in deltas.items():
+        if total or cancelled or done:
+            Topic.objects.filter(pk=topic_id).update(
+                **topic_counter_update(total, cancelled, done)
+            )
+            _shift_course_counters(
+                Course.objects.filter(topics__pk=topic_id), total, cancelled, done
+            )
+
+
+def move_topic_counters(topic: Topic, old_course_id: Any, new_course_id: Any) -> None:
+    """
+    Перенос счётчиков темы между курсами (new_course_id=None — тема удалена).
+    Счётчики перечитываются под блокировкой строки: задачи меняют их
+    F()-обновлениями в обход экземпляра, и его значения могут устареть.
+    """
+    with transaction.atomic():
+        topic.refresh_from_db(
+            fields=COUNTER_FIELDS, from_queryset=Topic.objects.select_for_update()
+        )
+        total, cancelled, done = (
+            topic.total_count,
+            topic.cancelled_count,
+            topic.done_count,
+        )
+        if not (total or cancelled or done):
+            return
+        if old_course_id is not None:
+            _shift_course_counters(
+                Course.objects.filter(pk=old_course_id), -total, -cancelled, -done
+            )
+        if new_course_id is not None:
+            _shift_course_counters(
+                Course.objects.filter(pk=new_course_id), total, cancelled, done
+            )
+
+
+def _shift_course_counters(
+    courses: QuerySet[Course], total: int, cancelled: int, done: int
+) -> None:
+    courses.update(
+        total_count=F("total_count") + total,
+        cancelled_count=F("cancelled_count") + cancelled,
+        done_count=F("done_count") + done,
+    )
+
+
+def recalc_topics_progress(topic_ids: Iterable[Any]) -> int:
+    """
+    Пересчитывает счётчики и прогресс тем (и их курсов) по задачам:
+    агрегирующий запрос и bulk_update только для разошедшихся. Путь для
+    массовых операций, которые обходят сигналы (bulk_create, update()).
+    """
+    ids = {topic_id for topic_id in topic_ids if topic_id is not None}
+    if not ids:
+        return 0
+    topics = Topic.objects.filter(pk__in=ids)
+    changed = _reconcile_topics(topics)
+    if changed:
+        _reconcile_courses(Course.objects.filter(pk__in=topics.values("course_id")))
+    return changed
+
+
+def reconcile_task_counters(batch_size: int = 1000) -> tuple[int, int]:
+    """Сверяет счётчики всех тем и курсов с задачами. Возвращает (темы, курсы)."""
+    topics_fixed = sum(
+        _reconcile_topics(Topic.objects.filter(pk__in=chunk))
+        for chunk in _chunked_ids(Topic.objects.all(), batch_size)
+    )
+    courses_fixed = sum(
+        _reconcile_courses(Course.objects.filter(pk__in=chunk))
+        for chunk in _chunked_ids(Course.objects.all(), batch_size)
+    )
+    logger.info(
+        "Task counters reconciled",
+        extra={"topics_fixed": topics_fixed, "courses_fixed": courses_fixed},
+    )
+    return topics_fixed, courses_fixed
+
+
+def _reconcile_topics(topics: QuerySet[Topic]) -> int:
+    changed = []
+    for topic in topics.annotate(**progress_counts("tasks")):
+        counters_changed = _set_counters(
+            topic, topic.total_tasks, topic.cancelled_tasks, topic.done_tasks
+        )
+        progress = progress_percent(
+            topic.total_count, topic.cancelled_count, topic.done_count
+        )
+        if counters_changed or topic.progress != progress:
+            topic.progress = progress
+            changed.append(topic)
+    if changed:
+        Topic.objects.bulk_update(changed, TOPIC_COUNTER_FIELDS)
+    return len(changed)
+
+
+def _reconcile_courses(courses: QuerySet[Course]) -> int:
+    changed = [
+        course
+        for course in courses.annotate(**progress_counts("topics__tasks"))
+        if _set_counters(
+            course, course.total_tasks, course.cancelled_tasks, course.done_tasks
+        )
+    ]
+    if changed:
+        Course.objects.bulk_update(changed, COUNTER_FIELDS)
+    return len(changed)
+
+
+def _set_counters(obj: Any, total: int, cancelled: int, done: int) -> bool:
+    current = (obj.total_count, obj.cancelled_count, obj.done_count)
+    if current == (total, cancelled, done):
+        return False
+    obj.total_count, obj.cancelled_count, obj.done_count = total, cancelled, done
+    return True
+
+
+def _chunked_ids(queryset: QuerySet[Any], size: int) -> Iterator[list[Any]]:
+    ids = queryset.order_by("pk").values_list("pk", flat=True)
+    chunk: list[Any] = []
+    for pk in ids.iterator(chunk_size=size):
+        chunk.append(pk)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
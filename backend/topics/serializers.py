@@ -7,7 +7,17 @@ class TopicSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Topic
-        fields = ("id", "course", "course_name", "title", "progress")
+        fields = (
+            "id",
+            "course",
+            "course_name",
+            "title",
+            "progress",
+            "total_count",
+            "done_count",
+            "cancelled_count",
+        )
+        read_only_fields = ("total_count", "done_count", "cancelled_count")
 
     def validate_progress(self, value: int) -> int:
         if not 0 <= value <= 100:
@@ -18,7 +18,9 @@ class TopicListCreateView(generics.ListCreateAPIView):
     def get_queryset(self) -> QuerySet[Any]:
         if getattr(self, "swagger_fake_view", False):
             return Topic.objects.none()
-        queryset = Topic.objects.filter(course__user=self.request.user)
+        queryset = Topic.objects.filter(course__user=self.request.user).select_related(
+            "course"
+        )
 
         course_id = self.request.query_params.get("course")
         if course_id:
@@ -0,0 +1,36 @@
+from typing import Any
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from .services.snapshots import get_user_snapshot
+
+
+class CachedJWTAuthentication(JWTAuthentication):  # type: ignore[misc]
+    """
+    JWTAuthentication без SELECT пользователя на каждый запрос: request.user —
+    снапшот из кэша с полями SNAPSHOT_FIELDS, остальные поля догружаются
+    при обращении.
+    """
+
+    def get_user(self, validated_token: Token) -> Any:
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Сверка с хэшем пароля требует полной строки пользователя.
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        user = get_user_snapshot(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
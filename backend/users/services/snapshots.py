@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = "users:snapshot:{user_id}"
+# Поля, которых хватает аутентификации, обычному запросу к API и ответу
+# UserSerializer (/me): каждое отложенное поле догружается отдельным SELECT
+SNAPSHOT_FIELDS = (
+    "id",
+    "telegram_id",
+    "email",
+    "email_verified",
+    "username",
+    "first_name",
+    "language",
+    "timezone",
+    "is_active",
+    "created_at",
+)
+
+
+class _LocalSnapshots:
+    """LRU снапшотов в памяти процесса с коротким TTL (другие процессы не инвалидируют его)."""
+
+    def __init__(self) -> None:
+        self._items: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[0] < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return item[1]
+
+    def set(self, key: str, values: dict[str, Any]) -> None:
+        ttl = float(getattr(settings, "AUTH_USER_LOCAL_CACHE_TTL", 5.0))
+        size = int(getattr(settings, "AUTH_USER_LOCAL_CACHE_SIZE", 10_000))
+        if ttl <= 0 or size <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, values)
+            self._items.move_to_end(key)
+            while len(self._items) > size:
+                self._items.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_local_snapshots = _LocalSnapshots()
+
+
+def _snapshot_key(user_id: Any) -> str:
+    return SNAPSHOT_KEY.format(user_id=user_id)
+
+
+def _to_user(values: dict[str, Any]) -> User:
+    """
+    Экземпляр User только с полями снапшота: остальные отложены и
+    догружаются из БД при обращении, как у .only().
+    """
+    field_names = [
+        field.attname for field in User._meta.concrete_fields if field.attname in values
+    ]
+    return User.from_db("default", field_names, [values[name] for name in field_names])
+
+
+def get_user_snapshot(user_id: Any) -> User | None:
+    """
+    Пользователь для аутентифицированного запроса: память процесса,
+    затем общий кэш Django, затем один SELECT по первичному ключу.
+    None — пользователя нет.
+    """
+    key = _snapshot_key(user_id)
+    values = _local_snapshots.get(key)
+    if values is None:
+        values = cache.get(key)
+        if values is None:
+            values = User.objects.filter(pk=user_id).values(*SNAPSHOT_FIELDS).first()
+            if values is None:
+                return None
+            cache.set(
+                key, values, timeout=getattr(settings, "AUTH_USER_CACHE_TTL", 300)
+            )
+        _local_snapshots.set(key, values)
+    return _to_user(values)
+
+
+def invalidate_user_snapshot(user_id: Any) -> None:
+    # Сразу и после коммита: запрос, прочитавший строку до коммита,
+    # мог успеть положить в кэш старый снапшот.
+    _drop_user_snapshot(user_id)
+    transaction.on_commit(lambda: _drop_user_snapshot(user_id))
+
+
+def _drop_user_snapshot(user_id: Any) -> None:
+    key = _snapshot_key(user_id)
+    _local_snapshots.pop(key)
+    cache.delete(key)
+    logger.debug("User snapshot invalidated", extra={"user_id": str(user_id)})
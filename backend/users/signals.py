@@ -0,0 +1,22 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import User
+from .services.snapshots import invalidate_user_snapshot
+
+
+@receiver(post_save, sender=User)
+def invalidate_snapshot_on_save(
+    sender: type[User], instance: User, created: bool, **kwargs: Any
+) -> None:
+    if not created:
+        invalidate_user_snapshot(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_snapshot_on_delete(
+    sender: type[User], instance: User, **kwargs: Any
+) -> None:
+    invalidate_user_snapshot(instance.pk)
@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tasks.models import Task
+from users.models import User
+from users.services.auth import issue_tokens
+from users.services.snapshots import get_user_snapshot
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+    tasks_url = "/api/v1/tasks/"
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(telegram_id=8181, timezone="Asia/Tokyo")
+        self.task = Task.objects.create(user=self.user, title="Конспект")
+        access = issue_tokens(self.user)["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def _user_queries(self) -> list[str]:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.tasks_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [q["sql"] for q in queries if User._meta.db_table in q["sql"]]
+
+    def test_repeated_requests_do_not_select_user(self) -> None:
+        self.assertEqual(len(self._user_queries()), 1)
+        self.assertEqual(self._user_queries(), [])
+
+    def test_task_update_does_not_select_user(self) -> None:
+        self._user_queries()
+        url = f"{self.tasks_url}{self.task.id}/"
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(url, {"status": "done"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([q["sql"] for q in queries if User._meta.db_table in q["sql"]])
+
+    def test_me_is_served_from_snapshot(self) -> None:
+        User.objects.filter(pk=self.user.pk).update(first_name="Ира")
+        self.client.get(self.tasks_url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/v1/users/me/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["first_name"], "Ира")
+        self.assertEqual(response.data["timezone"], "Asia/Tokyo")
+
+    def test_link_email_reads_user_row_once(self) -> None:
+        self.client.get(self.tasks_url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/v1/users/link-email/",
+                {"email": "ira@example.com", "password": "Str0ng-pass!"},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data["email"], "ira@example.com")
+        selects = [
+            q["sql"]
+            for q in queries
+            if q["sql"].startswith("SELECT") and User._meta.db_table in q["sql"]
+        ]
+        # Перечитывание снапшота и проверка, что email не занят
+        self.assertEqual(len(selects), 2)
+
+    def test_save_invalidates_snapshot(self) -> None:
+        self.assertEqual(get_user_snapshot(self.user.pk).timezone, "Asia/Tokyo")
+
+        self.user.timezone = "UTC"
+        self.user.save(update_fields=["timezone"])
+        self.assertEqual(get_user_snapshot(self.user.pk).timezone, "UTC")
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.tasks_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_snapshot_loads_other_fields_lazily(self) -> None:
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+
+        snapshot = get_user_snapshot(self.user.pk)
+
+        self.assertEqual(snapshot, self.user)
+        with self.assertNumQueries(1):
+            self.assertTrue(snapshot.is_staff)
@@ -0,0 +1,47 @@
+from datetime import UTC, timedelta
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from tasks.models import Task
+from users.models import User
+from users.utils.timezone import get_user_timezone, resolve_timezone
+
+
+class UserTimezoneTests(SimpleTestCase):
+    def test_resolved_timezones_are_cached(self) -> None:
+        user = User(timezone="Asia/Tokyo")
+
+        self.assertIs(get_user_timezone(user), get_user_timezone(user))
+        self.assertEqual(get_user_timezone(user), ZoneInfo("Asia/Tokyo"))
+
+    def test_unknown_timezone_falls_back_to_utc_and_is_cached(self) -> None:
+        user = User(timezone="Mars/Olympus")
+        misses = resolve_timezone.cache_info().misses
+
+        self.assertIs(get_user_timezone(user), UTC)
+        self.assertIs(get_user_timezone(user), UTC)
+        self.assertEqual(resolve_timezone.cache_info().misses, misses + 1)
+
+
+class NaiveDueAtTests(APITestCase):
+    def test_naive_due_at_is_user_local_time(self) -> None:
+        user = User.objects.create_user(telegram_id=9191, timezone="Asia/Tokyo")
+        self.client.force_authenticate(user=user)
+        local = timezone.now().astimezone(ZoneInfo("Asia/Tokyo")) + timedelta(days=1)
+        naive = local.replace(tzinfo=None, second=0, microsecond=0)
+
+        response = self.client.post(
+            reverse("tasks-list-create"),
+            {"title": "Эссе", "due_at": naive.isoformat()},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        due_at = Task.objects.get(pk=response.data["id"]).due_at
+        self.assertEqual(
+            due_at,
+            naive.replace(tzinfo=ZoneInfo("Asia/Tokyo")).astimezone(UTC),
+        )
@@ -1,13 +1,50 @@
-from datetime import timezone as dt_timezone, tzinfo
+from datetime import UTC, date, datetime, time, timedelta, tzinfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-import pytz
+from users.models import User
 
+TIMEZONE_CACHE_SIZE = 1024
 
-from users.models import User
+
+@lru_cache(maxsize=TIMEZONE_CACHE_SIZE)
+def resolve_timezone(name: str) -> tzinfo | None:
+    """
+    tzinfo по имени IANA, один раз на процесс. Неизвестные имена тоже
+    кэшируются (None), чтобы не искать их в базе таймзон на каждый вызов.
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
 
 
 def get_user_timezone(user: User) -> tzinfo:
-    try:
-        return pytz.timezone(user.timezone)
-    except pytz.UnknownTimeZoneError:
-        return dt_timezone.utc
+    return resolve_timezone(user.timezone) or UTC
+
+
+def localize(value: datetime, tz: tzinfo) -> datetime:
+    """
+    Naive datetime как локальное время в tz. Для zoneinfo это replace(tzinfo=),
+    pytz-таймзоны (если их передали явно) требуют localize.
+    """
+    localize_pytz = getattr(tz, "localize", None)
+    if localize_pytz is not None:
+        return localize_pytz(value)  # type: ignore[no-any-return]
+    return value.replace(tzinfo=tz)
+
+
+def local_day_start(day: date, tz: tzinfo) -> datetime:
+    """Начало локального дня day в tz, в UTC."""
+    return localize(datetime.combine(day, time.min), tz).astimezone(UTC)
+
+
+def local_days_range(
+    now: datetime, tz: tzinfo, days: int = 1
+) -> tuple[datetime, datetime]:
+    """
+    Полуоткрытый UTC-интервал [начало сегодняшнего локального дня,
+    начало дня через `days` дней). Годится для индексного range scan.
+    """
+    today = now.astimezone(tz).date()
+    return local_day_start(today, tz), local_day_start(today + timedelta(days=days), tz)
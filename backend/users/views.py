@@ -15,7 +15,6 @@ from .api.schema import (
     TELEGRAM_LOGIN_SCHEMA,
     TOKEN_REFRESH_SCHEMA,
 )
-from .models import User
 from .serializers import (
     EmailLoginSerializer,
     EmailRegisterSerializer,
@@ -108,7 +107,10 @@ class LinkEmailView(APIView):
 
     @LINK_EMAIL_SCHEMA  # type: ignore[untyped-decorator]
     def post(self, request: Request) -> Response:
-        user = cast(User, request.user)
+        # Запись не должна опираться на снапшот из кэша: перечитываем его
+        # поля одним запросом.
+        user = request.user
+        user.refresh_from_db()
         serializer = LinkEmailSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
         linked_user = link_email_credentials(user, serializer.validated_data)
@@ -122,7 +124,8 @@ class MeView(APIView):
 
     @ME_SCHEMA  # type: ignore[untyped-decorator]
     def get(self, request: Request) -> Response:
-        user = cast(User, request.user)
+        # request.user — снапшот из кэша, в нём есть все поля UserSerializer
+        user = request.user
         logger.debug(
             "User requested /me",
             extra={"user_id": user.id, "telegram_id": user.telegram_id},
@@ -0,0 +1,122 @@
+"""Бенчмарк запросов бота к API: клиент на каждый вызов против общего keep-alive клиента.
+
+Запуск из корня репозитория (бэкенд не нужен):
+
+    python benchmarks/bot_api_client.py --requests 500 --concurrency 20
+
+Поднимает локальный заглушечный бэкенд на aiohttp, который отвечает
+списком задач. Старый путь — api_client() вне ApiClientMiddleware (новый
+httpx.AsyncClient и TCP-соединение на вызов, как раньше). Новый путь —
+те же сервисные функции внутри ApiClientMiddleware с клиентом из
+create_api_client().
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "benchmark")
+
+from aiohttp import web
+
+TASKS = [
+    {"id": str(index), "title": f"Задача {index}", "status": "pending"}
+    for index in range(20)
+]
+
+
+async def _start_stub() -> tuple[web.AppRunner, int]:
+    async def tasks(request: web.Request) -> web.Response:
+        return web.json_response({"count": len(TASKS), "results": TASKS})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/tasks/", tasks)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return runner, port
+
+
+async def _measure(
+    call: Callable[[], Awaitable[Any]], requests: int, concurrency: int
+) -> tuple[list[float], float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies, time.perf_counter() - started
+
+
+def _report(label: str, latencies: list[float], elapsed: float) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<28} mean {statistics.mean(ordered) * 1000:>7.2f} ms  "
+        f"p95 {p95 * 1000:>7.2f} ms  {len(ordered) / elapsed:>8.0f} req/s"
+    )
+
+
+def _through_middleware(
+    middleware: Callable[..., Awaitable[Any]], call: Callable[[], Awaitable[Any]]
+) -> Callable[[], Awaitable[Any]]:
+    async def shared_call() -> Any:
+        return await middleware(lambda event, data: call(), None, {})
+
+    return shared_call
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    runner, port = await _start_stub()
+    os.environ["API_URL"] = f"http://127.0.0.1:{port}/api/v1"
+
+    from bot.services.tasks import fetch_tasks
+    from bot.utils.http import ApiClientMiddleware, create_api_client
+
+    async def handler_call() -> Any:
+        return await fetch_tasks("token", None)
+
+    try:
+        for concurrency in sorted({1, args.concurrency}):
+            print(f"concurrency {concurrency}:")
+            latencies, elapsed = await _measure(
+                handler_call, args.requests, concurrency
+            )
+            _report("  client per call", latencies, elapsed)
+
+            async with create_api_client() as client:
+                shared_call = _through_middleware(
+                    ApiClientMiddleware(client), handler_call
+                )
+
+                await shared_call()  # прогрев пула
+                latencies, elapsed = await _measure(
+                    shared_call, args.requests, concurrency
+                )
+            _report("  shared keep-alive client", latencies, elapsed)
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+"""Бенчмарк пакетного build_habits_reports против build_habits_report на пользователя.
+
+Запуск из корня репозитория (нужны переменные окружения PostgreSQL):
+
+    DJANGO_SETTINGS_MODULE=DjangoProject.settings python benchmarks/habits_batch.py --users 100000
+
+Создаёт временную тестовую БД с пользователями в нескольких таймзонах и их
+задачами. Пакетный путь проходит всех пользователей чанками (как чанки
+еженедельной рассылки). Путь на пользователя измеряется на выборке
+(--sample) и экстраполируется на всех.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "DjangoProject.settings")
+
+import django
+
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+from tasks.models import Reminder, Task
+from tasks.services.habits import build_habits_report, build_habits_reports
+from users.models import User
+
+TIMEZONES = ["Europe/Moscow", "Asia/Tokyo", "America/New_York", "UTC", "Asia/Almaty"]
+INSERT_BATCH = 10_000
+
+
+def _populate(users_count: int, tasks_per_user: int, seed: int = 7) -> list[User]:
+    rng = random.Random(seed)
+    now = timezone.now()
+    users = [
+        User(telegram_id=index + 1, timezone=TIMEZONES[index % len(TIMEZONES)])
+        for index in range(users_count)
+    ]
+    for index in range(0, len(users), INSERT_BATCH):
+        User.objects.bulk_create(users[index : index + INSERT_BATCH])
+
+    tasks: list[Task] = []
+    reminders: list[Reminder] = []
+
+    def flush() -> None:
+        Task.objects.bulk_create(tasks)
+        Reminder.objects.bulk_create(reminders)
+        tasks.clear()
+        reminders.clear()
+
+    for user in users:
+        for index in range(tasks_per_user):
+            done = rng.random() < 0.6
+            completed_at = now - timedelta(hours=rng.uniform(0, 24 * 10))
+            due_at = (
+                completed_at + timedelta(hours=rng.uniform(-48, 48))
+                if rng.random() < 0.7
+                else None
+            )
+            task = Task(
+                user=user,
+                title=f"Задача {index}",
+                status=Task.Status.DONE if done else Task.Status.PENDING,
+                completed_at=completed_at if done else None,
+                due_at=due_at,
+            )
+            tasks.append(task)
+            if due_at and rng.random() < 0.5:
+                reminders.append(
+                    Reminder(
+                        task=task, notify_at=due_at - timedelta(hours=1), sent=True
+                    )
+                )
+        if len(tasks) >= INSERT_BATCH:
+            flush()
+    flush()
+    return users
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--tasks-per-user", type=int, default=5)
+    parser.add_argument("--chunk", type=int, default=100)
+    parser.add_argument("--sample", type=int, default=2_000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        started = time.perf_counter()
+        users = _populate(args.users, args.tasks_per_user)
+        connection.cursor().execute("ANALYZE")
+        print(
+            f"users: {args.users}, tasks: {args.users * args.tasks_per_user}, "
+            f"populated in {time.perf_counter() - started:.1f} s"
+        )
+
+        sample = users[: args.sample]
+        started = time.perf_counter()
+        for user in sample:
+            build_habits_report(user, days=7, use_llm=False)
+        per_user = (time.perf_counter() - started) / len(sample)
+        print(
+            f"{'per-user build_habits_report':<34} {per_user * 1000:>7.2f} ms/user, "
+            f"~{per_user * args.users:>7.1f} s for all users"
+        )
+
+        for chunk_size in sorted({args.chunk, 1000}):
+            started = time.perf_counter()
+            for index in range(0, len(users), chunk_size):
+                build_habits_reports(users[index : index + chunk_size], days=7)
+            elapsed = time.perf_counter() - started
+            label = f"build_habits_reports (chunk {chunk_size})"
+            print(
+                f"{label:<34} {elapsed / len(users) * 1000:>7.2f} ms/user, "
+                f"{elapsed:>8.1f} s for all users"
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Бенчмарк build_habits_report на пользователе с большим числом задач.
+
+Запуск из корня репозитория (нужны переменные окружения PostgreSQL):
+
+    DJANGO_SETTINGS_MODULE=DjangoProject.settings python benchmarks/habits_report.py --tasks 50000
+
+Создаёт временную тестовую БД, генерирует задачи и напоминания и сравнивает
+SQL-агрегацию с прежним построчным подсчётом на Python.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "DjangoProject.settings")
+
+import django
+
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+from tasks.services.habits import build_habits_report
+from tasks.tests.test_habits_report import (
+    create_random_tasks,
+    reference_habits_counts,
+)
+from users.models import User
+
+
+def _measure(label: str, func: Callable[[], object], repeat: int) -> None:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    best = min(timings) * 1000
+    print(f"{label:<28} best of {repeat}: {best:>9.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        user = User.objects.create_user(telegram_id=1, timezone="Europe/Moscow")
+        create_random_tasks(user, count=args.tasks, days=args.days)
+        connection.cursor().execute("ANALYZE")
+        print(f"tasks: {args.tasks}, window: {args.days} days")
+
+        now = timezone.now()
+        start = now - timedelta(days=args.days)
+        _measure(
+            "python loop (before)",
+            lambda: reference_habits_counts(user, start, now),
+            args.repeat,
+        )
+        _measure(
+            "sql aggregation",
+            lambda: build_habits_report(user, days=args.days, use_llm=False),
+            args.repeat,
+        )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
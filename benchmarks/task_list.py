@@ -0,0 +1,116 @@
+"""Бенчмарк рендера списка задач: ModelSerializer + ленивый topic против быстрого пути.
+
+Запуск из корня репозитория (нужны переменные окружения PostgreSQL):
+
+    DJANGO_SETTINGS_MODULE=DjangoProject.settings python benchmarks/task_list.py --tasks 100
+
+Создаёт временную тестовую БД с пользователем и задачами по нескольким темам.
+Старый путь повторяет прежний рендер: выборка без select_related, поля
+ModelSerializer и pytz-таймзона на каждую строку. Новый путь — то, что отдаёт
+/api/v1/tasks/: select_related("topic"), таймзона из контекста и render_task.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "DjangoProject.settings")
+
+import django
+
+django.setup()
+
+from courses.models import Course
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+from tasks.models import Task
+from tasks.serializers import USER_TZ_CONTEXT_KEY, TaskSerializer
+from topics.models import Topic
+from users.models import User
+from users.utils.timezone import get_user_timezone
+
+
+def _populate(tasks_count: int) -> User:
+    user = User.objects.create_user(telegram_id=1, timezone="Europe/Moscow")
+    course = Course.objects.create(user=user, title="Курс")
+    topics = [Topic.objects.create(course=course, title=f"Тема {i}") for i in range(10)]
+    now = timezone.now()
+    Task.objects.bulk_create(
+        Task(
+            user=user,
+            title=f"Задача {i}",
+            topic=topics[i % len(topics)],
+            due_at=now + timedelta(hours=i),
+        )
+        for i in range(tasks_count)
+    )
+    return user
+
+
+def _render_legacy(user: User, context: dict[str, Any]) -> list[dict[str, Any]]:
+    serializer = TaskSerializer(context=context)
+    rows = []
+    for task in Task.objects.filter(user=user):
+        data = serializers.ModelSerializer.to_representation(serializer, task)
+        data["due_at"] = task.due_at.astimezone(get_user_timezone(user)).isoformat()
+        rows.append(data)
+    return rows
+
+
+def _render_fast(user: User, context: dict[str, Any]) -> list[dict[str, Any]]:
+    context = {**context, USER_TZ_CONTEXT_KEY: get_user_timezone(user)}
+    queryset = Task.objects.filter(user=user).select_related("topic")
+    return list(TaskSerializer(queryset, many=True, context=context).data)
+
+
+def _measure(
+    label: str, render: Callable[[User, dict[str, Any]], Any], user: User, repeat: int
+) -> None:
+    request = APIRequestFactory().get("/")
+    request.user = user
+    context = {"request": request}
+    render(user, context)
+
+    with CaptureQueriesContext(connection) as queries:
+        render(user, context)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(user, context)
+        timings.append(time.perf_counter() - started)
+    print(
+        f"{label:<10} {statistics.median(timings) * 1000:>8.2f} ms median, "
+        f"{len(queries):>4} queries"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        user = _populate(args.tasks)
+        print(f"tasks: {args.tasks}")
+        _measure("legacy", _render_legacy, user, args.repeat)
+        _measure("fast", _render_fast, user, args.repeat)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Бенчмарк отправки сообщений воркером bot.send_message.
+
+Запуск из корня репозитория:
+
+    python benchmarks/telegram_send.py --messages 2000
+
+Поднимает локальный фейковый Telegram Bot API и сравнивает прежний путь
+(новое соединение на каждый httpx.post) с keep-alive клиентом процесса.
+--connect-delay добавляет задержку на каждое новое TCP-соединение, чтобы
+имитировать TCP+TLS handshake до api.telegram.org.
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        body = json.dumps({"ok": True, "result": {"message_id": 1}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class FakeTelegramServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connect_delay = 0.0
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        time.sleep(self.connect_delay)
+        socketserver.ThreadingMixIn.process_request(self, request, client_address)
+
+
+def _report(label: str, count: int, elapsed: float) -> None:
+    print(
+        f"{label:<22} {count / elapsed:>10,.0f} msg/s  "
+        f"{elapsed / count * 1000:>8.2f} ms/msg"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--connect-delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeTelegramServer(("127.0.0.1", 0), FakeTelegramHandler)
+    server.connect_delay = args.connect_delay
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    os.environ.setdefault("TELEGRAM_BOT_TOKEN", "bench-token")
+    os.environ["TELEGRAM_API_BASE"] = f"http://127.0.0.1:{server.server_port}"
+
+    import httpx
+
+    from bot.celery_tasks import send_message
+    from bot.utils.telegram_api import BOT_API_URL, close_telegram_client
+
+    payload = {"chat_id": 1, "text": "ping", "parse_mode": "HTML"}
+
+    started = time.perf_counter()
+    for _ in range(args.messages):
+        httpx.post(f"{BOT_API_URL}/sendMessage", json=payload, timeout=10)
+    _report("new connection/msg", args.messages, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for _ in range(args.messages):
+        send_message(**payload)
+    _report("pooled keep-alive", args.messages, time.perf_counter() - started)
+
+    close_telegram_client()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
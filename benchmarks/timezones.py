@@ -0,0 +1,97 @@
+"""Микробенчмарк таймзон: pytz на каждый вызов против кэшированного zoneinfo.
+
+Запуск из корня репозитория (БД не нужна):
+
+    DJANGO_SETTINGS_MODULE=DjangoProject.settings python benchmarks/timezones.py
+
+Старый путь повторяет прежний get_user_timezone (pytz.timezone на каждый
+вызов, исключение для неизвестного имени) и нормализацию due_at через
+localize/astimezone. Новый путь — get_user_timezone из users.utils.timezone
+и replace(tzinfo=).
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta, tzinfo
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "DjangoProject.settings")
+
+import django
+
+django.setup()
+
+import pytz
+from users.models import User
+from users.utils.timezone import get_user_timezone
+
+TIMEZONES = ["Europe/Moscow", "Asia/Tokyo", "America/New_York", "UTC", "Asia/Almaty"]
+
+
+def _legacy_get_user_timezone(user: User) -> tzinfo:
+    try:
+        return pytz.timezone(user.timezone)
+    except pytz.UnknownTimeZoneError:
+        return UTC
+
+
+def _bench(label: str, func: Callable[[], object], number: int) -> float:
+    best = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"{label:<46} {best * 1e6:>8.3f} us/call")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    users = [User(timezone=name) for name in TIMEZONES]
+    unknown = User(timezone="Mars/Olympus")
+    naive = datetime(2030, 3, 30, 18, 30)
+    aware = naive.replace(tzinfo=UTC) + timedelta(hours=3)
+
+    def resolve(get: Callable[[User], tzinfo]) -> Callable[[], object]:
+        return lambda: [get(user) for user in users]
+
+    def normalize_legacy() -> object:
+        return [
+            _legacy_get_user_timezone(user).localize(naive).astimezone(UTC)  # type: ignore[attr-defined]
+            for user in users
+        ]
+
+    def normalize_fast() -> object:
+        return [
+            naive.replace(tzinfo=get_user_timezone(user)).astimezone(UTC)
+            for user in users
+        ]
+
+    def render(get: Callable[[User], tzinfo]) -> Callable[[], object]:
+        return lambda: [aware.astimezone(get(user)).isoformat() for user in users]
+
+    rows = [
+        ("resolve x5", resolve(_legacy_get_user_timezone), resolve(get_user_timezone)),
+        (
+            "resolve unknown name",
+            lambda: _legacy_get_user_timezone(unknown),
+            lambda: get_user_timezone(unknown),
+        ),
+        ("normalize naive due_at x5", normalize_legacy, normalize_fast),
+        (
+            "render due_at x5",
+            render(_legacy_get_user_timezone),
+            render(get_user_timezone),
+        ),
+    ]
+    for label, legacy, fast in rows:
+        legacy_time = _bench(f"{label} (pytz)", legacy, args.number)
+        fast_time = _bench(f"{label} (zoneinfo, cached)", fast, args.number)
+        print(f"{'':<46} x{legacy_time / fast_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
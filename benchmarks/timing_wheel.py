@@ -0,0 +1,136 @@
+"""Бенчмарк timing wheel диспетчера напоминаний.
+
+Запуск из корня репозитория:
+
+    python benchmarks/timing_wheel.py --reminders 1000000
+    DJANGO_SETTINGS_MODULE=DjangoProject.settings \
+        python benchmarks/timing_wheel.py --dispatch 20000 --per-second 500
+
+Моделирует нагрузку диспетчера: вставка напоминаний на несколько часов
+вперёд, часть переносов/отмен и посекундное срабатывание. Выводит
+пропускную способность вставки и истечения на одном ядре.
+
+С --dispatch измеряет и срабатывание целиком, как в run_reminder_dispatcher:
+колесо отдаёт напоминания секунды, а Command._dispatch захватывает их
+через dispatch_reminder_ids и публикует publish_telegram_message (в outbox).
+Нужны переменные окружения PostgreSQL; создаётся временная тестовая БД.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from tasks.services.dispatcher.timing_wheel import HierarchicalTimingWheel
+
+TARGET_RATE = 10_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reminders", type=int, default=1_000_000)
+    parser.add_argument("--horizon-hours", type=int, default=6)
+    parser.add_argument("--dispatch", type=int, default=0)
+    parser.add_argument("--per-second", type=int, default=500)
+    args = parser.parse_args()
+
+    random.seed(42)
+    horizon = args.horizon_hours * 3600
+    deadlines = [random.uniform(0, horizon) for _ in range(args.reminders)]
+    wheel: HierarchicalTimingWheel[int] = HierarchicalTimingWheel(start=0.0)
+
+    started = time.perf_counter()
+    for key, deadline in enumerate(deadlines):
+        wheel.schedule(key, deadline)
+    insert_elapsed = time.perf_counter() - started
+
+    for key in range(0, args.reminders, 10):
+        wheel.cancel(key)
+
+    started = time.perf_counter()
+    fired = 0
+    for second in range(horizon + 1):
+        fired += len(wheel.advance(float(second)))
+    expire_elapsed = time.perf_counter() - started
+
+    insert_rate = args.reminders / insert_elapsed
+    expire_rate = fired / expire_elapsed
+    print(f"reminders: {args.reminders}, horizon: {args.horizon_hours}h")
+    print(f"insert: {insert_rate:,.0f}/s ({insert_elapsed:.2f}s)")
+    print(f"expire: {expire_rate:,.0f}/s ({expire_elapsed:.2f}s, fired={fired})")
+
+    if min(insert_rate, expire_rate) < TARGET_RATE:
+        print(f"FAIL: below {TARGET_RATE}/s")
+        sys.exit(1)
+
+    # Напоминания секунды должны уходить быстрее, чем наступит следующая.
+    if args.dispatch and _bench_dispatch(args.dispatch, args.per_second) > 1.0:
+        print(f"FAIL: {args.per_second} reminders do not fit into a 1s tick")
+        sys.exit(1)
+    print("OK")
+
+
+def _bench_dispatch(count: int, per_second: int) -> float:
+    """Срабатывание через dispatch_reminder_ids; возвращает p95 тика в секундах."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "DjangoProject.settings")
+    import django
+
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    from django.utils import timezone
+    from tasks.management.commands.run_reminder_dispatcher import Command
+    from tasks.models import Reminder, Task
+    from users.models import User
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        user = User.objects.create_user(telegram_id=1)
+        task = Task.objects.create(user=user, title="Задача")
+        # Все напоминания уже due: секунды колеса идут без ожидания.
+        now = timezone.now()
+        seconds = (count + per_second - 1) // per_second
+        reminders = Reminder.objects.bulk_create(
+            Reminder(
+                task=task, notify_at=now - timedelta(seconds=seconds - i // per_second)
+            )
+            for i in range(count)
+        )
+        connection.cursor().execute("ANALYZE")
+
+        wheel: HierarchicalTimingWheel[str] = HierarchicalTimingWheel(start=0.0)
+        for index, reminder in enumerate(reminders):
+            wheel.schedule(str(reminder.id), float(index // per_second + 1))
+
+        command = Command()
+        tick_times: list[float] = []
+        started = time.perf_counter()
+        for second in range(1, seconds + 1):
+            tick_started = time.perf_counter()
+            command._dispatch(wheel.advance(float(second)))
+            tick_times.append(time.perf_counter() - tick_started)
+        elapsed = time.perf_counter() - started
+
+        sent = Reminder.objects.filter(sent=True).count()
+        p95 = sorted(tick_times)[int(len(tick_times) * 0.95) - 1]
+        print(
+            f"dispatch: {sent / elapsed:,.0f}/s ({elapsed:.2f}s, sent={sent}), "
+            f"tick of {per_second}: mean {statistics.mean(tick_times) * 1000:.1f} ms, "
+            f"p95 {p95 * 1000:.1f} ms"
+        )
+        return p95
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
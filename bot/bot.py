@@ -7,6 +7,7 @@ from aiogram.types import BotCommand
 from bot.commands import COMMANDS
 from bot.config import settings
 from bot.handlers import tasks, courses, help, topics, unknown, start, habits, menu
+from bot.utils.http import ApiClientMiddleware, create_api_client
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -44,7 +45,9 @@ async def main() -> None:
     dp.include_router(unknown.router)
 
     await setup_bot_commands(bot)
-    await dp.start_polling(bot)
+    async with create_api_client() as api_client:
+        dp.update.outer_middleware(ApiClientMiddleware(api_client))
+        await dp.start_polling(bot)
 
 
 if __name__ == "__main__":
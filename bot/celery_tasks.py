@@ -1,14 +1,34 @@
 import logging
+import time
 from typing import Any
 
-import httpx
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from bot.celery_app import celery_app
 from bot.config import settings
+from bot.utils import dedupe, rate_limit
+from bot.utils.telegram_api import (
+    close_telegram_client,
+    get_retry_after,
+    get_telegram_client,
+    open_telegram_client,
+)
 
 logger = logging.getLogger(__name__)
 
-BOT_API_URL = f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}"
+# Ожидание до этого порога делаем в процессе, дольше — через retry с countdown,
+# чтобы не держать слот воркера.
+MAX_INLINE_WAIT = 1.0
+
+
+@worker_process_init.connect  # type: ignore
+def init_telegram_client(**kwargs: Any) -> None:
+    open_telegram_client()
+
+
+@worker_process_shutdown.connect  # type: ignore
+def shutdown_telegram_client(**kwargs: Any) -> None:
+    close_telegram_client()
 
 
 @celery_app.task(  # type: ignore
@@ -25,15 +45,46 @@ def send_message(
     parse_mode: str = "HTML",
     extra: dict[str, object] | None = None,
 ) -> None:
-    response = httpx.post(
-        f"{BOT_API_URL}/sendMessage",
-        json={
-            "chat_id": chat_id,
-            "text": text,
-            "parse_mode": parse_mode,
-        },
-        timeout=10,
-    )
+    wait = rate_limit.acquire(chat_id)
+    while 0 < wait <= MAX_INLINE_WAIT:
+        time.sleep(wait)
+        wait = rate_limit.acquire(chat_id)
+    if wait > 0:
+        raise self.retry(countdown=wait, max_retries=settings.TELEGRAM_MAX_RETRIES)
+
+    if not dedupe.claim(extra):
+        logger.info(
+            "Duplicate telegram message skipped",
+            extra={"telegram_id": chat_id, "payload_extra": extra},
+        )
+        return
+
+    try:
+        response = get_telegram_client().post(
+            "/sendMessage",
+            json={
+                "chat_id": chat_id,
+                "text": text,
+                "parse_mode": parse_mode,
+            },
+        )
+    except Exception:
+        dedupe.release(extra)
+        raise
+
+    if response.status_code != 200:
+        dedupe.release(extra)
+
+    if response.status_code == 429:
+        retry_after = get_retry_after(response)
+        logger.warning(
+            "Telegram rate limit hit",
+            extra={"telegram_id": chat_id, "retry_after": retry_after},
+        )
+        rate_limit.block_chat(chat_id, retry_after)
+        raise self.retry(
+            countdown=retry_after, max_retries=settings.TELEGRAM_MAX_RETRIES
+        )
 
     if response.status_code != 200:
         logger.error(
@@ -3,7 +3,34 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):  # type: ignore
     TELEGRAM_BOT_TOKEN: str
+    TELEGRAM_API_BASE: str = "https://api.telegram.org"
+    TELEGRAM_POOL_SIZE: int = 20
+    TELEGRAM_KEEPALIVE_EXPIRY: float = 30.0
+    TELEGRAM_TIMEOUT: float = 10.0
+    # Лимиты Telegram: ~30 сообщений/с на бота и 1 сообщение/с в чат
+    TELEGRAM_GLOBAL_RATE: float = 30.0
+    TELEGRAM_CHAT_RATE: float = 1.0
+    RATE_LIMIT_REDIS_URL: str | None = None
+    # Сколько раз bot.send_message откладывается из-за лимитов (bucket и 429)
+    TELEGRAM_MAX_RETRIES: int = 10
+    # Сколько секунд помнить idempotency_key отправленного сообщения
+    TELEGRAM_DEDUPE_TTL: int = 86400
+    # Асинхронный отправщик (python -m bot.sender)
+    SENDER_CONCURRENCY: int = 100
+    SENDER_PREFETCH: int = 1000
+    SENDER_MAX_ATTEMPTS: int = 4
     API_URL: str = "http://backend:8000/api/v1"
+    # Кэш списков: ответы с ETag и локальные копии задач для дельта-синхронизации
+    BOT_ETAG_CACHE_SIZE: int = 1000
+    BOT_TASKS_CACHE_SIZE: int = 1000
+    # Общий keep-alive клиент API бэкенда (один на процесс бота)
+    BOT_API_POOL_SIZE: int = 20
+    BOT_API_KEEPALIVE_EXPIRY: float = 30.0
+    BOT_API_HTTP2: bool = True
+    BOT_API_CONNECT_TIMEOUT: float = 3.0
+    BOT_API_TIMEOUT: float = 5.0
+    # Отчёт о привычках может ждать LLM (HUGGINGFACE_TIMEOUT с повтором)
+    BOT_API_HABITS_TIMEOUT: float = 20.0
     CELERY_BROKER_URL: str = "redis://redis:6379/0"
     BOT_QUEUE: str = "telegram"
 
@@ -17,7 +17,8 @@ async def habits_handler(message: Message) -> None:
     if not token:
         return
 
-    response = await fetch_habits_report(token, days=30)
+    # Готовый снапшот: отчёт не ждёт LLM, устаревший обновится в фоне.
+    response = await fetch_habits_report(token, days=30, fresh=False)
     if response.status_code != 200:
         logger.error("Habits report failed: %s %s", response.status_code, response.text)
         await send_message_with_kb(message, "Ошибка загрузки отчета ❌")
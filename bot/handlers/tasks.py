@@ -10,7 +10,7 @@ from aiogram.types import Message, CallbackQuery
 from .tasks_helpers import ask_due_at, ask_priority, ask_description, prompt_topics
 from ..formatters.tasks import format_task
 from ..keyboards import task_actions_kb
-from ..services.tasks import create_task, fetch_tasks
+from ..services.tasks import create_task, sync_tasks
 from ..states.tasks import AddTaskStates
 from ..utils.api_errors import format_api_errors
 from ..utils.fsm_guard import guard_callback
@@ -31,6 +31,9 @@ from ..utils.telegram_helpers import (
 logger = logging.getLogger(__name__)
 router = Router()
 
+# Как первая страница списка API (PAGE_SIZE)
+TASKS_LIST_LIMIT = 20
+
 
 def build_task_payload(data: dict[str, Any]) -> dict[str, Any | None]:
     """Формирует payload для создания задачи"""
@@ -231,12 +234,12 @@ async def list_tasks_handler(message: Message) -> None:
     if not token:
         return
 
-    response = await fetch_tasks(token, None)
-    if response.status_code != 200:
+    tasks = await sync_tasks(token)
+    if tasks is None:
         await send_message_with_kb(message, "Ошибка загрузки задач ❌")
         return
 
-    tasks = response.json().get("results", [])
+    tasks = tasks[:TASKS_LIST_LIMIT]
     if not tasks:
         await send_message_with_kb(message, "Нет задач 😎")
         return
@@ -0,0 +1,326 @@
+"""Асинхронный отправщик сообщений Telegram.
+
+Альтернатива Celery-воркеру bot.send_message: читает те же сообщения из
+очереди BOT_QUEUE пачками (prefetch) и отправляет их конкурентно через один
+httpx.AsyncClient. Сообщения одного чата уходят строго по порядку,
+общая конкурентность ограничена SENDER_CONCURRENCY.
+
+Запуск: python -m bot.sender
+"""
+
+import asyncio
+import logging
+import queue
+import random
+import signal
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+import httpx
+from kombu import Connection, Message, Queue
+
+from bot.config import settings
+from bot.utils import dedupe, rate_limit
+from bot.utils.telegram_api import BOT_API_URL, get_retry_after
+
+logger = logging.getLogger(__name__)
+
+SEND_MESSAGE_TASK = "bot.send_message"
+SHUTDOWN_TIMEOUT = 10.0
+
+
+@dataclass
+class OutgoingMessage:
+    chat_id: int
+    text: str
+    parse_mode: str
+    extra: dict[str, Any]
+    eta: datetime | None
+    delivery: Message
+
+
+def parse_task_message(body: Any, headers: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    Достаёт kwargs задачи bot.send_message из Celery-сообщения
+    (protocol v2: body = [args, kwargs, embed]; protocol v1: body = dict).
+    """
+    if isinstance(body, (list, tuple)) and len(body) >= 2:
+        name = headers.get("task")
+        args, kwargs = body[0], dict(body[1] or {})
+    elif isinstance(body, dict):
+        name = body.get("task")
+        args, kwargs = body.get("args") or [], dict(body.get("kwargs") or {})
+    else:
+        return None
+
+    if name != SEND_MESSAGE_TASK:
+        return None
+
+    for field, value in zip(("chat_id", "text", "parse_mode", "extra"), args):
+        kwargs.setdefault(field, value)
+    return kwargs
+
+
+def _parse_eta(value: Any) -> datetime | None:
+    if not value:
+        return None
+    eta = datetime.fromisoformat(str(value))
+    return eta if eta.tzinfo else eta.replace(tzinfo=UTC)
+
+
+class QueueConsumer:
+    """
+    Читает сообщения из брокера в отдельном потоке (kombu синхронный) и
+    передаёт их в event loop. ack и requeue выполняются в том же потоке,
+    что и чтение.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, inbox: asyncio.Queue[Any]):
+        self._loop = loop
+        self._inbox = inbox
+        # (сообщение, вернуть в очередь вместо ack)
+        self._acks: queue.SimpleQueue[tuple[Message, bool]] = queue.SimpleQueue()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join(timeout=5)
+
+    def ack(self, message: Message) -> None:
+        self._acks.put((message, False))
+
+    def requeue(self, message: Message) -> None:
+        self._acks.put((message, True))
+
+    def _run(self) -> None:
+        with Connection(settings.CELERY_BROKER_URL) as connection:
+            task_queue = Queue(settings.BOT_QUEUE, routing_key=settings.BOT_QUEUE)
+            with connection.Consumer(
+                task_queue,
+                callbacks=[self._on_message],
+                accept=["json"],
+                prefetch_count=settings.SENDER_PREFETCH,
+            ):
+                while not self._stopped.is_set():
+                    self._flush_acks()
+                    try:
+                        connection.drain_events(timeout=0.2)
+                    except TimeoutError:
+                        continue
+                self._flush_acks()
+
+    def _flush_acks(self) -> None:
+        while True:
+            try:
+                message, requeue = self._acks.get_nowait()
+            except queue.Empty:
+                return
+            if requeue:
+                message.requeue()
+            else:
+                message.ack()
+
+    def _on_message(self, body: Any, message: Message) -> None:
+        self._loop.call_soon_threadsafe(self._inbox.put_nowait, (body, message))
+
+
+class TelegramSender:
+    def __init__(self, client: httpx.AsyncClient, consumer: QueueConsumer) -> None:
+        self._client = client
+        self._consumer = consumer
+        self._semaphore = asyncio.Semaphore(settings.SENDER_CONCURRENCY)
+        self._lanes: dict[int, deque[OutgoingMessage]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def submit(self, body: Any, delivery: Message) -> None:
+        kwargs = parse_task_message(body, delivery.headers or {})
+        if kwargs is None or "chat_id" not in kwargs or "text" not in kwargs:
+            logger.error("Unsupported message in telegram queue: %s", delivery.headers)
+            self._consumer.ack(delivery)
+            return
+
+        message = OutgoingMessage(
+            chat_id=int(kwargs["chat_id"]),
+            text=kwargs["text"],
+            parse_mode=kwargs.get("parse_mode") or "HTML",
+            extra=kwargs.get("extra") or {},
+            eta=_parse_eta((delivery.headers or {}).get("eta")),
+            delivery=delivery,
+        )
+
+        lane = self._lanes.get(message.chat_id)
+        if lane is not None:
+            lane.append(message)
+            return
+
+        self._lanes[message.chat_id] = deque([message])
+        task = asyncio.create_task(self._run_lane(message.chat_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def drain(self, timeout: float) -> None:
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(list(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _run_lane(self, chat_id: int) -> None:
+        lane = self._lanes[chat_id]
+        try:
+            while lane:
+                message = lane[0]
+                try:
+                    await self._deliver(message)
+                except Exception:
+                    # Возвращаем в очередь это сообщение и всё, что ждёт за
+                    # ним, чтобы не нарушить порядок чата и не держать их
+                    # неподтверждёнными до перезапуска.
+                    logger.exception(
+                        "Telegram delivery failed, requeueing chat lane",
+                        extra={"telegram_id": chat_id, "requeued": len(lane)},
+                    )
+                    while lane:
+                        self._consumer.requeue(lane.popleft().delivery)
+                    return
+                lane.popleft()
+                self._consumer.ack(message.delivery)
+        finally:
+            del self._lanes[chat_id]
+
+    async def _deliver(self, message: OutgoingMessage) -> None:
+        if message.eta:
+            delay = (message.eta - datetime.now(UTC)).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        if not await dedupe.claim_async(message.extra):
+            logger.info(
+                "Duplicate telegram message skipped",
+                extra={"telegram_id": message.chat_id, "payload_extra": message.extra},
+            )
+            return
+
+        try:
+            delivered = await self._send(message)
+        except BaseException:
+            await dedupe.release_async(message.extra)
+            raise
+        if not delivered:
+            await dedupe.release_async(message.extra)
+
+    async def _send(self, message: OutgoingMessage) -> bool:
+        for attempt in range(1, settings.SENDER_MAX_ATTEMPTS + 1):
+            wait = await rate_limit.acquire_async(message.chat_id)
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = await rate_limit.acquire_async(message.chat_id)
+
+            try:
+                async with self._semaphore:
+                    response = await self._client.post(
+                        "/sendMessage",
+                        json={
+                            "chat_id": message.chat_id,
+                            "text": message.text,
+                            "parse_mode": message.parse_mode,
+                        },
+                    )
+            except httpx.HTTPError:
+                logger.warning(
+                    "Telegram request failed (attempt %s)", attempt, exc_info=True
+                )
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code == 200:
+                return True
+
+            if response.status_code == 429:
+                retry_after = get_retry_after(response)
+                logger.warning(
+                    "Telegram rate limit hit",
+                    extra={"telegram_id": message.chat_id, "retry_after": retry_after},
+                )
+                await rate_limit.block_chat_async(message.chat_id, retry_after)
+                await asyncio.sleep(retry_after)
+                continue
+
+            logger.error(
+                "Failed to send telegram message",
+                extra={
+                    "telegram_id": message.chat_id,
+                    "status": response.status_code,
+                    "response": response.text,
+                    "payload_extra": message.extra,
+                },
+            )
+            if response.status_code < 500:
+                return False
+            await asyncio.sleep(self._backoff(attempt))
+
+        logger.error(
+            "Telegram message dropped after %s attempts",
+            settings.SENDER_MAX_ATTEMPTS,
+            extra={"telegram_id": message.chat_id, "payload_extra": message.extra},
+        )
+        return False
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        return float(min(30, 2**attempt) * random.uniform(0.5, 1.0))
+
+
+def create_sender_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=BOT_API_URL,
+        limits=httpx.Limits(
+            max_connections=settings.SENDER_CONCURRENCY,
+            max_keepalive_connections=settings.SENDER_CONCURRENCY,
+            keepalive_expiry=settings.TELEGRAM_KEEPALIVE_EXPIRY,
+        ),
+        timeout=settings.TELEGRAM_TIMEOUT,
+    )
+
+
+async def main() -> None:
+    loop = asyncio.get_running_loop()
+    inbox: asyncio.Queue[Any] = asyncio.Queue()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    consumer = QueueConsumer(loop, inbox)
+    consumer.start()
+    logger.info(
+        "Telegram sender started (queue=%s, concurrency=%s)",
+        settings.BOT_QUEUE,
+        settings.SENDER_CONCURRENCY,
+    )
+
+    async with create_sender_client() as client:
+        sender = TelegramSender(client, consumer)
+        while not stop.is_set():
+            try:
+                body, delivery = await asyncio.wait_for(inbox.get(), timeout=0.5)
+            except TimeoutError:
+                continue
+            sender.submit(body, delivery)
+
+        # Неподтверждённые сообщения вернутся в очередь после остановки.
+        await sender.drain(SHUTDOWN_TIMEOUT)
+
+    consumer.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
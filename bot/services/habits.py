@@ -1,20 +1,22 @@
 import httpx
 
 from bot.config import settings
-from bot.utils.http import api_client
+from bot.utils.http import api_client, api_timeout
 
 
 async def fetch_habits_report(
-    access_token: str, days: int | None = None
+    access_token: str, days: int | None = None, fresh: bool = True
 ) -> httpx.Response:
-    params: dict[str, int] = {}
+    params: dict[str, int | str] = {}
     if days:
         params["days"] = days
+    if not fresh:
+        params["fresh"] = "false"
 
     async with api_client() as client:
         return await client.get(
             f"{settings.API_URL}/tasks/habits/",
             headers={"Authorization": f"Bearer {access_token}"},
             params=params,
-            timeout=httpx.Timeout(10.0),
+            timeout=api_timeout(settings.BOT_API_HABITS_TIMEOUT),
         )
@@ -1,7 +1,16 @@
+import logging
+from collections import OrderedDict
 from typing import Any
 
+import httpx
+
 from bot.config import settings
-from bot.utils.http import api_client
+from bot.utils.http import api_client, get_with_etag
+
+logger = logging.getLogger(__name__)
+
+CHANGES_SINCE_HEADER = "X-Changes-Since"
+SYNC_PAGE_SIZE = 100
 
 
 async def create_task(access_token: str, payload: dict[str, Any]) -> Any:
@@ -15,8 +24,98 @@ async def create_task(access_token: str, payload: dict[str, Any]) -> Any:
 
 async def fetch_tasks(access_token: str, filter_type: str | None) -> Any:
     async with api_client() as client:
-        return await client.get(
+        return await get_with_etag(
+            client,
             f"{settings.API_URL}/tasks/",
             headers={"Authorization": f"Bearer {access_token}"},
             params={"filter": filter_type} if filter_type else {},
         )
+
+
+class TaskSyncState:
+    """Локальная копия задач пользователя и отметка для /tasks/changes/."""
+
+    def __init__(self, since: str, tasks: dict[str, dict[str, Any]]) -> None:
+        self.since = since
+        self.tasks = tasks
+
+    def apply(self, delta: dict[str, Any]) -> None:
+        for task in delta.get("changed", []):
+            self.tasks[task["id"]] = task
+        for task_id in delta.get("deleted", []):
+            self.tasks.pop(task_id, None)
+        self.since = delta["next_since"]
+
+    def ordered(self) -> list[dict[str, Any]]:
+        """Как в списке API: сначала новые."""
+        return sorted(
+            self.tasks.values(),
+            key=lambda task: (task["created_at"], task["id"]),
+            reverse=True,
+        )
+
+
+_sync_states: OrderedDict[str, TaskSyncState] = OrderedDict()
+
+
+async def sync_tasks(access_token: str) -> list[dict[str, Any]] | None:
+    """
+    Все задачи пользователя из локальной копии. Первый вызов загружает
+    список целиком (курсорные страницы), следующие — только дельту
+    с /tasks/changes/. None — если API недоступен.
+    """
+    headers = {"Authorization": f"Bearer {access_token}"}
+    state = _sync_states.get(access_token)
+
+    async with api_client() as client:
+        if state is not None:
+            response = await client.get(
+                f"{settings.API_URL}/tasks/changes/",
+                headers=headers,
+                params={"changed_since": state.since},
+            )
+            if response.status_code == 200:
+                state.apply(response.json())
+                _sync_states.move_to_end(access_token)
+                return state.ordered()
+            # 410 — отметка старше срока хранения удалений: грузим заново.
+            logger.info(
+                "Task delta sync failed, reloading: status=%s",
+                response.status_code,
+            )
+            _sync_states.pop(access_token, None)
+
+        state = await _load_all_tasks(client, headers)
+
+    if state is None:
+        return None
+    _sync_states[access_token] = state
+    while len(_sync_states) > settings.BOT_TASKS_CACHE_SIZE:
+        _sync_states.popitem(last=False)
+    return state.ordered()
+
+
+async def _load_all_tasks(
+    client: httpx.AsyncClient, headers: dict[str, str]
+) -> TaskSyncState | None:
+    url: str | None = f"{settings.API_URL}/tasks/"
+    params: dict[str, Any] | None = {
+        "pagination": "cursor",
+        "limit": SYNC_PAGE_SIZE,
+    }
+    since: str | None = None
+    tasks: dict[str, dict[str, Any]] = {}
+
+    while url:
+        response = await client.get(url, headers=headers, params=params)
+        if response.status_code != 200:
+            return None
+        # Отметка первой страницы: всё, что изменится позже, придёт дельтой.
+        since = since or response.headers.get(CHANGES_SINCE_HEADER)
+        data = response.json()
+        tasks.update((task["id"], task) for task in data.get("results", []))
+        url, params = data.get("next"), None
+
+    if since is None:
+        return None
+    return TaskSyncState(since, tasks)
@@ -0,0 +1,56 @@
+import os
+import unittest
+from typing import Any
+from unittest import mock
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test")
+
+from bot.sender import SEND_MESSAGE_TASK, OutgoingMessage, TelegramSender
+
+
+class _Consumer:
+    def __init__(self) -> None:
+        self.acked: list[Any] = []
+        self.requeued: list[Any] = []
+
+    def ack(self, message: Any) -> None:
+        self.acked.append(message)
+
+    def requeue(self, message: Any) -> None:
+        self.requeued.append(message)
+
+
+def _delivery(chat_id: int, text: str) -> tuple[Any, mock.Mock]:
+    delivery = mock.Mock(headers={"task": SEND_MESSAGE_TASK})
+    delivery.text = text
+    return [[], {"chat_id": chat_id, "text": text}, {}], delivery
+
+
+class TelegramSenderLaneTests(unittest.IsolatedAsyncioTestCase):
+    async def test_failed_delivery_requeues_rest_of_chat_lane(self) -> None:
+        consumer = _Consumer()
+        sender = TelegramSender(mock.Mock(), consumer)  # type: ignore[arg-type]
+
+        async def deliver(message: OutgoingMessage) -> None:
+            if message.text == "second":
+                raise RuntimeError("dedupe storage exploded")
+
+        messages = [
+            _delivery(1, "first"),
+            _delivery(1, "second"),
+            _delivery(1, "third"),
+            _delivery(2, "other chat"),
+        ]
+        with mock.patch.object(sender, "_deliver", side_effect=deliver):
+            for body, delivery in messages:
+                sender.submit(body, delivery)
+            await sender.drain(timeout=1)
+
+        self.assertEqual([d.text for d in consumer.acked], ["first", "other chat"])
+        self.assertEqual([d.text for d in consumer.requeued], ["second", "third"])
+
+        # Новое сообщение в тот же чат открывает новую очередь.
+        with mock.patch.object(sender, "_deliver", side_effect=deliver):
+            sender.submit(*_delivery(1, "fourth"))
+            await sender.drain(timeout=1)
+        self.assertEqual(consumer.acked[-1].text, "fourth")
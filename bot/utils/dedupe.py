@@ -0,0 +1,89 @@
+import logging
+from functools import lru_cache
+from typing import Any
+
+import redis
+import redis.asyncio as aioredis
+
+from bot.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "tg:sent"
+
+# Бэкенд может отправить одно сообщение повторно (relay outbox упал между
+# отправкой в брокер и коммитом). Перед отправкой в Telegram забираем
+# idempotency_key через SET NX EX: второй получатель того же ключа сообщение
+# пропускает. Если отправка не удалась, ключ освобождается для повтора.
+
+
+@lru_cache(maxsize=1)
+def _get_redis() -> redis.Redis:
+    return redis.Redis.from_url(
+        settings.RATE_LIMIT_REDIS_URL or settings.CELERY_BROKER_URL
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_async_redis() -> aioredis.Redis:
+    return aioredis.Redis.from_url(
+        settings.RATE_LIMIT_REDIS_URL or settings.CELERY_BROKER_URL
+    )
+
+
+def get_idempotency_key(extra: dict[str, Any] | None) -> str | None:
+    key = (extra or {}).get("idempotency_key")
+    return f"{KEY_PREFIX}:{key}" if key else None
+
+
+def claim(extra: dict[str, Any] | None) -> bool:
+    """
+    Забирает idempotency_key сообщения. False — сообщение с этим ключом
+    уже отправлено или отправляется, его нужно пропустить.
+    """
+    key = get_idempotency_key(extra)
+    if key is None:
+        return True
+    try:
+        return bool(_get_redis().set(key, 1, nx=True, ex=settings.TELEGRAM_DEDUPE_TTL))
+    except redis.RedisError:
+        # Как и лимитер, дедупликация не должна останавливать доставку.
+        logger.warning("Dedupe storage unavailable", exc_info=True)
+        return True
+
+
+def release(extra: dict[str, Any] | None) -> None:
+    """Освобождает ключ после неудачной отправки, чтобы повтор не был отброшен."""
+    key = get_idempotency_key(extra)
+    if key is None:
+        return
+    try:
+        _get_redis().delete(key)
+    except redis.RedisError:
+        logger.warning("Failed to release idempotency key", exc_info=True)
+
+
+async def claim_async(extra: dict[str, Any] | None) -> bool:
+    """Асинхронный вариант claim() для bot.sender."""
+    key = get_idempotency_key(extra)
+    if key is None:
+        return True
+    try:
+        return bool(
+            await _get_async_redis().set(
+                key, 1, nx=True, ex=settings.TELEGRAM_DEDUPE_TTL
+            )
+        )
+    except redis.RedisError:
+        logger.warning("Dedupe storage unavailable", exc_info=True)
+        return True
+
+
+async def release_async(extra: dict[str, Any] | None) -> None:
+    key = get_idempotency_key(extra)
+    if key is None:
+        return
+    try:
+        await _get_async_redis().delete(key)
+    except redis.RedisError:
+        logger.warning("Failed to release idempotency key", exc_info=True)
@@ -1,17 +1,134 @@
+import importlib.util
 import logging
-from collections.abc import AsyncIterator
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from typing import Any
 
 import httpx
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
 from bot.config import settings
 
 logger = logging.getLogger(__name__)
 
+_current_client: ContextVar[httpx.AsyncClient | None] = ContextVar(
+    "api_client", default=None
+)
+
+
+class ETagCache:
+    """LRU последних ответов с ETag: ключ — (url, параметры, токен)."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[Any, ...], tuple[str, Any]] = OrderedDict()
+
+    def get(self, key: tuple[Any, ...]) -> tuple[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: tuple[Any, ...], etag: str, payload: Any) -> None:
+        self._entries[key] = (etag, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_etag_cache = ETagCache(settings.BOT_ETAG_CACHE_SIZE)
+
+
+async def get_with_etag(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict[str, str],
+    params: dict[str, Any] | None = None,
+) -> httpx.Response:
+    """
+    Условный GET: отправляет If-None-Match из прошлого ответа. На 304
+    возвращает сохранённое тело как ответ 200, без повторной загрузки.
+    """
+    key = (url, tuple(sorted((params or {}).items())), headers.get("Authorization"))
+    cached = _etag_cache.get(key)
+    request_headers = dict(headers)
+    if cached is not None:
+        request_headers["If-None-Match"] = cached[0]
+
+    response = await client.get(url, headers=request_headers, params=params)
+    if response.status_code == 304 and cached is not None:
+        return httpx.Response(200, json=cached[1], request=response.request)
+
+    etag = response.headers.get("ETag")
+    if response.status_code == 200 and etag:
+        _etag_cache.set(key, etag, response.json())
+    return response
+
+
+def api_timeout(read: float) -> httpx.Timeout:
+    """Таймаут запроса к API: свой для долгих эндпоинтов, подключение — общее."""
+    return httpx.Timeout(
+        read,
+        connect=settings.BOT_API_CONNECT_TIMEOUT,
+        pool=settings.BOT_API_CONNECT_TIMEOUT,
+    )
+
+
+def create_api_client() -> httpx.AsyncClient:
+    """
+    Keep-alive клиент API бэкенда на всё время работы бота. HTTP/2 —
+    если установлен пакет h2 (для https API_URL).
+    """
+    http2 = settings.BOT_API_HTTP2 and importlib.util.find_spec("h2") is not None
+    logger.info(
+        "API HTTP client opened (pool_size=%s, http2=%s)",
+        settings.BOT_API_POOL_SIZE,
+        http2,
+    )
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.BOT_API_POOL_SIZE,
+            max_keepalive_connections=settings.BOT_API_POOL_SIZE,
+            keepalive_expiry=settings.BOT_API_KEEPALIVE_EXPIRY,
+        ),
+        timeout=api_timeout(settings.BOT_API_TIMEOUT),
+    )
+
+
+class ApiClientMiddleware(BaseMiddleware):  # type: ignore[misc]
+    """Отдаёт общий клиент хендлерам (data["api_client"]) и сервисам (api_client())."""
+
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self.client = client
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        data["api_client"] = self.client
+        token = _current_client.set(self.client)
+        try:
+            return await handler(event, data)
+        finally:
+            _current_client.reset(token)
+
 
 @asynccontextmanager
 async def api_client() -> AsyncIterator[httpx.AsyncClient]:
-    async with httpx.AsyncClient() as client:
+    """
+    Общий клиент из ApiClientMiddleware. Вне обработки апдейта (Celery,
+    скрипты) — временный клиент на один вызов.
+    """
+    client = _current_client.get()
+    if client is not None and not client.is_closed:
+        yield client
+        return
+    async with httpx.AsyncClient(timeout=api_timeout(settings.BOT_API_TIMEOUT)) as client:
         yield client
 
 
@@ -72,7 +189,8 @@ async def get_entities(
 ) -> tuple[int, list[dict[str, Any]]]:
     """Универсальный GET-запрос"""
     async with api_client() as client:
-        response = await client.get(
+        response = await get_with_etag(
+            client,
             f"{settings.API_URL}/{endpoint}/",
             headers=auth_headers(token),
             params=params,
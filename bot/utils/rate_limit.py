@@ -0,0 +1,146 @@
+import logging
+from functools import lru_cache
+
+import redis
+import redis.asyncio as aioredis
+from redis.commands.core import AsyncScript, Script
+
+from bot.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "tg:ratelimit"
+
+# Два token bucket (глобальный и на чат) проверяются и списываются атомарно.
+# Время берётся из Redis, чтобы воркеры на разных машинах не расходились.
+# Возвращает 0, если токены списаны, иначе сколько миллисекунд подождать.
+TOKEN_BUCKET_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local blocked_ttl = math.max(redis.call('PTTL', KEYS[3]), redis.call('PTTL', KEYS[4]))
+if blocked_ttl > 0 then
+    return blocked_ttl
+end
+
+local wait = 0
+local state = {}
+for i = 1, 2 do
+    local rate = tonumber(ARGV[(i - 1) * 2 + 1]) / 1000
+    local burst = tonumber(ARGV[(i - 1) * 2 + 2])
+    local bucket = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or burst
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(burst, tokens + (now - ts) * rate)
+    if tokens < 1 then
+        wait = math.max(wait, math.ceil((1 - tokens) / rate))
+    end
+    state[i] = {tokens, rate, burst}
+end
+
+if wait > 0 then
+    return wait
+end
+
+for i = 1, 2 do
+    local tokens, rate, burst = state[i][1], state[i][2], state[i][3]
+    redis.call('HSET', KEYS[i], 'tokens', tokens - 1, 'ts', now)
+    redis.call('PEXPIRE', KEYS[i], math.ceil(burst / rate) + 1000)
+end
+return 0
+"""
+
+
+@lru_cache(maxsize=1)
+def _get_redis() -> redis.Redis:
+    return redis.Redis.from_url(
+        settings.RATE_LIMIT_REDIS_URL or settings.CELERY_BROKER_URL
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_script() -> Script:
+    return _get_redis().register_script(TOKEN_BUCKET_SCRIPT)
+
+
+@lru_cache(maxsize=1)
+def _get_async_redis() -> aioredis.Redis:
+    return aioredis.Redis.from_url(
+        settings.RATE_LIMIT_REDIS_URL or settings.CELERY_BROKER_URL
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_async_script() -> AsyncScript:
+    return _get_async_redis().register_script(TOKEN_BUCKET_SCRIPT)
+
+
+def build_keys(chat_id: int) -> list[str]:
+    return [
+        f"{KEY_PREFIX}:global",
+        f"{KEY_PREFIX}:chat:{chat_id}",
+        f"{KEY_PREFIX}:blocked:{chat_id}",
+        f"{KEY_PREFIX}:blocked:global",
+    ]
+
+
+def build_args() -> list[float]:
+    return [
+        settings.TELEGRAM_GLOBAL_RATE,
+        settings.TELEGRAM_GLOBAL_RATE,
+        settings.TELEGRAM_CHAT_RATE,
+        1,
+    ]
+
+
+def acquire(chat_id: int) -> float:
+    """
+    Пытается взять токен из глобального и чатового bucket.
+    Возвращает 0, если отправлять можно, иначе сколько секунд подождать.
+    """
+    try:
+        wait_ms = int(_get_script()(keys=build_keys(chat_id), args=build_args()))
+    except redis.RedisError:
+        # Лимитер не должен останавливать доставку: при недоступном Redis
+        # полагаемся на retry_after от Telegram.
+        logger.warning("Rate limiter unavailable", exc_info=True)
+        return 0.0
+    return wait_ms / 1000
+
+
+async def acquire_async(chat_id: int) -> float:
+    """Асинхронный вариант acquire() для bot.sender."""
+    try:
+        wait_ms = int(
+            await _get_async_script()(keys=build_keys(chat_id), args=build_args())
+        )
+    except redis.RedisError:
+        logger.warning("Rate limiter unavailable", exc_info=True)
+        return 0.0
+    return wait_ms / 1000
+
+
+def block_chat(chat_id: int, retry_after: float) -> None:
+    """
+    Запрещает отправку на retry_after секунд (ответ 429 от Telegram) в этот
+    чат и во все остальные: 429 часто означает общий flood-лимит бота.
+    """
+    ttl_ms = max(1, int(retry_after * 1000))
+    try:
+        with _get_redis().pipeline(transaction=False) as pipe:
+            for key in build_keys(chat_id)[2:]:
+                pipe.set(key, 1, px=ttl_ms)
+            pipe.execute()
+    except redis.RedisError:
+        logger.warning("Failed to store retry_after", exc_info=True)
+
+
+async def block_chat_async(chat_id: int, retry_after: float) -> None:
+    ttl_ms = max(1, int(retry_after * 1000))
+    try:
+        async with _get_async_redis().pipeline(transaction=False) as pipe:
+            for key in build_keys(chat_id)[2:]:
+                pipe.set(key, 1, px=ttl_ms)
+            await pipe.execute()
+    except redis.RedisError:
+        logger.warning("Failed to store retry_after", exc_info=True)
@@ -0,0 +1,58 @@
+import logging
+
+import httpx
+
+from bot.config import settings
+
+logger = logging.getLogger(__name__)
+
+BOT_API_URL = f"{settings.TELEGRAM_API_BASE}/bot{settings.TELEGRAM_BOT_TOKEN}"
+
+_client: httpx.Client | None = None
+
+
+def _build_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.TELEGRAM_POOL_SIZE,
+        max_keepalive_connections=settings.TELEGRAM_POOL_SIZE,
+        keepalive_expiry=settings.TELEGRAM_KEEPALIVE_EXPIRY,
+    )
+
+
+def open_telegram_client() -> httpx.Client:
+    """Создаёт keep-alive клиент Telegram Bot API для текущего процесса."""
+    global _client
+    close_telegram_client()
+    _client = httpx.Client(
+        base_url=BOT_API_URL,
+        limits=_build_limits(),
+        timeout=settings.TELEGRAM_TIMEOUT,
+    )
+    logger.info(
+        "Telegram HTTP client opened (pool_size=%s)", settings.TELEGRAM_POOL_SIZE
+    )
+    return _client
+
+
+def get_telegram_client() -> httpx.Client:
+    """Клиент процесса; создаётся лениво, если worker_process_init не сработал."""
+    if _client is None or _client.is_closed:
+        return open_telegram_client()
+    return _client
+
+
+def close_telegram_client() -> None:
+    global _client
+    if _client is not None and not _client.is_closed:
+        _client.close()
+        logger.info("Telegram HTTP client closed")
+    _client = None
+
+
+def get_retry_after(response: httpx.Response, default: float = 1.0) -> float:
+    """Достаёт parameters.retry_after из ответа 429 Telegram Bot API."""
+    try:
+        parameters = response.json().get("parameters") or {}
+        return float(parameters.get("retry_after", default))
+    except (ValueError, AttributeError):
+        return default